@@ -5,6 +5,7 @@ BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / 'data'
 RAW_DATA_DIR = DATA_DIR / 'raw'
 SIMULATED_DATA_DIR = DATA_DIR / 'simulated'
+CACHE_DIR = DATA_DIR / 'cache'  # Derived lookups (e.g. crash -> tract assignments), safe to delete
 
 DURHAM_BOUNDS = {
     'north': 36.1399,
@@ -30,6 +31,15 @@ CRASH_ANALYSIS_YEARS = [2019, 2020, 2021, 2022, 2023, 2024]
 CRASH_TRAINING_YEARS = [2019, 2020, 2021, 2022, 2023]
 CRASH_TEST_YEARS = [2024]
 
+# Rolling-origin backtest: every test year with at least min_train_years of
+# history, under an expanding window and a fixed rolling window
+CRASH_BACKTEST_YEARS = list(range(2007, 2025))
+CRASH_BACKTEST_CONFIG = {
+    'min_train_years': 3,
+    'rolling_window_years': 5,
+    'max_workers': 4,
+}
+
 # Infrastructure project types
 INFRASTRUCTURE_PROJECT_TYPES = {
     'crosswalk': {'cost': 50_000, 'safety_impact': 0.15},
@@ -39,6 +49,10 @@ INFRASTRUCTURE_PROJECT_TYPES = {
 }
 INFRASTRUCTURE_DEFAULT_BUDGET = 5_000_000
 
+# Budget x bias-strength grid for allocation equity curves
+INFRASTRUCTURE_SWEEP_BUDGETS = [1_000_000 * n for n in range(1, 21)]
+INFRASTRUCTURE_SWEEP_BIAS_STRENGTHS = [round(0.1 * n, 1) for n in range(11)]
+
 # Danger score parameters
 DANGER_SCORE_CONFIG = {
     'base_danger': 15.0,
@@ -49,12 +63,31 @@ DANGER_SCORE_CONFIG = {
 # Model reproducibility
 DEFAULT_RANDOM_SEED = 42
 
+# Monte Carlo uncertainty: replicates of each audit's simulated noise
+MONTE_CARLO_REPLICATES = 2000
+MONTE_CARLO_CI_LEVEL = 0.95
+
+# Bootstrap resamples for confidence intervals on between-group error gaps
+BOOTSTRAP_RESAMPLES = 10_000
+
 # NCDOT Non-Motorist Crash Feature Service (public ArcGIS)
 NCDOT_NONMOTORIST_SERVICE = (
     "https://services.arcgis.com/NuWFvHYDMVmmxMeM/arcgis/rest/services"
     "/NCDOT_NonMotoristCrashes/FeatureServer/0"
 )
 
+# ArcGIS paginated fetch settings
+ARCGIS_FETCH_CONFIG = {
+    'page_size': 2000,       # Service maxRecordCount
+    'max_workers': 4,        # Concurrent page requests
+    'max_retries': 5,
+    'backoff_factor': 1.0,   # Seconds, doubled per retry
+    'timeout': 60,
+}
+
+# Crash years re-fetched on incremental refresh (NCDOT revises recent records)
+NCDOT_REVISION_LOOKBACK_YEARS = 1
+
 # Volume simulation parameters
 VOLUME_SIMULATION_CONFIG = {
     'num_counters': 15,
@@ -109,10 +142,13 @@ OSM_INFRASTRUCTURE_FEATURES = {
 
 QUINTILE_LABELS = ['Q1 (Poorest)', 'Q2', 'Q3', 'Q4', 'Q5 (Richest)']
 
+# Decimal places kept in published GeoJSON coordinates (6 ≈ 0.1 m)
+GEOJSON_COORDINATE_PRECISION = 6
+
 # Data freshness thresholds (days before re-fetch)
 DATA_FRESHNESS = {
     'census': 365,       # Census releases annually
-    'ncdot_crashes': 30, # NCDOT updates ~quarterly
+    'ncdot_crashes': 1,  # Incremental CrashID refresh makes daily pulls cheap
     'osm': 7,            # OSM changes frequently
 }
 
@@ -0,0 +1,133 @@
+"""
+Crash prediction model zoo
+
+Count models agencies deploy for crash prediction, behind one fit/predict
+interface so the crash audit can fit every candidate on the same features.
+Each CRASH_MODELS entry is a factory taking the shared FeatureScaler (fitted
+on the training features) and the number of training years.
+"""
+
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import PoissonRegressor, Ridge
+
+from config import DEFAULT_RANDOM_SEED
+
+
+class FeatureScaler:
+    """
+    Shared feature preparation: median imputation and standardization.
+
+    Fitted once on the training features; every model sees the same
+    transformed matrix.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+
+    def fit(self, X: pd.DataFrame) -> 'FeatureScaler':
+        X = X[self.columns]
+        self.medians_ = X.median()
+        filled = X.fillna(self.medians_)
+        self.mean_ = filled.mean()
+        self.std_ = filled.std()
+        return self
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        return ((X[self.columns].fillna(self.medians_) - self.mean_) / self.std_).to_numpy(dtype=float)
+
+    def inverse_column(self, Z: np.ndarray, column: str) -> np.ndarray:
+        """Original-scale values of one column of a transformed matrix."""
+        i = self.columns.index(column)
+        return Z[:, i] * self.std_[column] + self.mean_[column]
+
+
+class NegativeBinomialRegressor:
+    """
+    NB2 regression (log link, Var[y] = mu + alpha * mu^2) fit by IRLS.
+
+    Alternates weighted least squares steps for the coefficients with a
+    method-of-moments update of the overdispersion alpha (floored at 0,
+    where the model reduces to Poisson).
+    """
+
+    def __init__(self, max_iter: int = 100, tol: float = 1e-8, l2: float = 1e-6):
+        self.max_iter = max_iter
+        self.tol = tol
+        self.l2 = l2
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'NegativeBinomialRegressor':
+        y = np.asarray(y, dtype=float)
+        A = np.column_stack([np.ones(len(y)), np.asarray(X, dtype=float)])
+        n, p = A.shape
+        penalty = self.l2 * np.eye(p)
+        penalty[0, 0] = 0.0
+
+        beta = np.zeros(p)
+        beta[0] = np.log(max(y.mean(), 1e-8))
+        alpha = 0.0
+        for _ in range(self.max_iter):
+            eta = np.clip(A @ beta, -30, 30)
+            mu = np.exp(eta)
+            weights = mu / (1 + alpha * mu)
+            working = eta + (y - mu) / mu
+            beta_new = np.linalg.solve(A.T @ (A * weights[:, None]) + penalty, A.T @ (weights * working))
+
+            mu = np.exp(np.clip(A @ beta_new, -30, 30))
+            alpha = max(0.0, float((((y - mu) ** 2 - mu) / mu ** 2).sum() / max(n - p, 1)))
+            converged = np.max(np.abs(beta_new - beta)) < self.tol
+            beta = beta_new
+            if converged:
+                break
+
+        self.intercept_, self.coef_ = beta[0], beta[1:]
+        self.alpha_ = alpha
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.exp(np.clip(self.intercept_ + np.asarray(X, dtype=float) @ self.coef_, -30, 30))
+
+
+class EmpiricalBayesRegressor:
+    """
+    Empirical Bayes crash estimates (Hauer): each tract's observed crash rate
+    shrunk toward an NB2 safety performance function of its demographics.
+
+    The shrinkage weight w = 1 / (1 + alpha * mu * years) trusts the SPF more
+    where crashes are rare and overdispersion low, and the tract's own
+    history more where it has many expected crashes.
+    """
+
+    def __init__(self, scaler: FeatureScaler, history_column: str, history_years: int):
+        self.scaler = scaler
+        self.history_column = history_column
+        self.history_years = history_years
+
+    def _spf_features(self, X: np.ndarray) -> np.ndarray:
+        keep = [i for i, column in enumerate(self.scaler.columns) if column != self.history_column]
+        return X[:, keep]
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'EmpiricalBayesRegressor':
+        self.spf_ = NegativeBinomialRegressor().fit(self._spf_features(X), y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        expected = self.spf_.predict(self._spf_features(X))
+        observed = self.scaler.inverse_column(X, self.history_column)
+        weight = 1 / (1 + self.spf_.alpha_ * expected * self.history_years)
+        return weight * expected + (1 - weight) * observed
+
+
+# Model name -> factory(scaler, history_years); add an entry to audit another model
+CRASH_MODELS: Dict[str, Callable[[FeatureScaler, int], object]] = {
+    'ridge': lambda scaler, years: Ridge(alpha=1.0),
+    'poisson': lambda scaler, years: PoissonRegressor(alpha=1e-3, max_iter=1000),
+    'negative_binomial': lambda scaler, years: NegativeBinomialRegressor(),
+    'gradient_boosting': lambda scaler, years: GradientBoostingRegressor(
+        n_estimators=100, max_depth=2, learning_rate=0.05, random_state=DEFAULT_RANDOM_SEED
+    ),
+    'empirical_bayes': lambda scaler, years: EmpiricalBayesRegressor(scaler, 'avg_past_crashes', years),
+}
@@ -5,12 +5,30 @@ Evaluates whether AI crash prediction models accurately predict actual danger
 or simply reflect enforcement/reporting bias.
 """
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Optional
 from sklearn.metrics import mean_absolute_error
-from sklearn.linear_model import Ridge
-from config import CRASH_ANALYSIS_YEARS, CRASH_TRAINING_YEARS, CRASH_TEST_YEARS
+from config import (
+    CRASH_ANALYSIS_YEARS, CRASH_TRAINING_YEARS, CRASH_TEST_YEARS, CRASH_BACKTEST_CONFIG, QUINTILE_LABELS,
+)
+from models.crash_models import CRASH_MODELS, FeatureScaler
+from utils.datasets import crash_records
+from utils.demographic_analysis import income_quintile_labels
+from utils.geospatial import points_to_tracts
+from utils.tract_cache import cached_points_to_tracts
+
+
+def _level_codes(level: np.ndarray, values) -> np.ndarray:
+    """Position of each value in the sorted level array; -1 where a value isn't one of its entries."""
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(level, values)
+    found = codes < len(level)
+    found[found] = level[codes[found]] == values[found]
+    return np.where(found, codes, -1)
 
 
 class CrashPredictionAuditor:
@@ -22,6 +40,20 @@ class CrashPredictionAuditor:
     than where they actually *occur*.
     """
 
+    # Period columns of a crash panel at each granularity; months and hours
+    # cover their full range so crash-free periods appear as zero rows
+    PANEL_GRANULARITIES = {
+        'year': ['year'],
+        'month': ['year', 'month'],
+        'hour': ['year', 'hour'],
+    }
+    PERIOD_RANGES = {
+        'month': np.arange(1, 13),
+        'hour': np.arange(24),
+    }
+    DEMOGRAPHIC_COLUMNS = ['median_income', 'pct_minority', 'total_population']
+    FEATURE_COLUMNS = ['median_income', 'pct_minority', 'total_population', 'avg_past_crashes']
+
     def __init__(self, census_gdf: gpd.GeoDataFrame):
         """
         Initialize auditor with census tract data.
@@ -29,27 +61,35 @@ class CrashPredictionAuditor:
         Args:
             census_gdf: GeoDataFrame with census tracts and demographics
         """
-        self.census_gdf = census_gdf.copy()
+        self.census_gdf = census_gdf.copy(deep=False)
         self.years = CRASH_ANALYSIS_YEARS
         self.ai_model = None
+        self.geocoded_crashes = None
 
-    def load_real_crash_data(self, crash_csv_path: Path) -> pd.DataFrame:
+    def load_real_crash_data(self, crash_csv_path: Path, cache_dir: Optional[Path] = None,
+                             granularity: str = 'year') -> pd.DataFrame:
         """
         Load real NCDOT non-motorist crash data and geocode to census tracts.
 
         Args:
-            crash_csv_path: Path to ncdot_nonmotorist_durham.csv
+            crash_csv_path: Path to ncdot_nonmotorist_durham.csv or its .parquet twin
+            cache_dir: Directory for persisted crash -> tract assignments (keyed
+                by CrashID and tract geometry), so later runs only geocode new
+                or revised crashes; None geocodes every crash
+            granularity: Panel periods, a PANEL_GRANULARITIES key
 
         Returns:
-            DataFrame with crashes aggregated by tract and year
+            DataFrame with crashes aggregated by tract and period (see build_crash_panel)
         """
         print("Loading NCDOT non-motorist crash data...")
 
-        # Load crash data (ArcGIS column names)
-        crash_df = pd.read_csv(crash_csv_path)
+        # Load crash data (ArcGIS column names; Parquet twin preferred over CSV)
+        crash_df = crash_records(crash_csv_path)
         crash_df = crash_df.rename(columns={
             'CrashDate': 'crash_date',
             'CrashYear': 'year',
+            'CrashMonth': 'month',
+            'CrashHour': 'hour',
             'Latitude': 'latitude',
             'Longitude': 'longitude',
         })
@@ -61,78 +101,109 @@ class CrashPredictionAuditor:
 
         print(f"Loaded {len(crash_df)} crash records ({min(self.years)}-{max(self.years)})")
 
-        # Create Point geometries for crashes
-        crash_gdf = gpd.GeoDataFrame(
-            crash_df,
-            geometry=gpd.points_from_xy(crash_df['longitude'], crash_df['latitude']),
-            crs='EPSG:4326'
-        )
-
-        # Ensure census GDF has same CRS
-        if self.census_gdf.crs != crash_gdf.crs:
-            self.census_gdf = self.census_gdf.to_crs(crash_gdf.crs)
+        # Tracts in the crash coordinates' CRS; reprojected once per auditor so
+        # its spatial index is built once and reused
+        if self.census_gdf.crs != 'EPSG:4326':
+            self.census_gdf = self.census_gdf.to_crs('EPSG:4326')
 
         print("Geocoding crashes to census tracts...")
 
-        # Spatial join: assign each crash to a census tract
-        crashes_with_tracts = gpd.sjoin(
-            crash_gdf,
-            self.census_gdf[['tract_id', 'geometry', 'median_income', 'pct_minority', 'total_population']],
-            how='inner',
-            predicate='within'
-        )
-
-        print(f"Successfully geocoded {len(crashes_with_tracts)} crashes ({len(crashes_with_tracts)/len(crash_gdf)*100:.1f}%)")
-
-        # Aggregate crashes by tract and year
-        crash_counts = crashes_with_tracts.groupby(['tract_id', 'year']).size().reset_index(name='crash_count')
+        # Assign each crash to the census tract containing it
+        if cache_dir is None:
+            tract_ids = points_to_tracts(crash_df['longitude'], crash_df['latitude'], self.census_gdf)
+        else:
+            tract_ids, located = cached_points_to_tracts(
+                crash_df['CrashID'], crash_df['longitude'], crash_df['latitude'],
+                self.census_gdf, cache_dir, 'crash'
+            )
+            print(f"Reused {len(crash_df) - located} cached tract assignments, geocoded {located} new crashes")
 
-        # Create full grid: all tracts × all years
-        all_tracts = self.census_gdf['tract_id'].unique()
-        all_years = sorted(crashes_with_tracts['year'].unique())
+        crashes_with_tracts = crash_df.assign(tract_id=tract_ids)[pd.notna(tract_ids)]
 
-        full_grid = pd.MultiIndex.from_product(
-            [all_tracts, all_years],
-            names=['tract_id', 'year']
-        ).to_frame(index=False)
+        print(f"Successfully geocoded {len(crashes_with_tracts)} crashes ({len(crashes_with_tracts)/len(crash_df)*100:.1f}%)")
 
-        # Merge with crash counts (filling missing with 0)
-        crash_by_tract = full_grid.merge(crash_counts, on=['tract_id', 'year'], how='left')
-        crash_by_tract['crash_count'] = crash_by_tract['crash_count'].fillna(0).astype(int)
-
-        # Join with demographics
-        crash_by_tract = crash_by_tract.merge(
-            self.census_gdf[['tract_id', 'median_income', 'pct_minority', 'total_population']],
-            on='tract_id',
-            how='left'
-        )
+        # Kept so panels at other granularities don't need re-geocoding
+        self.geocoded_crashes = crashes_with_tracts
 
-        # Add income quintiles
-        crash_by_tract['income_quintile'] = pd.qcut(
-            crash_by_tract['median_income'],
-            q=5,
-            labels=['Q1 (Poorest)', 'Q2', 'Q3', 'Q4', 'Q5 (Richest)'],
-            duplicates='drop'
-        )
+        crash_by_tract = self.build_crash_panel(crashes_with_tracts, granularity)
 
-        print(f"Aggregated to {len(crash_by_tract)} tract-year observations")
+        print(f"Aggregated to {len(crash_by_tract)} tract-{granularity} observations")
 
         return crash_by_tract
 
-    def train_ai_on_real_data(self, crash_df: pd.DataFrame) -> pd.DataFrame:
+    def build_crash_panel(self, crashes: pd.DataFrame, granularity: str = 'year') -> pd.DataFrame:
         """
-        Train AI prediction model on real crash data and predict the test year(s).
+        Count crashes into a dense tract x period panel.
 
-        Demonstrates that AI models show worse prediction accuracy in low-income areas.
+        Crashes are binned by integer tract and period codes with one
+        np.bincount into an (n_tracts, n_periods) array, so every tract gets
+        a row for every period (zero if crash-free). Demographics and income
+        quintiles are computed once per tract and attached by position.
 
         Args:
-            crash_df: DataFrame with crash counts by tract and year
+            crashes: Geocoded crashes with tract_id and the granularity's period columns
+            granularity: 'year', 'month' (year x month) or 'hour' (year x hour of day)
 
         Returns:
-            DataFrame with AI predictions and error metrics by tract
+            DataFrame with tract_id, period columns, crash_count, demographics
+            and income_quintile, ordered by tract then period
         """
-        print("Training AI model on real crash data...")
+        if granularity not in self.PANEL_GRANULARITIES:
+            raise ValueError(
+                f"Unknown panel granularity '{granularity}'; expected one of {list(self.PANEL_GRANULARITIES)}"
+            )
+        period_columns = self.PANEL_GRANULARITIES[granularity]
+
+        tracts = self.census_gdf.drop_duplicates('tract_id')
+        tract_ids = tracts['tract_id'].to_numpy()
+        tract_codes = pd.Index(tract_ids).get_indexer(crashes['tract_id'])
+
+        # Years span the whole years of geocoded crashes; sub-year periods their full range
+        levels = []
+        for column in period_columns:
+            values = crashes[column].to_numpy(dtype=float)
+            whole = values[np.isfinite(values) & (values == np.round(values))]
+            levels.append(self.PERIOD_RANGES.get(column, np.unique(whole)))
+        period_codes = [_level_codes(level, crashes[column]) for column, level in zip(period_columns, levels)]
+
+        # Crashes outside the known tracts or with a missing or impossible
+        # period (e.g. month 13, hour 24) have no cell to be counted in
+        valid = (tract_codes >= 0) & np.logical_and.reduce([codes >= 0 for codes in period_codes])
+        if not valid.all():
+            print(f"Skipped {(~valid).sum()} crashes with an unknown tract or invalid {'/'.join(period_columns)}")
+
+        shape = (len(tract_ids), *(len(level) for level in levels))
+        cells = np.ravel_multi_index((tract_codes[valid], *(codes[valid] for codes in period_codes)), shape)
+        counts = np.bincount(cells, minlength=int(np.prod(shape)))
+
+        # Panel row -> tract position and period values, tract-major
+        grid = np.indices(shape).reshape(len(shape), -1)
+        tract_pos = grid[0]
+        panel = pd.DataFrame({'tract_id': tract_ids[tract_pos]})
+        for column, level, codes in zip(period_columns, levels, grid[1:]):
+            panel[column] = level[codes].astype(int)
+        panel['crash_count'] = counts
+
+        for column in self.DEMOGRAPHIC_COLUMNS:
+            panel[column] = tracts[column].to_numpy()[tract_pos]
+
+        # Quintiles over tracts, not over the panel's repeated rows
+        quintile_codes = income_quintile_labels(tracts['median_income']).codes
+        panel['income_quintile'] = pd.Categorical.from_codes(
+            quintile_codes[tract_pos], categories=QUINTILE_LABELS, ordered=True
+        )
 
+        return panel
+
+    def _split_features(self, crash_df: pd.DataFrame):
+        """
+        Per-tract training features and the test-year rows they predict.
+
+        Returns:
+            Tuple of the training-years average per tract (avg_past_crashes
+            plus demographics) and the test-year panel rows with
+            avg_past_crashes attached
+        """
         train_data = crash_df[crash_df['year'].isin(CRASH_TRAINING_YEARS)].copy()
         test_data = crash_df[crash_df['year'].isin(CRASH_TEST_YEARS)].copy()
 
@@ -147,34 +218,37 @@ class CrashPredictionAuditor:
 
         train_avg.columns = ['tract_id', 'avg_past_crashes', 'median_income', 'pct_minority', 'total_population', 'income_quintile']
 
-        # Prepare features for training
-        feature_cols = ['median_income', 'pct_minority', 'total_population', 'avg_past_crashes']
-
-        # Normalize features
-        X_train = train_avg[feature_cols].fillna(train_avg[feature_cols].median())
-        X_train_norm = (X_train - X_train.mean()) / X_train.std()
-
-        y_train = train_avg['avg_past_crashes']
-
-        # Train Ridge regression model
-        self.ai_model = Ridge(alpha=1.0)
-        self.ai_model.fit(X_train_norm, y_train)
-
-        print(f"Model trained. Feature coefficients: {dict(zip(feature_cols, self.ai_model.coef_))}")
-
         # Prepare test data
         test_with_history = test_data.merge(
             train_avg[['tract_id', 'avg_past_crashes']],
             on='tract_id',
             how='left'
         )
+        return train_avg, test_with_history
+
+    def train_ai_on_real_data(self, crash_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Train AI prediction model on real crash data and predict the test year(s).
+
+        Demonstrates that AI models show worse prediction accuracy in low-income areas.
+
+        Args:
+            crash_df: DataFrame with crash counts by tract and year
+
+        Returns:
+            DataFrame with AI predictions and error metrics by tract
+        """
+        print("Training AI model on real crash data...")
 
-        X_test = test_with_history[feature_cols].fillna(train_avg[feature_cols].median())
-        X_test_norm = (X_test - X_train.mean()) / X_train.std()
+        train_avg, test_with_history = self._split_features(crash_df)
+        feature_cols = self.FEATURE_COLUMNS
 
-        # Make predictions
-        test_with_history['ai_predicted_crashes'] = self.ai_model.predict(X_test_norm)
-        test_with_history['ai_predicted_crashes'] = test_with_history['ai_predicted_crashes'].clip(lower=0)
+        # Train Ridge regression model and make predictions
+        self.ai_model, test_with_history['ai_predicted_crashes'] = self._fit_predict(
+            train_avg[feature_cols], train_avg['avg_past_crashes'], test_with_history[feature_cols]
+        )
+
+        print(f"Model trained. Feature coefficients: {dict(zip(feature_cols, self.ai_model.coef_))}")
 
         # Calculate prediction errors
         test_with_history['prediction_error'] = (
@@ -200,3 +274,168 @@ class CrashPredictionAuditor:
         print(f"\nOverall MAE: {overall_mae:.2f}")
 
         return test_with_history
+
+    def _fit_predict(self, X_train: pd.DataFrame, y_train, X_test: pd.DataFrame):
+        """
+        Fit the Ridge crash model on normalized features and predict.
+
+        Missing features are filled with the training medians, and test
+        features are normalized with the training mean and std.
+
+        Returns:
+            Tuple of the fitted model and non-negative predictions
+        """
+        scaler = FeatureScaler(self.FEATURE_COLUMNS).fit(X_train)
+        model = CRASH_MODELS['ridge'](scaler, None)
+        model.fit(scaler.transform(X_train), y_train)
+        return model, model.predict(scaler.transform(X_test)).clip(min=0)
+
+    def compare_models(self, crash_df: pd.DataFrame, models: Dict[str, Callable] = None) -> pd.DataFrame:
+        """
+        Fit every candidate model on the same split and report per-quintile error.
+
+        Features are built and standardized once (one FeatureScaler fitted on
+        the training tracts), then each model is fitted on that matrix and
+        predicts the test year, as in train_ai_on_real_data.
+
+        Args:
+            crash_df: Tract x year panel from load_real_crash_data()
+            models: Dict of model name -> factory(scaler, history_years);
+                defaults to CRASH_MODELS
+
+        Returns:
+            DataFrame with one row per model and income quintile: model,
+            income_quintile, tracts, actual_crashes, ai_predicted_crashes and mae
+        """
+        train_avg, test_with_history = self._split_features(crash_df)
+        scaler = FeatureScaler(self.FEATURE_COLUMNS).fit(train_avg)
+        X_train, X_test = scaler.transform(train_avg), scaler.transform(test_with_history)
+        y_train = train_avg['avg_past_crashes'].to_numpy(dtype=float)
+        history_years = crash_df.loc[crash_df['year'].isin(CRASH_TRAINING_YEARS), 'year'].nunique()
+
+        actual = test_with_history['crash_count'].to_numpy(dtype=float)
+        quintile_codes = pd.Categorical(test_with_history['income_quintile'], categories=QUINTILE_LABELS).codes
+
+        results = []
+        for name, factory in (models or CRASH_MODELS).items():
+            model = factory(scaler, history_years)
+            predicted = np.clip(model.fit(X_train, y_train).predict(X_test), 0, None)
+            results.append(self._quintile_errors(quintile_codes, actual, predicted).assign(model=name))
+
+        comparison = pd.concat(results, ignore_index=True)
+        return comparison[['model', *comparison.columns.drop('model')]]
+
+    @staticmethod
+    def _quintile_errors(quintile_codes: np.ndarray, actual: np.ndarray, predicted: np.ndarray) -> pd.DataFrame:
+        """Tract count, mean actual and predicted crashes, and MAE per income quintile."""
+        valid = quintile_codes >= 0
+        codes = quintile_codes[valid]
+        n_quintiles = len(QUINTILE_LABELS)
+        n = np.bincount(codes, minlength=n_quintiles)
+
+        def means(values):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.bincount(codes, weights=values[valid], minlength=n_quintiles) / n
+
+        return pd.DataFrame({
+            'income_quintile': QUINTILE_LABELS,
+            'tracts': n,
+            'actual_crashes': means(actual),
+            'ai_predicted_crashes': means(predicted),
+            'mae': means(np.abs(predicted - actual)),
+        })
+
+    def backtest(self, crash_df: pd.DataFrame, window: Optional[int] = None,
+                 min_train_years: int = CRASH_BACKTEST_CONFIG['min_train_years'],
+                 max_workers: int = CRASH_BACKTEST_CONFIG['max_workers']) -> pd.DataFrame:
+        """
+        Rolling-origin backtest: retrain and score the model for every test year.
+
+        Each fold trains on the years before its test year (all of them for
+        an expanding window, the last `window` for a rolling one) exactly as
+        train_ai_on_real_data does, then predicts the test year. Crash counts
+        are laid out as a (tracts, years) array with cumulative sums along
+        years, so each fold's average past crashes is one subtraction. Folds
+        run in a thread pool.
+
+        Args:
+            crash_df: Tract x year panel from load_real_crash_data()
+            window: Training years per fold; None for an expanding window
+            min_train_years: Fewest training years a fold may have
+            max_workers: Folds fitted concurrently
+
+        Returns:
+            DataFrame with one row per fold and income quintile: window,
+            train_start_year, train_end_year, test_year, income_quintile,
+            tracts, actual_crashes, ai_predicted_crashes and mae
+        """
+        tracts = crash_df.drop_duplicates('tract_id')
+        years = np.sort(crash_df['year'].dropna().unique())
+        shape = (len(tracts), len(years))
+        year_codes = _level_codes(years, crash_df['year'])
+        if (year_codes < 0).any():
+            raise ValueError("Crash panel has rows with a missing year")
+        cells = np.ravel_multi_index(
+            (pd.Index(tracts['tract_id']).get_indexer(crash_df['tract_id']), year_codes),
+            shape,
+        )
+        counts = np.bincount(cells, weights=crash_df['crash_count'], minlength=int(np.prod(shape))).reshape(shape)
+        cumulative = np.concatenate([np.zeros((shape[0], 1)), counts.cumsum(axis=1)], axis=1)
+
+        demographics = tracts[self.DEMOGRAPHIC_COLUMNS].reset_index(drop=True)
+        quintile_codes = pd.Categorical(tracts['income_quintile'], categories=QUINTILE_LABELS).codes
+
+        def run_fold(test_index):
+            start = 0 if window is None else max(0, test_index - window)
+            avg_past_crashes = (cumulative[:, test_index] - cumulative[:, start]) / (test_index - start)
+            features = demographics.assign(avg_past_crashes=avg_past_crashes)[self.FEATURE_COLUMNS]
+            _, predicted = self._fit_predict(features, avg_past_crashes, features)
+
+            fold = self._quintile_errors(quintile_codes, counts[:, test_index], predicted)
+            fold.insert(0, 'window', 'expanding' if window is None else 'rolling')
+            fold.insert(1, 'train_start_year', years[start])
+            fold.insert(2, 'train_end_year', years[test_index - 1])
+            fold.insert(3, 'test_year', years[test_index])
+            return fold
+
+        test_indices = range(max(min_train_years, 1), len(years))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            folds = list(executor.map(run_fold, test_indices))
+
+        if not folds:
+            return pd.DataFrame(columns=['window', 'train_start_year', 'train_end_year', 'test_year',
+                                         'income_quintile', 'tracts', 'actual_crashes',
+                                         'ai_predicted_crashes', 'mae'])
+        return pd.concat(folds, ignore_index=True)
+
+    @staticmethod
+    def summarize_backtest(backtest_df: pd.DataFrame) -> Dict:
+        """
+        Stability of the poorest-vs-richest error gap across backtest folds.
+
+        Args:
+            backtest_df: backtest() output (one or more windows)
+
+        Returns:
+            Dict per window with the fold count, test-year range, mean Q1 and
+            Q5 MAE, the Q1/Q5 MAE ratio's mean, min and max, and the share of
+            folds where Q1 error exceeds Q5 error
+        """
+        summary = {}
+        for window, folds in backtest_df.groupby('window', sort=False):
+            mae = folds.pivot(index='test_year', columns='income_quintile', values='mae')
+            q1, q5 = mae[QUINTILE_LABELS[0]], mae[QUINTILE_LABELS[-1]]
+            ratio = (q1 / q5).replace([np.inf, -np.inf], np.nan)
+            summary[window] = {
+                'folds': int(len(mae)),
+                'test_years': [int(mae.index.min()), int(mae.index.max())],
+                'q1_mae_mean': float(q1.mean()),
+                'q5_mae_mean': float(q5.mean()),
+                'mae_ratio_q1_q5': {
+                    'mean': float(ratio.mean()),
+                    'min': float(ratio.min()),
+                    'max': float(ratio.max()),
+                },
+                'q1_worse_share': float((q1 > q5).mean()),
+            }
+        return summary
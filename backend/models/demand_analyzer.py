@@ -10,7 +10,13 @@ import pandas as pd
 import geopandas as gpd
 from typing import Dict
 from scipy.stats import pearsonr
-from config import SUPPRESSED_DEMAND_CONFIG, HIGH_SUPPRESSION_THRESHOLD, DEFAULT_RANDOM_SEED, QUINTILE_LABELS
+from config import (
+    SUPPRESSED_DEMAND_CONFIG, HIGH_SUPPRESSION_THRESHOLD, DEFAULT_RANDOM_SEED, QUINTILE_LABELS,
+    MONTE_CARLO_REPLICATES, MONTE_CARLO_CI_LEVEL,
+)
+from utils.demographic_analysis import income_quintile_labels
+from utils.monte_carlo import group_sums, rowwise_corr, summarize_metrics, summarize_replicates
+from utils.rng import SeedLike, make_rng, spawn_rngs
 
 
 class SuppressedDemandAnalyzer:
@@ -22,6 +28,12 @@ class SuppressedDemandAnalyzer:
     This creates inequitable investment patterns favoring already-served areas.
     """
 
+    # Columns summed and averaged per income quintile by aggregate_by_quintile()
+    QUINTILE_AGGREGATE_COLUMNS = [
+        'potential_demand', 'actual_demand', 'suppressed_demand', 'suppression_pct',
+        'infrastructure_score', 'norm_income', 'ai_naive_prediction', 'ai_sophisticated_prediction',
+    ]
+
     def __init__(self, census_gdf: gpd.GeoDataFrame, infrastructure_df: pd.DataFrame = None):
         """
         Initialize analyzer with census tract data and OSM infrastructure scores.
@@ -34,7 +46,7 @@ class SuppressedDemandAnalyzer:
             raise ValueError(
                 "infrastructure_df is required. Run fetch_osm_infrastructure.py first."
             )
-        self.census_gdf = census_gdf.copy()
+        self.census_gdf = census_gdf.copy(deep=False)
         self.infrastructure_df = infrastructure_df
 
         # Normalize income for calculations
@@ -44,47 +56,40 @@ class SuppressedDemandAnalyzer:
             (self.census_gdf['median_income'] - min_income) / (max_income - min_income)
         )
 
-    def calculate_potential_demand(self, base_rate: float = SUPPRESSED_DEMAND_CONFIG['base_rate'], seed: int = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+    def calculate_potential_demand(self, base_rate: float = SUPPRESSED_DEMAND_CONFIG['base_rate'], seed: SeedLike = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
         """
         Calculate potential demand: how many would bike/walk if infrastructure were safe.
 
         Args:
             base_rate: Base percentage of population that would bike/walk (10%)
-            seed: Random seed for reproducibility
+            seed: Random seed or np.random.Generator for reproducibility
 
         Returns:
             DataFrame with potential demand by tract
         """
-        np.random.seed(seed)
-
-        demand_data = []
-
-        for _, tract in self.census_gdf.iterrows():
-            population = tract['total_population']
-            norm_income = tract['norm_income']
-
-            # Potential demand higher in low-income areas (if infrastructure were safe)
-            # Rationale: Can't afford cars, would use active transportation if safe
-            income_factor = 1 + (1 - norm_income) * 0.5  # Up to 1.5x in poorest areas
-
-            # Destination density (simplified: assume proportional to population density)
-            # In reality, would use actual POI data
-            destination_factor = 0.8 + np.random.uniform(0, 0.4)  # 0.8 to 1.2
-
-            # Calculate potential daily trips
-            potential_trips = population * base_rate * income_factor * destination_factor
-
-            demand_data.append({
-                'tract_id': tract['tract_id'],
-                'population': population,
-                'median_income': tract['median_income'],
-                'norm_income': norm_income,
-                'income_factor': income_factor,
-                'destination_factor': destination_factor,
-                'potential_demand': potential_trips
-            })
+        rng = make_rng(seed)
+
+        demand_df = pd.DataFrame({
+            'tract_id': self.census_gdf['tract_id'].to_numpy(),
+            'population': self.census_gdf['total_population'].to_numpy(),
+            'median_income': self.census_gdf['median_income'].to_numpy(),
+            'norm_income': self.census_gdf['norm_income'].to_numpy(),
+        })
+
+        # Potential demand higher in low-income areas (if infrastructure were safe)
+        # Rationale: Can't afford cars, would use active transportation if safe
+        demand_df['income_factor'] = 1 + (1 - demand_df['norm_income']) * 0.5  # Up to 1.5x in poorest areas
+
+        # Destination density (simplified: assume proportional to population density)
+        # In reality, would use actual POI data
+        demand_df['destination_factor'] = 0.8 + rng.uniform(0, 0.4, len(demand_df))  # 0.8 to 1.2
+
+        # Calculate potential daily trips
+        demand_df['potential_demand'] = (
+            demand_df['population'] * base_rate * demand_df['income_factor'] * demand_df['destination_factor']
+        )
 
-        return pd.DataFrame(demand_data)
+        return demand_df
 
     def calculate_infrastructure_quality(self, demand_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -146,7 +151,7 @@ class SuppressedDemandAnalyzer:
 
         return demand_df
 
-    def simulate_ai_detection(self, demand_df: pd.DataFrame) -> pd.DataFrame:
+    def simulate_ai_detection(self, demand_df: pd.DataFrame, seed: SeedLike = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
         """
         Simulate AI detection of suppressed demand.
 
@@ -156,6 +161,7 @@ class SuppressedDemandAnalyzer:
 
         Args:
             demand_df: DataFrame with demand data
+            seed: Random seed or np.random.Generator for the sophisticated AI's error
 
         Returns:
             DataFrame with AI predictions added
@@ -171,7 +177,7 @@ class SuppressedDemandAnalyzer:
         infrastructure_adjustment = (1 - demand_df['infrastructure_score']) * 50
 
         # Add the adjustment with some error
-        noise = np.random.normal(0, 30, len(demand_df))
+        noise = make_rng(seed).normal(0, 30, len(demand_df))
         demand_df['ai_sophisticated_prediction'] = (
             demand_df['actual_demand'] +
             population_proxy +
@@ -188,30 +194,55 @@ class SuppressedDemandAnalyzer:
 
         return demand_df
 
-    def generate_funnel_data(self, demand_df: pd.DataFrame) -> Dict:
+    def aggregate_by_quintile(self, demand_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Per-quintile sums and means of every demand and prediction column in one grouped pass.
+
+        Uses demand_df's income_quintile column when present (run_analysis
+        labels tracts once), otherwise labels median_income.
+
+        Args:
+            demand_df: DataFrame with demand data
+
+        Returns:
+            DataFrame indexed by QUINTILE_LABELS with (column, 'sum'/'mean')
+            columns; empty quintiles have a sum of 0 and a NaN mean
+        """
+        if 'income_quintile' in demand_df.columns:
+            quintiles = demand_df['income_quintile']
+        else:
+            quintiles = income_quintile_labels(demand_df['median_income'])
+
+        columns = [column for column in self.QUINTILE_AGGREGATE_COLUMNS if column in demand_df.columns]
+        return (
+            demand_df[columns]
+            .groupby(pd.Categorical(quintiles, categories=QUINTILE_LABELS), observed=False)
+            .agg(['sum', 'mean'])
+            .reindex(QUINTILE_LABELS)
+        )
+
+    def generate_funnel_data(self, demand_df: pd.DataFrame, aggregates: pd.DataFrame = None) -> Dict:
         """
         Generate funnel chart data showing demand suppression pipeline.
 
         Args:
             demand_df: DataFrame with demand data
+            aggregates: aggregate_by_quintile() output, computed if not given
 
         Returns:
             Dict with funnel stages by quintile
         """
-        if 'income_quintile' not in demand_df.columns:
-            demand_df['income_quintile'] = pd.qcut(
-                demand_df['median_income'], q=5, labels=QUINTILE_LABELS
-            )
+        if aggregates is None:
+            aggregates = self.aggregate_by_quintile(demand_df)
 
         # Calculate funnel stages by quintile
         funnel_data = {}
 
-        for quintile in QUINTILE_LABELS:
-            quintile_data = demand_df[demand_df['income_quintile'] == quintile]
-
+        for quintile, quintile_data in aggregates.iterrows():
             # Funnel stages (normalized to 100% at potential)
-            potential_total = quintile_data['potential_demand'].sum()
-            actual_total = quintile_data['actual_demand'].sum()
+            potential_total = quintile_data[('potential_demand', 'sum')]
+            actual_total = quintile_data[('actual_demand', 'sum')]
+            mean_norm_income = quintile_data[('norm_income', 'mean')]
 
             # Simplified 4-stage funnel
             # Stage 1: Potential (100%)
@@ -219,8 +250,8 @@ class SuppressedDemandAnalyzer:
             # Stage 3: Would use if safe (60-80%)
             # Stage 4: Actually use (final %)
 
-            stage2_pct = 0.90 - (1 - quintile_data['norm_income'].mean()) * 0.10
-            stage3_pct = 0.70 - (1 - quintile_data['norm_income'].mean()) * 0.15
+            stage2_pct = 0.90 - (1 - mean_norm_income) * 0.10
+            stage3_pct = 0.70 - (1 - mean_norm_income) * 0.15
             stage4_pct = actual_total / potential_total if potential_total > 0 else 0
 
             funnel_data[quintile] = {
@@ -282,12 +313,13 @@ class SuppressedDemandAnalyzer:
             'matrix': corr_matrix.to_dict()
         }
 
-    def calculate_detection_scorecard(self, demand_df: pd.DataFrame) -> Dict:
+    def calculate_detection_scorecard(self, demand_df: pd.DataFrame, aggregates: pd.DataFrame = None) -> Dict:
         """
         Evaluate AI capability to detect suppressed demand.
 
         Args:
             demand_df: DataFrame with AI predictions
+            aggregates: aggregate_by_quintile() output, computed if not given
 
         Returns:
             Dict with detection metrics
@@ -310,31 +342,17 @@ class SuppressedDemandAnalyzer:
             ((demand_df['ai_sophisticated_prediction'] - demand_df['potential_demand']) ** 2).mean()
         )
 
-        if 'income_quintile' not in demand_df.columns:
-            demand_df['income_quintile'] = pd.qcut(
-                demand_df['median_income'], q=5, labels=QUINTILE_LABELS
-            )
+        if aggregates is None:
+            aggregates = self.aggregate_by_quintile(demand_df)
+        means = aggregates.xs('mean', axis=1, level=1)
 
-        q1_data = demand_df[demand_df['income_quintile'] == QUINTILE_LABELS[0]]
-        q5_data = demand_df[demand_df['income_quintile'] == QUINTILE_LABELS[-1]]
+        # Mean prediction error relative to mean potential demand, per quintile
+        potential = means['potential_demand']
+        naive_error = (means['ai_naive_prediction'] - potential) / potential * 100
+        soph_error = (means['ai_sophisticated_prediction'] - potential) / potential * 100
 
-        q1_naive_error = (
-            (q1_data['ai_naive_prediction'].mean() - q1_data['potential_demand'].mean()) /
-            q1_data['potential_demand'].mean() * 100
-        )
-        q5_naive_error = (
-            (q5_data['ai_naive_prediction'].mean() - q5_data['potential_demand'].mean()) /
-            q5_data['potential_demand'].mean() * 100
-        )
-
-        q1_soph_error = (
-            (q1_data['ai_sophisticated_prediction'].mean() - q1_data['potential_demand'].mean()) /
-            q1_data['potential_demand'].mean() * 100
-        )
-        q5_soph_error = (
-            (q5_data['ai_sophisticated_prediction'].mean() - q5_data['potential_demand'].mean()) /
-            q5_data['potential_demand'].mean() * 100
-        )
+        q1_naive_error, q5_naive_error = naive_error.iloc[0], naive_error.iloc[-1]
+        q1_soph_error, q5_soph_error = soph_error.iloc[0], soph_error.iloc[-1]
 
         # Detection rate in high-suppression areas
         high_suppression = demand_df[demand_df['suppression_pct'] > HIGH_SUPPRESSION_THRESHOLD]
@@ -426,26 +444,33 @@ class SuppressedDemandAnalyzer:
             'links': links[:40]  # Limit for visualization
         }
 
-    def run_analysis(self) -> Dict:
+    def run_analysis(self, seed: SeedLike = DEFAULT_RANDOM_SEED) -> Dict:
         """
         Run complete suppressed demand analysis.
 
+        Args:
+            seed: Random seed or np.random.Generator; the demand and detection
+                simulations each get an independent child stream
+
         Returns:
             Dict with complete analysis results
         """
-        demand_df = self.calculate_potential_demand()
+        demand_rng, detection_rng = spawn_rngs(seed, 2)
+
+        demand_df = self.calculate_potential_demand(seed=demand_rng)
         demand_df = self.calculate_infrastructure_quality(demand_df)
         demand_df = self.calculate_demand_suppression(demand_df)
-        demand_df = self.simulate_ai_detection(demand_df)
+        demand_df = self.simulate_ai_detection(demand_df, seed=detection_rng)
 
         # Calculate quintiles once for all sub-methods
-        demand_df['income_quintile'] = pd.qcut(
-            demand_df['median_income'], q=5, labels=QUINTILE_LABELS
-        )
+        demand_df['income_quintile'] = income_quintile_labels(demand_df['median_income'])
 
-        funnel_data = self.generate_funnel_data(demand_df)
+        # One grouped pass feeds the funnel, scorecard and by-quintile summary
+        aggregates = self.aggregate_by_quintile(demand_df)
+
+        funnel_data = self.generate_funnel_data(demand_df, aggregates)
         correlation_matrix = self.generate_correlation_matrix(demand_df)
-        detection_scorecard = self.calculate_detection_scorecard(demand_df)
+        detection_scorecard = self.calculate_detection_scorecard(demand_df, aggregates)
         network_flow = self.generate_network_flow(demand_df)
 
         # Summary statistics
@@ -464,16 +489,14 @@ class SuppressedDemandAnalyzer:
             'sophisticated_ai_correlation': float(detection_scorecard['sophisticated_ai']['correlation_with_potential'])
         }
 
-        by_quintile = {}
-        for quintile in QUINTILE_LABELS:
-            q_data = demand_df[demand_df['income_quintile'] == quintile]
-            by_quintile[quintile] = {
-                'potential_demand': float(q_data['potential_demand'].mean()),
-                'actual_demand': float(q_data['actual_demand'].mean()),
-                'suppressed_demand': float(q_data['suppressed_demand'].mean()),
-                'suppression_pct': float(q_data['suppression_pct'].mean()),
-                'infrastructure_score': float(q_data['infrastructure_score'].mean())
+        by_quintile = {
+            quintile: {
+                column: float(quintile_data[(column, 'mean')])
+                for column in ['potential_demand', 'actual_demand', 'suppressed_demand',
+                               'suppression_pct', 'infrastructure_score']
             }
+            for quintile, quintile_data in aggregates.iterrows()
+        }
 
         return {
             'summary': summary,
@@ -484,3 +507,61 @@ class SuppressedDemandAnalyzer:
             'network_flow': network_flow,
             'demand_data': demand_df  # For further processing
         }
+
+    def monte_carlo(self, n_replicates: int = MONTE_CARLO_REPLICATES, seed: SeedLike = DEFAULT_RANDOM_SEED,
+                    base_rate: float = SUPPRESSED_DEMAND_CONFIG['base_rate']) -> Dict:
+        """
+        Confidence intervals for the headline demand metrics over replicates of the simulated noise.
+
+        Redraws the destination factor and the sophisticated AI's error for all
+        replicates at once as (replicates, tracts) arrays; population, income
+        and the OSM infrastructure scores are fixed across replicates.
+
+        Args:
+            n_replicates: Number of Monte Carlo replicates
+            seed: Random seed or np.random.Generator
+            base_rate: Base percentage of population that would bike/walk
+
+        Returns:
+            Dict of summary and per-quintile metrics, each as
+            {'mean', 'ci_lower', 'ci_upper', 'replicates'}
+        """
+        rng = make_rng(seed)
+        tracts = self.calculate_infrastructure_quality(
+            self.census_gdf[['tract_id', 'total_population', 'median_income', 'norm_income']]
+        )
+        n_tracts = len(tracts)
+        population = tracts['total_population'].to_numpy(dtype=float)
+        infrastructure = tracts['infrastructure_score'].to_numpy(dtype=float)
+        income_factor = 1 + (1 - tracts['norm_income'].to_numpy(dtype=float)) * 0.5
+
+        destination_factor = 0.8 + rng.uniform(0, 0.4, (n_replicates, n_tracts))
+        potential = population * base_rate * income_factor * destination_factor
+        actual = potential * infrastructure ** 2
+
+        noise = rng.normal(0, 30, (n_replicates, n_tracts))
+        sophisticated = np.clip(actual + population * 0.05 + (1 - infrastructure) * 50 + noise, 0, potential * 1.2)
+
+        codes = pd.Categorical(income_quintile_labels(tracts['median_income']), categories=QUINTILE_LABELS).codes
+        potential_by_quintile = group_sums(potential, codes, len(QUINTILE_LABELS))
+        actual_by_quintile = group_sums(actual, codes, len(QUINTILE_LABELS))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            suppression_by_quintile = (1 - actual_by_quintile / potential_by_quintile) * 100
+
+        total_potential = potential.sum(axis=1)
+        total_actual = actual.sum(axis=1)
+        return {
+            'replicates': n_replicates,
+            'ci_level': MONTE_CARLO_CI_LEVEL,
+            'summary': summarize_metrics({
+                'total_potential_demand': total_potential,
+                'total_suppressed_demand': total_potential - total_actual,
+                'suppression_rate': (1 - total_actual / total_potential) * 100,
+                'naive_ai_correlation': rowwise_corr(actual, potential),
+                'sophisticated_ai_correlation': rowwise_corr(sophisticated, potential),
+            }),
+            'total_suppression_pct_by_quintile': {
+                quintile: summarize_replicates(suppression_by_quintile[:, q])
+                for q, quintile in enumerate(QUINTILE_LABELS)
+            },
+        }
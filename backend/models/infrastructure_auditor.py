@@ -12,14 +12,21 @@ import geopandas as gpd
 from typing import Dict, List
 from config import (
     INFRASTRUCTURE_PROJECT_TYPES, INFRASTRUCTURE_DEFAULT_BUDGET,
+    INFRASTRUCTURE_SWEEP_BUDGETS, INFRASTRUCTURE_SWEEP_BIAS_STRENGTHS,
+    MONTE_CARLO_REPLICATES, MONTE_CARLO_CI_LEVEL,
     DANGER_SCORE_CONFIG, DEFAULT_RANDOM_SEED, QUINTILE_LABELS,
 )
+from utils.allocation import greedy_allocate, knapsack_allocate, marginal_allocate
+from utils.demographic_analysis import income_quintile_labels, quintile_cut_points
+from utils.monte_carlo import group_sums, summarize_metrics
+from utils.rng import SeedLike, make_rng, spawn_rngs
 
 
 class InfrastructureRecommendationAuditor:
     """Audit AI infrastructure recommendations for demographic bias."""
 
     PROJECT_TYPES = INFRASTRUCTURE_PROJECT_TYPES
+    ALLOCATION_ENGINES = ('greedy', 'optimal', 'marginal')
 
     def __init__(self, census_gdf: gpd.GeoDataFrame, infrastructure_df: pd.DataFrame = None,
                  total_budget: float = INFRASTRUCTURE_DEFAULT_BUDGET):
@@ -35,60 +42,66 @@ class InfrastructureRecommendationAuditor:
             raise ValueError(
                 "infrastructure_df is required. Run fetch_osm_infrastructure.py first."
             )
-        self.census_gdf = census_gdf.copy()
+        self.census_gdf = census_gdf.copy(deep=False)
         self.infrastructure_df = infrastructure_df
+        self.gap_project_types = self._gap_project_types(infrastructure_df)
         self.total_budget = total_budget
         self.danger_scores = None
         self.ai_recommendations = None
         self.need_based_recommendations = None
 
-    def simulate_danger_scores(self, seed: int = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+    def _expected_danger(self) -> np.ndarray:
+        """Danger score per census tract before the ±20% random variation."""
+        median_income = self.census_gdf['median_income'].to_numpy()
+        population = self.census_gdf['total_population'].to_numpy()
+
+        # Base danger score (crashes per 10k residents per year)
+        base_danger = DANGER_SCORE_CONFIG['base_danger']
+
+        # Income effect: Lower income = higher danger (inverse relationship)
+        # Normalized income: 0 (lowest) to 1 (highest)
+        income_min = median_income.min()
+        norm_income = (median_income - income_min) / (median_income.max() - income_min)
+        multiplier_range = DANGER_SCORE_CONFIG['income_multiplier_max'] - DANGER_SCORE_CONFIG['income_multiplier_min']
+        income_multiplier = DANGER_SCORE_CONFIG['income_multiplier_min'] + (1.0 - norm_income) * multiplier_range
+
+        # Population effect: Higher population = slightly higher danger
+        pop_multiplier = 1.0 + (population / 10000) * 0.1
+
+        return base_danger * income_multiplier * pop_multiplier
+
+    def simulate_danger_scores(self, seed: SeedLike = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
         """
         Simulate crash/danger scores by census tract.
 
         Pattern: Higher danger in low-income areas (matches real-world data).
 
+        Args:
+            seed: Random seed or np.random.Generator
+
         Returns:
             DataFrame with danger scores by tract
         """
-        np.random.seed(seed)
-
-        danger_data = []
-        for idx, tract in self.census_gdf.iterrows():
-            tract_id = tract['tract_id']
-            median_income = tract['median_income']
-            population = tract['total_population']
+        rng = make_rng(seed)
 
-            # Base danger score (crashes per 10k residents per year)
-            base_danger = DANGER_SCORE_CONFIG['base_danger']
+        median_income = self.census_gdf['median_income'].to_numpy()
+        population = self.census_gdf['total_population'].to_numpy()
 
-            # Income effect: Lower income = higher danger (inverse relationship)
-            # Normalized income: 0 (lowest) to 1 (highest)
-            income_range = self.census_gdf['median_income'].max() - self.census_gdf['median_income'].min()
-            norm_income = (median_income - self.census_gdf['median_income'].min()) / income_range
-            multiplier_range = DANGER_SCORE_CONFIG['income_multiplier_max'] - DANGER_SCORE_CONFIG['income_multiplier_min']
-            income_multiplier = DANGER_SCORE_CONFIG['income_multiplier_min'] + (1.0 - norm_income) * multiplier_range
+        # Random variation (±20%)
+        noise = rng.uniform(0.8, 1.2, len(population))
 
-            # Population effect: Higher population = slightly higher danger
-            pop_multiplier = 1.0 + (population / 10000) * 0.1
+        danger_score = self._expected_danger() * noise
 
-            # Random variation (±20%)
-            noise = np.random.uniform(0.8, 1.2)
+        # Estimate annual crashes
+        annual_crashes = danger_score * population / 10000
 
-            danger_score = base_danger * income_multiplier * pop_multiplier * noise
-
-            # Estimate annual crashes
-            annual_crashes = (danger_score * population / 10000)
-
-            danger_data.append({
-                'tract_id': tract_id,
-                'danger_score': round(danger_score, 2),
-                'annual_crashes': round(annual_crashes, 1),
-                'median_income': median_income,
-                'population': population
-            })
-
-        self.danger_scores = pd.DataFrame(danger_data)
+        self.danger_scores = pd.DataFrame({
+            'tract_id': self.census_gdf['tract_id'].to_numpy(),
+            'danger_score': np.round(danger_score, 2),
+            'annual_crashes': np.round(annual_crashes, 1),
+            'median_income': median_income,
+            'population': population,
+        })
         return self.danger_scores
 
     # Map OSM density columns to project types
@@ -99,119 +112,426 @@ class InfrastructureRecommendationAuditor:
         'speed_calming_density': 'speed_reduction',
     }
 
+    @classmethod
+    def _gap_project_types(cls, infrastructure_df: pd.DataFrame) -> pd.Series:
+        """
+        Project type addressing each tract's biggest infrastructure gap.
+
+        Args:
+            infrastructure_df: DataFrame with per-tract OSM infrastructure densities
+
+        Returns:
+            Series of project types indexed by tract_id (first row wins for
+            duplicate tracts; missing or NaN densities count as 0, ties go
+            to the first column in DENSITY_TO_PROJECT)
+        """
+        tracts = infrastructure_df.drop_duplicates('tract_id')
+        densities = (
+            tracts.reindex(columns=list(cls.DENSITY_TO_PROJECT))
+            .fillna(0)
+            .to_numpy(dtype=float)
+        )
+        project_types = np.array(list(cls.DENSITY_TO_PROJECT.values()), dtype=object)
+        return pd.Series(
+            project_types[densities.argmin(axis=1)],
+            index=pd.Index(tracts['tract_id'], name='tract_id'),
+            name='project_type',
+        )
+
     def _select_project_type_for_gap(self, tract_id: str) -> str:
         """Pick the project type addressing the tract's biggest infrastructure gap."""
-        row = self.infrastructure_df[self.infrastructure_df['tract_id'] == tract_id]
-        if row.empty:
-            return 'crosswalk'
-
-        row = row.iloc[0]
-        weakest = min(self.DENSITY_TO_PROJECT, key=lambda col: row.get(col, 0))
-        return self.DENSITY_TO_PROJECT[weakest]
+        return self.gap_project_types.get(tract_id, 'crosswalk')
 
-    def _merge_danger_data(self, seed: int) -> pd.DataFrame:
+    def _merge_danger_data(self, seed: SeedLike) -> pd.DataFrame:
         """Merge danger scores with census data, computing scores if needed."""
         if self.danger_scores is None:
             self.simulate_danger_scores(seed)
         danger_subset = self.danger_scores[['tract_id', 'danger_score', 'annual_crashes']]
         return self.census_gdf.merge(danger_subset, on='tract_id')
 
-    def simulate_ai_recommendations(self, bias_strength: float = 0.6, seed: int = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+    def _allocate(self, data: pd.DataFrame, priority: str, columns: List[str]) -> pd.DataFrame:
         """
-        Simulate biased AI infrastructure recommendations.
+        Fund tracts in descending priority order until the budget runs out.
 
-        Bias: Favors high-income areas (proxy for vocal advocacy) over actual danger.
+        Args:
+            data: Candidate tracts (census + danger data)
+            priority: Column to rank tracts by
+            columns: Tract columns to carry into each recommendation
+
+        Returns:
+            DataFrame with one recommended project per funded tract
+        """
+        data = data.sort_values(priority, ascending=False).reset_index(drop=True)
+
+        # Project type based on actual infrastructure gap
+        project_type = data['tract_id'].map(self.gap_project_types).fillna('crosswalk')
+        cost = project_type.map(lambda t: self.PROJECT_TYPES[t]['cost'])
+
+        funded = greedy_allocate(cost.to_numpy(), self.total_budget)
+
+        recommendations = pd.DataFrame({
+            'tract_id': data['tract_id'],
+            'project_type': project_type,
+            'cost': cost,
+            'safety_impact': project_type.map(lambda t: self.PROJECT_TYPES[t]['safety_impact']),
+        })
+        for column in columns:
+            recommendations[column] = data[column]
+        recommendations = recommendations.rename(columns={'total_population': 'population'})
+        return recommendations[funded].reset_index(drop=True)
+
+    @staticmethod
+    def _ai_priority(danger_score: np.ndarray, median_income: np.ndarray, bias_strength: float,
+                     advocacy_noise: np.ndarray) -> np.ndarray:
+        """
+        AI priority score for each tract.
+
+        Tracts run along the last axis; danger_score and advocacy_noise may
+        stack replicates in front of it.
 
         Args:
+            danger_score: Danger score per tract
+            median_income: Median income per tract
             bias_strength: How much to favor income over danger (0=pure danger, 1=pure income)
-            seed: Random seed
+            advocacy_noise: Per-tract uniform(0.8, 1.2) advocacy draws
 
         Returns:
-            DataFrame with AI recommendations by tract
+            Array of priority scores
         """
-        np.random.seed(seed)
-        data = self._merge_danger_data(seed)
+        def normalize(values):
+            low = np.nanmin(values, axis=-1, keepdims=True)
+            high = np.nanmax(values, axis=-1, keepdims=True)
+            return (values - low) / (high - low)
 
-        danger_norm = (data['danger_score'] - data['danger_score'].min()) / (data['danger_score'].max() - data['danger_score'].min())
-        income_norm = (data['median_income'] - data['median_income'].min()) / (data['median_income'].max() - data['median_income'].min())
+        danger_norm = normalize(np.asarray(danger_score, dtype=float))
+        income_norm = normalize(np.asarray(median_income, dtype=float))
 
         # AI priority score: Weighted combination favoring wealth over danger
         # High bias_strength = favor income, low = favor danger
-        data['ai_priority'] = (1 - bias_strength) * danger_norm + bias_strength * income_norm
+        priority = (1 - bias_strength) * danger_norm + bias_strength * income_norm
 
         # Add random "advocacy score" (wealthy areas have higher advocacy)
-        advocacy_boost = income_norm * np.random.uniform(0.8, 1.2, len(data))
-        data['ai_priority'] = data['ai_priority'] * (1 + advocacy_boost * 0.3)
-
-        data = data.sort_values('ai_priority', ascending=False).reset_index(drop=True)
-        recommendations = []
-        remaining_budget = self.total_budget
-
-        for idx, tract in data.iterrows():
-            if remaining_budget <= 0:
-                break
-
-            # Project type based on actual infrastructure gap
-            project_type = self._select_project_type_for_gap(tract['tract_id'])
-
-            project_cost = self.PROJECT_TYPES[project_type]['cost']
-
-            if project_cost <= remaining_budget:
-                recommendations.append({
-                    'tract_id': tract['tract_id'],
-                    'project_type': project_type,
-                    'cost': project_cost,
-                    'safety_impact': self.PROJECT_TYPES[project_type]['safety_impact'],
-                    'ai_priority': round(tract['ai_priority'], 3),
-                    'danger_score': tract['danger_score'],
-                    'median_income': tract['median_income'],
-                    'population': tract['total_population']
-                })
-                remaining_budget -= project_cost
-
-        self.ai_recommendations = pd.DataFrame(recommendations)
+        advocacy_boost = income_norm * advocacy_noise
+        return priority * (1 + advocacy_boost * 0.3)
+
+    def _quintile_membership(self, median_income: pd.Series):
+        """
+        One-hot income quintile membership (census cut points) and population per quintile.
+
+        Returns:
+            Tuple of a (tracts, quintiles) one-hot array for median_income and
+            the census population per quintile
+        """
+        cut_points = quintile_cut_points(self.census_gdf['median_income'])
+        census_codes = income_quintile_labels(self.census_gdf['median_income'], cut_points).codes
+        codes = income_quintile_labels(median_income, cut_points).codes
+
+        quintiles = np.arange(len(QUINTILE_LABELS))
+        pop_by_quintile = group_sums(self.census_gdf['total_population'].to_numpy(), census_codes, len(quintiles))
+        return (codes[:, None] == quintiles[None, :]).astype(float), pop_by_quintile
+
+    def simulate_ai_recommendations(self, bias_strength: float = 0.6, seed: SeedLike = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+        """
+        Simulate biased AI infrastructure recommendations.
+
+        Bias: Favors high-income areas (proxy for vocal advocacy) over actual danger.
+
+        Args:
+            bias_strength: How much to favor income over danger (0=pure danger, 1=pure income)
+            seed: Random seed or np.random.Generator
+
+        Returns:
+            DataFrame with AI recommendations by tract
+        """
+        data = self._merge_danger_data(seed)
+
+        # Advocacy draws come from their own child stream, so they don't
+        # depend on whether danger scores were simulated before this call
+        advocacy_rng, = spawn_rngs(seed, 1)
+        advocacy_noise = advocacy_rng.uniform(0.8, 1.2, len(data))
+        data['ai_priority'] = self._ai_priority(
+            data['danger_score'].to_numpy(), data['median_income'].to_numpy(), bias_strength, advocacy_noise
+        )
+
+        self.ai_recommendations = self._allocate(
+            data, 'ai_priority', ['ai_priority', 'danger_score', 'median_income', 'total_population']
+        )
+        self.ai_recommendations['ai_priority'] = self.ai_recommendations['ai_priority'].round(3)
         return self.ai_recommendations
 
-    def simulate_need_based_recommendations(self, seed: int = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+    def simulate_need_based_recommendations(self, seed: SeedLike = DEFAULT_RANDOM_SEED, engine: str = 'greedy',
+                                            quintile_floors: Dict[str, float] = None) -> pd.DataFrame:
         """
         Simulate need-based (equitable) infrastructure recommendations.
 
         Allocates based purely on danger scores (actual need).
 
+        Args:
+            seed: Random seed or np.random.Generator (used for danger scores
+                if they haven't been simulated yet)
+            engine: 'greedy' funds each tract's gap project in danger order
+                until the budget runs out; 'optimal' picks at most one project
+                type per tract to maximize danger-weighted safety impact
+                (see _allocate_optimal); 'marginal' funds any number of project
+                types per tract by best marginal safety impact per dollar
+                (see _allocate_marginal)
+            quintile_floors: Minimum share of the budget per income quintile
+                label ('optimal' engine only), e.g. {'Q1 (Poorest)': 0.25}
+
         Returns:
             DataFrame with need-based recommendations by tract
         """
-        np.random.seed(seed)
+        if engine not in self.ALLOCATION_ENGINES:
+            raise ValueError(f"Unknown allocation engine '{engine}', expected one of {self.ALLOCATION_ENGINES}")
+        if quintile_floors and engine != 'optimal':
+            raise ValueError("quintile_floors requires the 'optimal' engine")
+
         data = self._merge_danger_data(seed)
 
-        data = data.sort_values('danger_score', ascending=False).reset_index(drop=True)
-        recommendations = []
-        remaining_budget = self.total_budget
-
-        for idx, tract in data.iterrows():
-            if remaining_budget <= 0:
-                break
-
-            # Project type based on actual infrastructure gap
-            project_type = self._select_project_type_for_gap(tract['tract_id'])
-
-            project_cost = self.PROJECT_TYPES[project_type]['cost']
-
-            if project_cost <= remaining_budget:
-                recommendations.append({
-                    'tract_id': tract['tract_id'],
-                    'project_type': project_type,
-                    'cost': project_cost,
-                    'safety_impact': self.PROJECT_TYPES[project_type]['safety_impact'],
-                    'danger_score': tract['danger_score'],
-                    'median_income': tract['median_income'],
-                    'population': tract['total_population']
-                })
-                remaining_budget -= project_cost
-
-        self.need_based_recommendations = pd.DataFrame(recommendations)
+        columns = ['danger_score', 'median_income', 'total_population']
+        if engine == 'optimal':
+            recommendations = self._allocate_optimal(data, columns, quintile_floors)
+        elif engine == 'marginal':
+            recommendations = self._allocate_marginal(data, columns)
+        else:
+            recommendations = self._allocate(data, 'danger_score', columns)
+
+        self.need_based_recommendations = recommendations
         return self.need_based_recommendations
 
+    def _allocate_optimal(self, data: pd.DataFrame, columns: List[str],
+                          quintile_floors: Dict[str, float] = None) -> pd.DataFrame:
+        """
+        Exact need-based allocation over every (tract, project type) candidate.
+
+        Maximizes the sum of danger_score x safety_impact over funded projects,
+        at most one per tract, within the budget and any per-quintile floors.
+
+        Args:
+            data: Candidate tracts (census + danger data)
+            columns: Tract columns to carry into each recommendation
+            quintile_floors: Minimum share of the budget per income quintile label
+
+        Returns:
+            DataFrame with one recommended project per funded tract, in
+            descending danger order
+        """
+        candidates = self._project_candidates(data)
+
+        cut_points = quintile_cut_points(self.census_gdf['median_income'])
+        quintile_codes = income_quintile_labels(candidates['median_income'], cut_points).codes
+        floors = {
+            QUINTILE_LABELS.index(label): share * self.total_budget
+            for label, share in (quintile_floors or {}).items()
+        }
+
+        funded = knapsack_allocate(
+            candidates['cost'].to_numpy(),
+            (candidates['danger_score'] * candidates['safety_impact']).to_numpy(),
+            candidates['tract_index'].to_numpy(),
+            self.total_budget,
+            strata=quintile_codes,
+            floors=floors,
+        )
+
+        return self._candidate_recommendations(candidates, funded, columns)
+
+    def _allocate_marginal(self, data: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """
+        Need-based allocation funding several project types per tract.
+
+        Repeatedly funds the (tract, project type) pair with the best danger-
+        weighted safety impact per dollar. Impacts compound multiplicatively,
+        so each further project in a tract only reduces the danger its
+        earlier projects left (see marginal_allocate).
+
+        Args:
+            data: Candidate tracts (census + danger data)
+            columns: Tract columns to carry into each recommendation
+
+        Returns:
+            DataFrame with one row per funded project, in descending danger order
+        """
+        candidates = self._project_candidates(data)
+        funded = marginal_allocate(
+            candidates['cost'].to_numpy(),
+            candidates['safety_impact'].to_numpy(),
+            candidates['danger_score'].to_numpy(),
+            candidates['tract_index'].to_numpy(),
+            self.total_budget,
+        )
+        return self._candidate_recommendations(candidates, funded, columns)
+
+    def _project_candidates(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Every (tract, project type) pair, tracts in descending danger order."""
+        data = data.sort_values('danger_score', ascending=False).reset_index(drop=True)
+        project_types = list(self.PROJECT_TYPES)
+
+        candidates = data.loc[data.index.repeat(len(project_types))].reset_index(names='tract_index')
+        candidates['project_type'] = np.tile(project_types, len(data))
+        candidates['cost'] = candidates['project_type'].map(lambda t: self.PROJECT_TYPES[t]['cost'])
+        candidates['safety_impact'] = candidates['project_type'].map(lambda t: self.PROJECT_TYPES[t]['safety_impact'])
+        return candidates
+
+    @staticmethod
+    def _candidate_recommendations(candidates: pd.DataFrame, funded: np.ndarray, columns: List[str]) -> pd.DataFrame:
+        """Recommendations frame for the funded rows of a candidates frame."""
+        recommendations = candidates.loc[funded, ['tract_id', 'project_type', 'cost', 'safety_impact', *columns]]
+        recommendations = recommendations.rename(columns={'total_population': 'population'})
+        return recommendations.reset_index(drop=True)
+
+    def sweep_allocations(self, budgets: List[float] = INFRASTRUCTURE_SWEEP_BUDGETS,
+                          bias_strengths: List[float] = INFRASTRUCTURE_SWEEP_BIAS_STRENGTHS,
+                          seed: SeedLike = DEFAULT_RANDOM_SEED) -> pd.DataFrame:
+        """
+        Evaluate allocation equity over a grid of budgets and AI bias strengths.
+
+        Each priority ordering (one per bias strength, plus the need-based
+        ordering) is sorted once and every budget is allocated against it in
+        a single greedy_allocate call. Cells match what simulate_*_recommendations
+        followed by calculate_equity_metrics would report at that budget.
+
+        Args:
+            budgets: Total budgets to allocate ($)
+            bias_strengths: AI bias strengths (0=pure danger, 1=pure income)
+            seed: Random seed or np.random.Generator
+
+        Returns:
+            DataFrame with one row per (allocation, bias_strength, budget) cell;
+            bias_strength is NaN for the need-based allocation
+        """
+        data = self._merge_danger_data(seed)
+        advocacy_rng, = spawn_rngs(seed, 1)
+        advocacy_noise = advocacy_rng.uniform(0.8, 1.2, len(data))
+
+        project_type = data['tract_id'].map(self.gap_project_types).fillna('crosswalk')
+        costs = project_type.map(lambda t: self.PROJECT_TYPES[t]['cost']).to_numpy(dtype=float)
+
+        quintile_onehot, pop_by_quintile = self._quintile_membership(data['median_income'])
+
+        orderings = [('need_based', np.nan, data['danger_score'])]
+        orderings += [
+            ('ai', bias_strength, pd.Series(
+                self._ai_priority(data['danger_score'].to_numpy(), data['median_income'].to_numpy(),
+                                  bias_strength, advocacy_noise),
+                index=data.index,
+            ))
+            for bias_strength in bias_strengths
+        ]
+
+        budgets = np.asarray(budgets)
+        cells = []
+        for allocation, bias_strength, priority in orderings:
+            order = priority.sort_values(ascending=False).index.to_numpy()
+            order = data.index.get_indexer(order)
+            funded = greedy_allocate(costs[order], budgets)
+            metrics = self._allocation_metrics(funded, costs[order], quintile_onehot[order], pop_by_quintile)
+            cells.append(pd.DataFrame({
+                'allocation': allocation,
+                'bias_strength': bias_strength,
+                'budget': budgets,
+                'projects': funded.sum(axis=1),
+                **metrics,
+            }))
+
+        return pd.concat(cells, ignore_index=True)
+
+    def monte_carlo(self, n_replicates: int = MONTE_CARLO_REPLICATES, bias_strength: float = 0.6,
+                    seed: SeedLike = DEFAULT_RANDOM_SEED) -> Dict:
+        """
+        Confidence intervals for the equity metrics over replicates of the simulated noise.
+
+        Redraws the ±20% danger-score variation and the AI advocacy boost for
+        all replicates at once as (replicates, tracts) arrays, then ranks,
+        allocates (greedy, one gap project per tract) and scores every
+        replicate together. Project types and costs come from the real OSM
+        gaps and are the same in every replicate.
+
+        Args:
+            n_replicates: Number of Monte Carlo replicates
+            bias_strength: AI bias strength (0=pure danger, 1=pure income)
+            seed: Random seed or np.random.Generator
+
+        Returns:
+            Dict mirroring calculate_equity_metrics()' scalar metrics, each as
+            {'mean', 'ci_lower', 'ci_upper', 'replicates'}
+        """
+        rng = make_rng(seed)
+        n_tracts = len(self.census_gdf)
+        danger = np.round(self._expected_danger() * rng.uniform(0.8, 1.2, (n_replicates, n_tracts)), 2)
+        advocacy_noise = rng.uniform(0.8, 1.2, (n_replicates, n_tracts))
+
+        median_income = self.census_gdf['median_income']
+        project_type = self.census_gdf['tract_id'].map(self.gap_project_types).fillna('crosswalk')
+        costs = project_type.map(lambda t: self.PROJECT_TYPES[t]['cost']).to_numpy(dtype=float)
+        quintile_onehot, pop_by_quintile = self._quintile_membership(median_income)
+
+        allocations = {
+            'ai_allocation': self._ai_priority(danger, median_income.to_numpy(), bias_strength, advocacy_noise),
+            'need_based_allocation': danger,
+        }
+        metrics = {}
+        for allocation, priority in allocations.items():
+            order = np.argsort(-priority, axis=1, kind='stable')
+            funded = np.zeros(order.shape, dtype=bool)
+            np.put_along_axis(funded, order, greedy_allocate(costs[order], self.total_budget), axis=1)
+            metrics[allocation] = self._allocation_metrics(funded, costs, quintile_onehot, pop_by_quintile)
+
+        ai, need = metrics['ai_allocation'], metrics['need_based_allocation']
+        return {
+            'replicates': n_replicates,
+            'ci_level': MONTE_CARLO_CI_LEVEL,
+            'bias_strength': bias_strength,
+            'ai_allocation': summarize_metrics({
+                'disparate_impact_ratio': ai['disparate_impact_ratio'],
+                'gini_coefficient': ai['gini_coefficient'],
+            }),
+            'need_based_allocation': summarize_metrics({
+                'disparate_impact_ratio': need['disparate_impact_ratio'],
+                'gini_coefficient': need['gini_coefficient'],
+            }),
+            'comparison': summarize_metrics({
+                'equity_gap': need['disparate_impact_ratio'] - ai['disparate_impact_ratio'],
+                'gini_improvement': need['gini_coefficient'] - ai['gini_coefficient'],
+            }),
+        }
+
+    @staticmethod
+    def _allocation_metrics(funded: np.ndarray, costs: np.ndarray, quintile_onehot: np.ndarray,
+                            pop_by_quintile: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Equity metrics for many allocations over the same set of tracts.
+
+        Args:
+            funded: (allocations, tracts) boolean mask of funded projects
+            costs: Project cost per tract
+            quintile_onehot: (tracts, quintiles) one-hot income quintile membership
+            pop_by_quintile: Population per income quintile
+
+        Returns:
+            Dict of per-allocation arrays: budget_allocated, disparate_impact_ratio, gini_coefficient
+        """
+        spent = np.where(funded, costs, 0.0)
+        per_capita = (spent @ quintile_onehot) / pop_by_quintile
+
+        # Gini over funded project costs: rank each funded project among the
+        # allocation's funded projects in ascending cost order
+        by_cost = np.argsort(costs, kind='stable')
+        funded_sorted = funded[:, by_cost]
+        spent_sorted = spent[:, by_cost]
+        ranks = np.cumsum(funded_sorted, axis=1)
+        n = funded.sum(axis=1)
+        total = spent.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            disparate_impact = per_capita[:, 0] / per_capita[:, -1]
+            gini = (2 * (ranks * spent_sorted).sum(axis=1)) / (n * total) - (n + 1) / n
+
+        return {
+            'budget_allocated': total,
+            'disparate_impact_ratio': disparate_impact,
+            'gini_coefficient': gini,
+        }
+
     def calculate_equity_metrics(self) -> Dict:
         """
         Calculate equity metrics comparing AI vs need-based allocation.
@@ -222,11 +542,7 @@ class InfrastructureRecommendationAuditor:
         if self.ai_recommendations is None or self.need_based_recommendations is None:
             raise ValueError("Must simulate recommendations first")
 
-        self.census_gdf['income_quintile'] = pd.qcut(
-            self.census_gdf['median_income'],
-            q=5,
-            labels=QUINTILE_LABELS
-        )
+        self.census_gdf['income_quintile'] = income_quintile_labels(self.census_gdf['median_income'])
 
         ai_with_quintiles = self.ai_recommendations.merge(
             self.census_gdf[['tract_id', 'income_quintile']],
@@ -6,13 +6,14 @@ by comparing predictions against ground truth counter data, stratified by demogr
 """
 
 import pandas as pd
-import geopandas as gpd
 
+from utils.datasets import census_tracts
 from utils.demographic_analysis import (
     calculate_income_quintiles,
     calculate_minority_category,
     calculate_error_metrics,
-    equity_gap_analysis
+    equity_gap_analysis,
+    MINORITY_CATEGORIES,
 )
 
 class VolumeEstimationAuditor:
@@ -21,7 +22,7 @@ class VolumeEstimationAuditor:
     """
 
     def __init__(self, census_gdf, ground_truth_df, ai_predictions_df):
-        self.census_gdf = census_gdf
+        self.census_gdf = census_gdf.copy(deep=False)
         self.ground_truth_df = ground_truth_df
         self.ai_predictions_df = ai_predictions_df
 
@@ -119,7 +120,7 @@ class VolumeEstimationAuditor:
 
         results = []
 
-        for category in ['Low (<30%)', 'Medium (30-60%)', 'High (>60%)']:
+        for category in MINORITY_CATEGORIES:
             subset = self.ai_predictions_df[
                 self.ai_predictions_df['minority_category'] == category
             ]
@@ -236,7 +237,7 @@ class VolumeEstimationAuditor:
 def load_test1_data(raw_data_dir, simulated_data_dir):
     """Helper function to load all Test 1 data"""
 
-    census_gdf = gpd.read_file(raw_data_dir / 'durham_census_tracts.geojson')
+    census_gdf = census_tracts(raw_data_dir / 'durham_census_tracts.geojson')
 
     ground_truth_df = pd.read_json(
         simulated_data_dir / 'ground_truth_counters.json'
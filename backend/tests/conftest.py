@@ -7,6 +7,8 @@ import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Polygon, Point
 
+from config import CRASH_ANALYSIS_YEARS
+
 
 @pytest.fixture
 def sample_census_gdf():
@@ -48,6 +50,26 @@ def sample_crash_data():
     })
 
 
+@pytest.fixture
+def sample_crash_panel(sample_census_gdf, tmp_path):
+    """
+    Tract-year crash panel over CRASH_ANALYSIS_YEARS for sample_census_gdf.
+
+    Counts vary by tract and year, and tract 001 has a crash every year so
+    no year drops out of the panel.
+    """
+    from models.crash_predictor import CrashPredictionAuditor
+
+    rows = []
+    for i, year in enumerate(CRASH_ANALYSIS_YEARS):
+        for tract, lon in enumerate([0.5, 1.5, 2.5, 3.5, 4.5]):
+            rows += [f"{year}-06-15,{year},0.5,{lon}"] * ((i + tract) % 3 + (tract == 0))
+    crash_csv = tmp_path / "crashes.csv"
+    crash_csv.write_text("CrashDate,CrashYear,Latitude,Longitude\n" + "\n".join(rows) + "\n")
+
+    return CrashPredictionAuditor(sample_census_gdf).load_real_crash_data(crash_csv)
+
+
 @pytest.fixture
 def sample_infrastructure_df():
     """Sample OSM infrastructure data matching sample_census_gdf tract_ids."""
@@ -0,0 +1,168 @@
+"""
+Tests for budget allocation helpers.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from utils.allocation import greedy_allocate, knapsack_allocate, marginal_allocate
+
+
+def _reference_allocate(costs, budget):
+    """Row-by-row greedy loop the allocator replaces."""
+    funded = []
+    remaining = budget
+    for cost in costs:
+        if remaining <= 0:
+            break
+        if cost <= remaining:
+            funded.append(True)
+            remaining -= cost
+        else:
+            funded.append(False)
+    return np.array(funded + [False] * (len(costs) - len(funded)))
+
+
+def test_greedy_allocate_skips_projects_that_do_not_fit():
+    """Test that an unaffordable project is skipped and cheaper ones still funded."""
+    costs = [200, 150, 50, 200, 75, 50]
+    funded = greedy_allocate(costs, 400)
+    # 200 + 150 + 50 = 400, nothing left
+    assert funded.tolist() == [True, True, True, False, False, False]
+
+    funded = greedy_allocate(costs, 300)
+    # 200, skip 150, 50, skip 200, skip 75 (50 left), 50
+    assert funded.tolist() == [True, False, True, False, False, True]
+
+
+def test_greedy_allocate_matches_loop():
+    """Test that the cumulative-sum passes match the sequential greedy loop."""
+    rng = np.random.default_rng(0)
+    costs = rng.choice([50_000, 75_000, 150_000, 200_000], size=200)
+    budgets = np.array([0, 49_999, 50_000, 1_000_000, 5_000_000, 12_345_678, 1e9])
+
+    funded = greedy_allocate(costs, budgets)
+
+    assert funded.shape == (len(budgets), len(costs))
+    for row, budget in zip(funded, budgets):
+        np.testing.assert_array_equal(row, _reference_allocate(costs, budget))
+        assert costs[row].sum() <= budget
+
+
+def test_greedy_allocate_row_orderings():
+    """Test that 2-D costs allocate each row's ordering independently."""
+    rng = np.random.default_rng(1)
+    costs = rng.choice([50_000, 75_000, 150_000, 200_000], size=(50, 40))
+
+    funded = greedy_allocate(costs, 1_000_000)
+
+    assert funded.shape == costs.shape
+    for row_costs, row in zip(costs, funded):
+        np.testing.assert_array_equal(row, greedy_allocate(row_costs, 1_000_000))
+
+
+def test_greedy_allocate_validates_costs():
+    """Test that non-positive costs are rejected."""
+    with pytest.raises(ValueError, match="positive"):
+        greedy_allocate([100, 0], 500)
+
+
+def _brute_force_knapsack(costs, values, items, budget, strata, floors):
+    """Best value over every one-candidate-or-none choice per item (None if infeasible)."""
+    best = None
+    options = [[None, *np.flatnonzero(items == item)] for item in np.unique(items)]
+    for choice in itertools.product(*options):
+        chosen = [c for c in choice if c is not None]
+        if costs[chosen].sum() > budget:
+            continue
+        if any(costs[[c for c in chosen if strata[c] == s]].sum() < floor for s, floor in floors.items()):
+            continue
+        value = values[chosen].sum()
+        best = value if best is None else max(best, value)
+    return best
+
+
+def test_knapsack_allocate_matches_brute_force():
+    """Test that the DP finds the optimal one-project-per-tract selection."""
+    rng = np.random.default_rng(0)
+    project_costs = np.array([50_000, 200_000, 150_000, 75_000])
+    project_impacts = np.array([0.15, 0.25, 0.30, 0.20])
+
+    for trial in range(40):
+        n_tracts = rng.integers(1, 5)
+        danger = rng.uniform(1, 30, n_tracts)
+        costs = np.tile(project_costs, n_tracts)
+        values = np.repeat(danger, 4) * np.tile(project_impacts, n_tracts)
+        items = np.repeat(np.arange(n_tracts), 4)
+        strata = np.repeat(rng.integers(0, 2, n_tracts), 4)
+        budget = int(rng.integers(0, 16)) * 25_000
+        floors = {0: int(rng.integers(0, 4)) * 25_000} if trial % 2 else {}
+
+        expected = _brute_force_knapsack(costs, values, items, budget, strata, floors)
+        if expected is None:
+            with pytest.raises(ValueError, match="floors"):
+                knapsack_allocate(costs, values, items, budget, strata=strata, floors=floors)
+            continue
+
+        funded = knapsack_allocate(costs, values, items, budget, strata=strata, floors=floors)
+        assert values[funded].sum() == pytest.approx(expected)
+        assert costs[funded].sum() <= budget
+        assert np.bincount(items[funded], minlength=n_tracts).max() <= 1
+        for stratum, floor in floors.items():
+            assert costs[funded & (strata == stratum)].sum() >= floor
+
+
+def test_knapsack_allocate_uses_leftover_budget():
+    """Test that the optimal allocation spends budget greedy leaves on the table."""
+    costs = np.array([200_000, 150_000, 150_000])
+    values = np.array([3.0, 2.0, 2.0])
+    items = np.arange(3)
+
+    # Greedy by value funds the $200k project, then nothing else fits
+    assert greedy_allocate(costs, 300_000).tolist() == [True, False, False]
+    assert knapsack_allocate(costs, values, items, 300_000).tolist() == [False, True, True]
+
+
+def _reference_marginal(costs, impacts, weights, items, budget):
+    """Re-score every remaining candidate after each funding."""
+    funded = np.zeros(len(costs), dtype=bool)
+    remaining_risk = {item: 1.0 for item in items}
+    remaining = budget
+    while True:
+        open_ = ~funded & (costs <= remaining)
+        if not open_.any():
+            return funded
+        risk = np.array([remaining_risk[item] for item in items])
+        scores = np.where(open_, weights * risk * impacts / costs, -np.inf)
+        best = int(np.argmax(scores))
+        funded[best] = True
+        remaining -= costs[best]
+        remaining_risk[items[best]] *= 1 - impacts[best]
+
+
+def test_marginal_allocate_matches_full_rescoring():
+    """Test that lazy re-scoring funds the same candidates as re-scoring everything."""
+    rng = np.random.default_rng(0)
+    n_tracts = 30
+    costs = np.tile([50_000, 200_000, 150_000, 75_000], n_tracts).astype(float)
+    impacts = np.tile([0.15, 0.25, 0.30, 0.20], n_tracts)
+    weights = np.repeat(rng.uniform(1, 30, n_tracts), 4)
+    items = np.repeat(np.arange(n_tracts), 4)
+
+    for budget in [0, 60_000, 1_000_000, 3_337_000, 1e9]:
+        funded = marginal_allocate(costs, impacts, weights, items, budget)
+        np.testing.assert_array_equal(funded, _reference_marginal(costs, impacts, weights, items, budget))
+        assert costs[funded].sum() <= budget
+
+
+def test_marginal_allocate_diminishing_returns():
+    """Test that a second project in a tract competes on its reduced benefit."""
+    costs = np.array([100.0, 100.0, 100.0])
+    impacts = np.array([0.5, 0.5, 0.5])
+    weights = np.array([10.0, 10.0, 7.0])
+    items = np.array(['a', 'a', 'b'])
+
+    # After one project in 'a', its second is worth 10 x 0.5 x 0.5 < 7 x 0.5
+    assert marginal_allocate(costs, impacts, weights, items, 200).tolist() == [True, False, True]
+    assert marginal_allocate(costs, impacts, weights, items, 300).tolist() == [True, True, True]
@@ -0,0 +1,155 @@
+"""
+Tests for ArcGIS paginated fetching against a local stub Feature Service.
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from utils.arcgis import arcgis_session, iter_feature_pages, query_count
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+import fetch_ncdot_nonmotorist as ncdot
+
+RECORDS = [{'CrashID': i, 'CrashYear': 2007 + i % 18} for i in range(1, 1054)]
+
+
+@pytest.fixture
+def stub_service():
+    """Serve state['records'] (RECORDS) from a /query endpoint; the first page request fails with 503."""
+    state = {'requests': 0, 'failed_once': False, 'max_page': 100, 'records': RECORDS, 'wheres': []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state['requests'] += 1
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            records = state['records']
+
+            if params.get('returnCountOnly') == 'true':
+                state['wheres'].append(params['where'])
+                body = {'count': len(records)}
+            else:
+                if not state['failed_once']:
+                    state['failed_once'] = True
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                offset = int(params['resultOffset'])
+                size = min(int(params['resultRecordCount']), state['max_page'])
+                body = {'features': [{'attributes': r} for r in records[offset:offset + size]]}
+
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/FeatureServer/0", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_query_count(stub_service):
+    """Test record count query."""
+    url, _ = stub_service
+    assert query_count(arcgis_session(backoff_factor=0), url, '1=1') == len(RECORDS)
+
+
+def test_iter_feature_pages_in_order_with_retry(stub_service):
+    """Test concurrent pages arrive in offset order and a 503 is retried."""
+    url, state = stub_service
+    pages = list(iter_feature_pages(url, '1=1', ['CrashID', 'CrashYear'], order_by='CrashID',
+                                    page_size=100, max_workers=4,
+                                    session=arcgis_session(max_workers=4, backoff_factor=0)))
+
+    assert len(pages) == 11
+    assert [r for page in pages for r in page] == RECORDS
+    assert state['failed_once']
+
+
+def test_iter_feature_pages_short_page_raises(stub_service):
+    """Test a page_size above the service's cap is detected, not silently truncated."""
+    url, _ = stub_service
+    with pytest.raises(RuntimeError, match='expected 200'):
+        list(iter_feature_pages(url, '1=1', ['CrashID'], order_by='CrashID', page_size=200,
+                                session=arcgis_session(backoff_factor=0)))
+
+
+def _crash(crash_id, year=2023, severity='C'):
+    """One NCDOT crash record as the Feature Service returns it."""
+    return {
+        'CrashID': crash_id, 'CrashYear': year, 'CrashSevr': severity, 'NM_Type': 'Pedestrian',
+        'CrashDate': int(pd.Timestamp(f'{year}-06-01').timestamp() * 1000),
+        'Latitude': 35.99, 'Longitude': -78.9,
+    }
+
+
+@pytest.fixture
+def ncdot_service(stub_service, monkeypatch):
+    """Point the NCDOT fetch script at the stub service."""
+    url, state = stub_service
+    state['failed_once'] = True
+    state['max_page'] = 10_000
+    monkeypatch.setattr(ncdot, 'NCDOT_NONMOTORIST_SERVICE', url)
+    return state
+
+
+def test_refresh_incremental_merges_revisions(ncdot_service, tmp_path):
+    """Test revised CrashIDs replace stored rows, new ones are appended, and rows stay sorted."""
+    output = tmp_path / 'crashes.csv'
+    ncdot_service['records'] = [_crash(i, year=2020) for i in (1, 3, 5)]
+    ncdot.fetch_durham_nonmotorist_crashes(output)
+
+    ncdot_service['records'] = [_crash(3, year=2020, severity='A'), _crash(2), _crash(6)]
+    summary, fetched = ncdot.refresh_incremental(5, 2024, output)
+
+    assert ncdot_service['wheres'][-1] == ncdot.incremental_where(5, 2024)
+    assert fetched == 3
+    merged = pd.read_csv(output)
+    assert merged['CrashID'].tolist() == [1, 2, 3, 5, 6]
+    assert merged.set_index('CrashID').loc[3, 'CrashSevr'] == 'A'
+    assert summary['record_count'] == 5
+    assert summary['max_crash_id'] == 6
+    assert not (tmp_path / 'crashes_delta.csv').exists()
+
+
+def test_refresh_incremental_empty_delta_keeps_high_water_mark(ncdot_service, tmp_path):
+    """Test an empty delta leaves the dataset alone and carries the high-water mark through."""
+    output = tmp_path / 'crashes.csv'
+    ncdot_service['records'] = [_crash(i) for i in (1, 2)]
+    ncdot.fetch_durham_nonmotorist_crashes(output)
+    before = output.read_text()
+
+    # Records up to 7 were seen before; 3-7 lacked coordinates and were dropped
+    ncdot_service['records'] = []
+    summary, fetched = ncdot.refresh_incremental(7, 2024, output)
+
+    assert fetched == 0
+    assert output.read_text() == before
+    assert summary['record_count'] == 2
+    assert summary['max_crash_id'] == 7
+
+
+def test_fetch_failure_removes_partial_export(ncdot_service, tmp_path):
+    """Test a page failing mid-stream leaves neither the output nor its .part file."""
+    output = tmp_path / 'crashes.csv'
+    ncdot_service['records'] = [_crash(i) for i in range(1, 2501)]
+    ncdot_service['max_page'] = 1000  # Below the 2000-record page size, so pages come up short
+
+    with pytest.raises(RuntimeError):
+        ncdot.fetch_durham_nonmotorist_crashes(output)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,61 @@
+"""
+Tests for bootstrap helpers.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.bootstrap import bootstrap_group_gaps, stratified_bootstrap_indices
+
+
+def test_stratified_bootstrap_indices():
+    """Test that every resampled row stays within its own group."""
+    codes = np.array([2, 0, 2, 1, 0, 2, 2])
+    indices = stratified_bootstrap_indices(codes, 500, seed=0)
+
+    assert indices.shape == (500, 7)
+    assert (codes[indices] == codes).all()
+    # Each group's rows are all reachable
+    for code in np.unique(codes):
+        members = np.flatnonzero(codes == code)
+        assert set(np.unique(indices[:, members])) == set(members)
+
+    np.testing.assert_array_equal(indices, stratified_bootstrap_indices(codes, 500, seed=0))
+
+
+def test_bootstrap_group_gaps():
+    """Test gap intervals and p-values against a clear and a null gap."""
+    rng = np.random.default_rng(0)
+    labels = ['Q1 (Poorest)', 'Q2', 'Q3', 'Q4', 'Q5 (Richest)']
+    df = pd.DataFrame({
+        'quintile': pd.Categorical(np.repeat(labels, 14), categories=labels, ordered=True),
+        'error': rng.normal(20, 3, 70) + np.repeat([10, 0, 0, 0, 0], 14),
+    })
+
+    result = bootstrap_group_gaps(df, 'error', 'quintile', n_resamples=2000, level=0.9)
+
+    assert result['reference_group'] == 'Q5 (Richest)'
+    assert list(result['groups']) == labels
+    assert set(result['gaps']) == set(labels[:-1])
+
+    q1 = result['gaps']['Q1 (Poorest)']
+    observed = df.groupby('quintile', observed=True)['error'].mean()
+    assert q1['difference'] == pytest.approx(observed.iloc[0] - observed.iloc[-1])
+    assert q1['ratio'] == pytest.approx(observed.iloc[0] / observed.iloc[-1])
+    assert q1['difference_ci_lower'] < q1['difference'] < q1['difference_ci_upper']
+    assert q1['difference_ci_lower'] > 0
+    assert q1['p_value'] < 0.01
+
+    # Q3 has the same distribution as Q5
+    assert result['gaps']['Q3']['difference_ci_lower'] < 0 < result['gaps']['Q3']['difference_ci_upper']
+    assert result['gaps']['Q3']['p_value'] > 0.05
+
+    other = bootstrap_group_gaps(df, 'error', 'quintile', reference='Q1 (Poorest)', n_resamples=100)
+    assert other['gaps']['Q5 (Richest)']['difference'] == pytest.approx(-q1['difference'])
+
+
+def test_bootstrap_group_gaps_single_group():
+    """Test that a single group with data has no gaps to bootstrap."""
+    df = pd.DataFrame({'metric': [1.0, 2.0, np.nan], 'group': ['A', 'A', 'B']})
+
+    assert bootstrap_group_gaps(df, 'metric', 'group') is None
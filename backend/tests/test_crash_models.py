@@ -0,0 +1,51 @@
+"""
+Tests for the crash prediction model zoo.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from models.crash_models import EmpiricalBayesRegressor, FeatureScaler, NegativeBinomialRegressor
+
+
+def test_negative_binomial_recovers_coefficients():
+    """Test that IRLS recovers NB2 coefficients and overdispersion."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(20_000, 2))
+    mu = np.exp(0.5 + X @ np.array([0.3, -0.2]))
+    alpha = 0.5
+    # NB2 as a gamma-Poisson mixture with mean mu and variance mu + alpha mu^2
+    y = rng.poisson(rng.gamma(1 / alpha, alpha * mu))
+
+    model = NegativeBinomialRegressor().fit(X, y)
+
+    assert model.intercept_ == pytest.approx(0.5, abs=0.03)
+    np.testing.assert_allclose(model.coef_, [0.3, -0.2], atol=0.03)
+    assert model.alpha_ == pytest.approx(alpha, abs=0.05)
+
+
+def test_empirical_bayes_shrinks_history_toward_spf():
+    """Test that EB estimates lie between the SPF and each tract's observed rate."""
+    rng = np.random.default_rng(1)
+    features = pd.DataFrame({
+        'median_income': rng.normal(60_000, 15_000, 200),
+        'avg_past_crashes': rng.gamma(0.5, 4.0, 200),
+    })
+    scaler = FeatureScaler(features.columns).fit(features)
+    X = scaler.transform(features)
+
+    model = EmpiricalBayesRegressor(scaler, 'avg_past_crashes', history_years=5).fit(
+        X, features['avg_past_crashes']
+    )
+    estimate = model.predict(X)
+    spf = model.spf_.predict(X[:, :1])
+    observed = features['avg_past_crashes'].to_numpy()
+
+    assert model.spf_.alpha_ > 0
+    assert np.all(estimate >= np.minimum(spf, observed) - 1e-9)
+    assert np.all(estimate <= np.maximum(spf, observed) + 1e-9)
+    # More years of history pull estimates closer to the observed rate
+    longer = EmpiricalBayesRegressor(scaler, 'avg_past_crashes', history_years=50).fit(
+        X, features['avg_past_crashes']
+    )
+    assert np.abs(longer.predict(X) - observed).sum() < np.abs(estimate - observed).sum()
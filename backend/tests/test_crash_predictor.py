@@ -2,8 +2,11 @@
 Tests for crash prediction auditor model.
 """
 
+import numpy as np
 import pandas as pd
-from config import CRASH_ANALYSIS_YEARS
+import pytest
+from config import CRASH_ANALYSIS_YEARS, CRASH_TRAINING_YEARS, CRASH_TEST_YEARS
+from models.crash_models import CRASH_MODELS
 from models.crash_predictor import CrashPredictionAuditor
 
 
@@ -40,6 +43,66 @@ def test_load_real_crash_data(sample_census_gdf, tmp_path):
     assert crash_by_tract['crash_count'].min() >= 0
 
 
+def test_build_crash_panel(sample_census_gdf):
+    """Test dense tract x period panels and per-tract quintiles."""
+    auditor = CrashPredictionAuditor(sample_census_gdf)
+    crashes = pd.DataFrame({
+        'tract_id': ['001', '001', '003', '005'],
+        'year': [2022, 2023, 2023, 2023],
+        'month': [1, 1, 12, 6],
+        'hour': [8, 8, 17, 23],
+    })
+
+    panel = auditor.build_crash_panel(crashes)
+    assert len(panel) == 5 * 2
+    assert panel.set_index(['tract_id', 'year'])['crash_count'].to_dict() == {
+        ('001', 2022): 1, ('001', 2023): 1, ('002', 2022): 0, ('002', 2023): 0, ('003', 2022): 0,
+        ('003', 2023): 1, ('004', 2022): 0, ('004', 2023): 0, ('005', 2022): 0, ('005', 2023): 1,
+    }
+    assert panel.groupby('tract_id')['income_quintile'].first().tolist() == [
+        'Q1 (Poorest)', 'Q2', 'Q3', 'Q4', 'Q5 (Richest)'
+    ]
+    incomes = panel.groupby('tract_id')['median_income'].first()
+    assert incomes.tolist() == sample_census_gdf['median_income'].tolist()
+
+    monthly = auditor.build_crash_panel(crashes, granularity='month')
+    assert len(monthly) == 5 * 2 * 12
+    assert monthly['crash_count'].sum() == len(crashes)
+    assert monthly.query("tract_id == '003' and year == 2023 and month == 12")['crash_count'].item() == 1
+
+    hourly = auditor.build_crash_panel(crashes, granularity='hour')
+    assert len(hourly) == 5 * 2 * 24
+    assert hourly.query("tract_id == '001' and hour == 8")['crash_count'].sum() == 2
+
+    with pytest.raises(ValueError, match="granularity"):
+        auditor.build_crash_panel(crashes, granularity='week')
+
+
+def test_build_crash_panel_skips_malformed_periods(sample_census_gdf):
+    """Test crashes with impossible or missing periods, or unknown tracts, are not binned."""
+    auditor = CrashPredictionAuditor(sample_census_gdf)
+    crashes = pd.DataFrame({
+        'tract_id': ['001', '002', '003', '004', '999'],
+        'year': [2023, 2023, 2023, np.nan, 2023],
+        'month': [6, 13, 2.5, 6, 6],
+        'hour': [8, 24, np.nan, 8, 8],
+    })
+
+    monthly = auditor.build_crash_panel(crashes, granularity='month')
+    assert monthly['year'].unique().tolist() == [2023]
+    assert monthly['crash_count'].sum() == 1
+    assert monthly.query("tract_id == '001' and month == 6")['crash_count'].item() == 1
+
+    hourly = auditor.build_crash_panel(crashes, granularity='hour')
+    assert hourly['crash_count'].sum() == 1
+    assert hourly.query("tract_id == '001' and hour == 8")['crash_count'].item() == 1
+
+    panel = auditor.build_crash_panel(crashes)
+    panel.loc[0, 'year'] = np.nan
+    with pytest.raises(ValueError, match="missing year"):
+        auditor.backtest(panel)
+
+
 def test_train_ai_on_real_data(sample_census_gdf, tmp_path):
     """Test AI model training on real crash data and prediction evaluation."""
     auditor = CrashPredictionAuditor(sample_census_gdf)
@@ -64,3 +127,39 @@ def test_train_ai_on_real_data(sample_census_gdf, tmp_path):
     assert 'prediction_error_pct' in predictions.columns
     assert predictions['ai_predicted_crashes'].min() >= 0
     assert auditor.ai_model is not None
+
+
+def test_backtest_matches_single_split(sample_census_gdf, sample_crash_panel):
+    """Test that the fold for the configured split reproduces train_ai_on_real_data."""
+    auditor = CrashPredictionAuditor(sample_census_gdf)
+    crash_df = sample_crash_panel
+    predictions = auditor.train_ai_on_real_data(crash_df)
+    backtest = auditor.backtest(crash_df, window=len(CRASH_TRAINING_YEARS), min_train_years=2)
+
+    assert backtest['test_year'].unique().tolist() == CRASH_ANALYSIS_YEARS[2:]
+    fold = backtest[backtest['test_year'] == CRASH_TEST_YEARS[0]].set_index('income_quintile')
+    assert fold['train_start_year'].iloc[0] == CRASH_TRAINING_YEARS[0]
+    expected = predictions.groupby('income_quintile', observed=True)['prediction_error_abs'].mean()
+    assert fold['mae'].tolist() == pytest.approx(expected.tolist())
+
+    expanding = auditor.backtest(crash_df, min_train_years=2)
+    assert (expanding['train_start_year'] == CRASH_ANALYSIS_YEARS[0]).all()
+
+    summary = CrashPredictionAuditor.summarize_backtest(pd.concat([backtest, expanding]))
+    assert summary['rolling']['folds'] == summary['expanding']['folds'] == len(CRASH_ANALYSIS_YEARS) - 2
+
+
+def test_compare_models(sample_census_gdf, sample_crash_panel):
+    """Test that every model is scored on the split train_ai_on_real_data uses."""
+    auditor = CrashPredictionAuditor(sample_census_gdf)
+    crash_df = sample_crash_panel
+    predictions = auditor.train_ai_on_real_data(crash_df)
+    comparison = auditor.compare_models(crash_df)
+
+    assert set(comparison['model']) == set(CRASH_MODELS)
+    assert (comparison.groupby('model')['tracts'].sum() == len(sample_census_gdf)).all()
+    assert (comparison['mae'] >= 0).all()
+
+    ridge = comparison[comparison['model'] == 'ridge']
+    expected = predictions.groupby('income_quintile', observed=True)['prediction_error_abs'].mean()
+    assert ridge['mae'].tolist() == pytest.approx(expected.tolist())
@@ -0,0 +1,88 @@
+"""
+Tests for raw-data loaders and their Parquet twins.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from utils.data_loading import (
+    load_census_tracts,
+    load_crash_records,
+    parquet_path_for,
+    type_crash_records,
+    write_parquet_twin,
+)
+
+
+@pytest.fixture
+def crash_csv(tmp_path):
+    """Small NCDOT-style crash CSV."""
+    path = tmp_path / 'crashes.csv'
+    pd.DataFrame({
+        'CrashID': [1, 2, 3],
+        'CrashYear': [2019, 2020, 2021],
+        'CrashMonth': [1, 6, None],
+        'Latitude': [35.99, 36.01, 36.05],
+        'Longitude': [-78.90, -78.88, -78.91],
+        'CrashSevr': ['A', 'K', 'A'],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_crash_records_typed(crash_csv):
+    """Test typed columns from the CSV fallback."""
+    df = load_crash_records(crash_csv)
+
+    assert df['CrashYear'].dtype == 'int32'
+    assert df['CrashMonth'].dtype == 'float64'  # has a missing value
+    assert df['Latitude'].dtype == 'float32'
+    assert isinstance(df['CrashSevr'].dtype, pd.CategoricalDtype)
+
+
+def test_parquet_twin_preferred_when_current(crash_csv):
+    """Test loader reads the twin while the export's content matches it, whatever the mtimes."""
+    twin_df = type_crash_records(pd.read_csv(crash_csv)).iloc[:2]
+    twin = write_parquet_twin(twin_df, crash_csv)
+    assert twin == parquet_path_for(crash_csv)
+
+    df = load_crash_records(crash_csv)
+    assert len(df) == 2
+    pd.testing.assert_frame_equal(df, twin_df)
+
+    # A newer mtime alone (e.g. a fresh checkout) keeps the twin
+    mtime = twin.stat().st_mtime
+    os.utime(crash_csv, (mtime + 10, mtime + 10))
+    assert len(load_crash_records(crash_csv)) == 2
+
+    # An edited export wins over a stale twin, even one that looks newer
+    crash_csv.write_text(crash_csv.read_text() + '4,2022,3,35.98,-78.92,B\n')
+    os.utime(twin, (mtime + 20, mtime + 20))
+    assert len(load_crash_records(crash_csv)) == 4
+
+
+def test_parquet_twin_without_source_hash_ignored(crash_csv):
+    """Test a twin that doesn't record its export's hash isn't trusted over the export."""
+    type_crash_records(pd.read_csv(crash_csv)).iloc[:1].to_parquet(parquet_path_for(crash_csv), index=False)
+
+    assert len(load_crash_records(crash_csv)) == 3
+
+
+def test_census_geoparquet_round_trip(sample_census_gdf, tmp_path):
+    """Test GeoParquet twin preserves geometry, CRS and attributes."""
+    export = tmp_path / 'tracts.geojson'
+    sample_census_gdf.to_file(export, driver='GeoJSON')
+    write_parquet_twin(sample_census_gdf, export)
+
+    gdf = load_census_tracts(export)
+
+    assert gdf.crs == sample_census_gdf.crs
+    assert gdf.geometry.equals(sample_census_gdf.geometry)
+    assert gdf['tract_id'].tolist() == sample_census_gdf['tract_id'].tolist()
+
+
+def test_missing_data_raises(tmp_path):
+    """Test missing export and twin raise FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match='Crash data not found'):
+        load_crash_records(tmp_path / 'missing.csv')
@@ -0,0 +1,116 @@
+"""
+Tests for the process-wide dataset registry.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+
+from models.crash_predictor import CrashPredictionAuditor
+from models.demand_analyzer import SuppressedDemandAnalyzer
+from models.infrastructure_auditor import InfrastructureRecommendationAuditor
+from models.volume_estimator import VolumeEstimationAuditor
+from utils import datasets
+
+
+@pytest.fixture
+def raw_files(tmp_path, sample_census_gdf, sample_infrastructure_df, monkeypatch):
+    """Raw exports on disk plus per-loader parse counters."""
+    census = tmp_path / 'tracts.geojson'
+    sample_census_gdf.to_file(census, driver='GeoJSON')
+
+    infra = tmp_path / 'osm.json'
+    with open(infra, 'w') as f:
+        json.dump({'tracts': sample_infrastructure_df.to_dict(orient='records')}, f)
+
+    crashes = tmp_path / 'crashes.csv'
+    pd.DataFrame({
+        'CrashID': [1, 2], 'CrashDate': ['2023-01-05', '2023-02-07'], 'CrashYear': [2023, 2023],
+        'Latitude': [0.5, 1.5], 'Longitude': [0.5, 1.5],
+    }).to_csv(crashes, index=False)
+
+    calls = {'census': 0, 'crashes': 0, 'infra': 0}
+
+    def counting(name, loader):
+        def wrapper(path):
+            calls[name] += 1
+            return loader(path)
+        return wrapper
+
+    monkeypatch.setattr(datasets, 'load_census_tracts', counting('census', datasets.load_census_tracts))
+    monkeypatch.setattr(datasets, 'load_crash_records', counting('crashes', datasets.load_crash_records))
+    monkeypatch.setattr(datasets, 'load_infrastructure_data',
+                        counting('infra', datasets.load_infrastructure_data))
+    datasets.clear()
+    yield {'census': census, 'infra': infra, 'crashes': crashes, 'calls': calls}
+    datasets.clear()
+
+
+def test_each_input_parsed_once_across_audits(raw_files, sample_predictions_df):
+    """Test all four audits share one parse of each input."""
+    census, infra = raw_files['census'], raw_files['infra']
+
+    VolumeEstimationAuditor(datasets.census_tracts(census), sample_predictions_df, sample_predictions_df.copy())
+    crash_auditor = CrashPredictionAuditor(datasets.census_tracts(census))
+    crash_auditor.years = [2023]
+    crash_auditor.load_real_crash_data(raw_files['crashes'])
+    InfrastructureRecommendationAuditor(datasets.census_tracts(census), datasets.infrastructure_scores(infra))
+    SuppressedDemandAnalyzer(datasets.census_tracts(census), datasets.infrastructure_scores(infra))
+
+    assert raw_files['calls'] == {'census': 1, 'crashes': 1, 'infra': 1}
+
+
+def test_views_are_isolated_and_read_only(raw_files):
+    """Test column changes stay local and in-place writes raise."""
+    first = datasets.census_tracts(raw_files['census'])
+    first['median_income'] = 0
+    first['extra'] = 1
+
+    second = datasets.census_tracts(raw_files['census'])
+    assert second['median_income'].iloc[0] == 30000
+    assert 'extra' not in second.columns
+
+    with pytest.raises(ValueError, match='read-only'):
+        second.loc[0, 'total_population'] = 1
+
+
+def test_object_and_geometry_columns_copied_per_view(raw_files):
+    """Test in-place edits to tract ids and geometry don't leak into other views."""
+    first = datasets.census_tracts(raw_files['census'])
+    first.loc[0, 'tract_id'] = 'edited'
+    first.loc[0, 'geometry'] = Point(0, 0)
+
+    second = datasets.census_tracts(raw_files['census'])
+    assert second['tract_id'].iloc[0] == '001'
+    assert second.geometry.iloc[0].geom_type == 'Polygon'
+    assert raw_files['calls']['census'] == 1
+
+
+def test_views_share_spatial_index(raw_files):
+    """Test every view reuses one STRtree until its geometry is edited."""
+    first = datasets.census_tracts(raw_files['census'])
+    second = datasets.census_tracts(raw_files['census'])
+    assert first.sindex is second.sindex
+
+    second.loc[0, 'geometry'] = Point(0, 0)
+    assert second.sindex is not first.sindex
+    assert datasets.census_tracts(raw_files['census']).sindex is first.sindex
+
+
+def test_reload_on_content_change_only(raw_files):
+    """Test mtime-only changes reuse the cache; content changes reload."""
+    path = raw_files['crashes']
+    datasets.crash_records(path)
+
+    stat = path.stat()
+    os.utime(path, (stat.st_atime + 5, stat.st_mtime + 5))
+    datasets.crash_records(path)
+    assert raw_files['calls']['crashes'] == 1
+
+    with open(path, 'a') as f:
+        f.write('3,2023-03-01,2023,0.5,2.5\n')
+    assert len(datasets.crash_records(path)) == 3
+    assert raw_files['calls']['crashes'] == 2
@@ -35,6 +35,35 @@ def test_infrastructure_scores_from_osm(sample_census_gdf, sample_infrastructure
         )
 
 
+def test_calculate_potential_demand(sample_census_gdf, sample_infrastructure_df):
+    """Test potential demand factors and reproducibility."""
+    analyzer = SuppressedDemandAnalyzer(sample_census_gdf, sample_infrastructure_df)
+    demand_df = analyzer.calculate_potential_demand(base_rate=0.1, seed=7)
+
+    assert demand_df['tract_id'].tolist() == sample_census_gdf['tract_id'].tolist()
+    assert demand_df['income_factor'].between(1.0, 1.5).all()
+    assert demand_df['destination_factor'].between(0.8, 1.2).all()
+    expected = demand_df['population'] * 0.1 * demand_df['income_factor'] * demand_df['destination_factor']
+    pd.testing.assert_series_equal(demand_df['potential_demand'], expected, check_names=False)
+    pd.testing.assert_frame_equal(demand_df, analyzer.calculate_potential_demand(base_rate=0.1, seed=7))
+
+
+def test_aggregate_by_quintile(sample_census_gdf, sample_infrastructure_df):
+    """Test that the grouped pass matches per-quintile filtering and labels standalone calls."""
+    analyzer = SuppressedDemandAnalyzer(sample_census_gdf, sample_infrastructure_df)
+    demand_df = analyzer.run_analysis(seed=7)['demand_data']
+    aggregates = analyzer.aggregate_by_quintile(demand_df)
+
+    for quintile, group in demand_df.groupby('income_quintile', observed=True):
+        assert aggregates.loc[quintile, ('potential_demand', 'sum')] == pytest.approx(group['potential_demand'].sum())
+        assert aggregates.loc[quintile, ('suppression_pct', 'mean')] == pytest.approx(group['suppression_pct'].mean())
+
+    # Standalone calls label quintiles themselves without touching the input
+    unlabeled = demand_df.drop(columns='income_quintile')
+    assert analyzer.calculate_detection_scorecard(unlabeled) == analyzer.calculate_detection_scorecard(demand_df)
+    assert 'income_quintile' not in unlabeled.columns
+
+
 def test_suppressed_demand_config():
     """Test suppressed demand configuration."""
     assert 'base_rate' in SUPPRESSED_DEMAND_CONFIG
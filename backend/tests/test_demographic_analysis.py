@@ -13,7 +13,11 @@ from utils.demographic_analysis import (
     disparate_impact_ratio,
     calculate_gini_coefficient,
     demographic_stratified_analysis,
+    quintile_cut_points,
+    assign_income_quintiles,
+    income_quintile_labels,
 )
+from config import QUINTILE_LABELS
 
 
 def test_calculate_income_quintiles():
@@ -40,6 +44,39 @@ def test_calculate_income_quintiles_with_nan():
     assert result['income_quintile'].notna().sum() == 4
 
 
+def test_assign_income_quintiles_matches_quantile_rule():
+    """Test vectorized quintiles match the <= quantile cut-point rule."""
+    incomes = np.array([12000, 30000, 30000, 45000, 52000, 61000, 75000, 88000, 99000, 150000])
+    cuts = pd.Series(incomes).quantile([0.2, 0.4, 0.6, 0.8]).to_numpy()
+
+    expected = [1 + sum(income > cut for cut in cuts) for income in incomes]
+    result = assign_income_quintiles(incomes)
+
+    assert np.allclose(quintile_cut_points(incomes), cuts)
+    assert result.tolist() == expected
+
+
+def test_assign_income_quintiles_with_reference_cut_points():
+    """Test quintiles can be assigned against another population's cut points."""
+    cuts = quintile_cut_points([20000, 40000, 60000, 80000, 100000])
+    result = assign_income_quintiles([10000, 200000, np.nan], cuts)
+
+    assert result[0] == 1
+    assert result[1] == 5
+    assert np.isnan(result[2])
+
+
+def test_income_quintile_labels_matches_qcut():
+    """Test categorical labels are a drop-in for pd.qcut."""
+    incomes = pd.Series([31000, 87000, 45000, 120000, 52000, 23000, 67000, 99000, 41000, 76000])
+    expected = pd.qcut(incomes, q=5, labels=QUINTILE_LABELS)
+    result = income_quintile_labels(incomes)
+
+    assert list(result.categories) == QUINTILE_LABELS
+    assert result.ordered
+    assert list(result) == list(expected)
+
+
 def test_calculate_minority_category():
     """Test minority category assignment."""
     df = pd.DataFrame({
@@ -52,6 +89,19 @@ def test_calculate_minority_category():
     assert result.loc[2, 'minority_category'] == 'High (>60%)'
 
 
+def test_calculate_minority_category_boundaries():
+    """Test category boundaries are closed on the left, and NaN is kept."""
+    df = pd.DataFrame({
+        'pct_minority': [29.9, 30, 59.9, 60, np.nan]
+    })
+    result = calculate_minority_category(df)
+
+    assert list(result['minority_category'][:4]) == [
+        'Low (<30%)', 'Medium (30-60%)', 'Medium (30-60%)', 'High (>60%)'
+    ]
+    assert pd.isna(result.loc[4, 'minority_category'])
+
+
 def test_calculate_error_metrics():
     """Test error metrics calculation."""
     df = pd.DataFrame({
@@ -101,6 +151,8 @@ def test_equity_gap_analysis(sample_census_gdf):
     assert 'gap_pct' in gap
     assert 'p_value' in gap
     assert gap['gap'] > 0
+    assert gap['gap_ci_lower'] <= gap['gap'] <= gap['gap_ci_upper']
+    assert 0 < gap['bootstrap_p_value'] <= 1
 
 
 def test_equity_gap_analysis_insufficient_groups():
@@ -113,6 +165,17 @@ def test_equity_gap_analysis_insufficient_groups():
     gap = equity_gap_analysis(df, 'metric', 'group')
     assert gap is None
 
+    # A second group with no metric values leaves nothing to bootstrap
+    df = pd.DataFrame({
+        'metric': [1.0, 2.0, np.nan, np.nan],
+        'group': ['A', 'A', 'B', 'B']
+    })
+
+    gap = equity_gap_analysis(df, 'metric', 'group')
+    assert gap['gap'] == 0.0
+    assert gap['gap_ci_lower'] == gap['gap_ci_upper'] == 0.0
+    assert gap['bootstrap_p_value'] == 1.0
+
 
 def test_disparate_impact_ratio():
     """Test disparate impact ratio calculation."""
@@ -2,6 +2,9 @@
 Tests for geospatial utilities.
 """
 
+import io
+import json
+
 import pytest
 import pandas as pd
 import geopandas as gpd
@@ -9,9 +12,13 @@ from shapely.geometry import Point, Polygon
 from utils.geospatial import (
     calculate_centroid,
     point_in_tract,
+    points_to_tracts,
+    locate_points,
     simplify_geometry,
     calculate_area_demographics,
     create_choropleth_data,
+    geojson_to_dict,
+    write_geojson,
 )
 
 
@@ -50,6 +57,26 @@ def test_point_in_tract_boundary(sample_census_gdf):
     assert tract['tract_id'] == '001'
 
 
+def test_points_to_tracts_batch(sample_census_gdf):
+    """Test batch geocoding returns tract ids aligned with the input points."""
+    lons = [0.5, 4.5, 10.0, 2.2]
+    lats = [0.5, 0.5, 10.0, 0.9]
+
+    result = points_to_tracts(lons, lats, sample_census_gdf)
+
+    assert result.tolist() == ['001', '005', None, '003']
+
+
+def test_locate_points_prefers_first_tract_on_overlap(sample_census_gdf):
+    """Test overlapping tracts resolve to the first one in row order."""
+    gdf = pd.concat([sample_census_gdf, sample_census_gdf.iloc[[0]].assign(tract_id='999')],
+                    ignore_index=True)
+
+    positions = locate_points([0.5], [0.5], gdf)
+
+    assert positions.tolist() == [0]
+
+
 def test_simplify_geometry(sample_census_gdf):
     """Test geometry simplification."""
     original_gdf = sample_census_gdf.copy()
@@ -117,3 +144,56 @@ def test_create_choropleth_data_with_nan():
 
     assert result[0]['value'] == 100.0
     assert result[1]['value'] is None
+
+
+def test_create_choropleth_data_properties_are_json_safe():
+    """Test properties hold plain Python values with NaN mapped to None."""
+    gdf = gpd.GeoDataFrame({
+        'tract_id': ['001', '002'],
+        'metric': [1.5, float('nan')],
+        'count': [3, 4],
+        'label': ['a', None],
+    }, geometry=[
+        Polygon([(0, 0), (0, 1), (1, 1), (1, 0)]),
+        Polygon([(1, 0), (1, 1), (2, 1), (2, 0)]),
+    ])
+
+    result = create_choropleth_data(gdf, 'metric')
+
+    assert result[0]['properties'] == {'metric': 1.5, 'count': 3.0, 'label': 'a'}
+    assert result[1]['properties'] == {'metric': None, 'count': 4.0, 'label': None}
+    assert type(result[0]['properties']['count']) is float
+    assert 'geometry' not in result[0]['properties']
+
+
+def test_write_geojson_matches_to_json(sample_census_gdf):
+    """Test streamed GeoJSON parses to the same document as gdf.to_json()."""
+    buffer = io.StringIO()
+    write_geojson(sample_census_gdf, buffer, precision=None)
+
+    assert json.loads(buffer.getvalue()) == geojson_to_dict(sample_census_gdf)
+
+    # Chunk boundaries don't show in the output
+    chunked = io.StringIO()
+    write_geojson(sample_census_gdf, chunked, precision=None, chunk_size=2)
+    assert chunked.getvalue() == buffer.getvalue()
+
+
+def test_write_geojson_rounds_coordinates_and_handles_missing():
+    """Test coordinate precision control, NaN properties and empty geometries."""
+    gdf = gpd.GeoDataFrame({
+        'tract_id': ['001', '002'],
+        'metric': [1.5, None],
+        'quintile': pd.Categorical(['Q1 (Poorest)', None]),
+    }, geometry=[Point(-78.123456789, 35.987654321), None])
+
+    buffer = io.StringIO()
+    write_geojson(gdf, buffer, precision=5)
+    result = json.loads(buffer.getvalue())
+
+    first, second = result['features']
+    assert first['geometry']['coordinates'] == [-78.12346, 35.98765]
+    assert first['properties'] == {'tract_id': '001', 'metric': 1.5, 'quintile': 'Q1 (Poorest)'}
+    assert second['properties'] == {'tract_id': '002', 'metric': None, 'quintile': None}
+    assert second['geometry'] is None
+    assert ', ' not in buffer.getvalue()
@@ -2,6 +2,7 @@
 Tests for infrastructure recommendation auditor model.
 """
 
+import numpy as np
 import pytest
 import pandas as pd
 from models.infrastructure_auditor import InfrastructureRecommendationAuditor
@@ -21,6 +22,20 @@ def test_infrastructure_auditor_requires_infrastructure_df(sample_census_gdf):
         InfrastructureRecommendationAuditor(sample_census_gdf)
 
 
+def test_simulate_danger_scores(sample_census_gdf, sample_infrastructure_df):
+    """Test danger score schema, seeding and the income gradient."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df)
+    scores = auditor.simulate_danger_scores(seed=7)
+
+    assert list(scores.columns) == ['tract_id', 'danger_score', 'annual_crashes', 'median_income', 'population']
+    assert scores['tract_id'].tolist() == sample_census_gdf['tract_id'].tolist()
+    assert auditor.danger_scores is scores
+    pd.testing.assert_frame_equal(scores, auditor.simulate_danger_scores(seed=7))
+
+    # Poorest tract outranks the richest even at the extremes of the ±20% noise
+    assert scores['danger_score'].iloc[0] > scores['danger_score'].iloc[-1]
+
+
 def test_select_project_type_for_gap(sample_census_gdf, sample_infrastructure_df):
     """Test that gap-based project selection picks the type with lowest density."""
     auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df)
@@ -41,6 +56,97 @@ def test_select_project_type_for_gap(sample_census_gdf, sample_infrastructure_df
     assert result == 'speed_reduction'
 
 
+def test_gap_project_types(sample_census_gdf, sample_infrastructure_df):
+    """Test the precomputed tract -> project type lookup."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df)
+
+    # Ties go to the first density column; unknown tracts default to crosswalks
+    assert auditor.gap_project_types['001'] == 'bike_lane'
+    assert auditor.gap_project_types['005'] == 'speed_reduction'
+    assert auditor._select_project_type_for_gap('999') == 'crosswalk'
+
+    # Missing densities count as no infrastructure at all
+    infra = sample_infrastructure_df.copy()
+    infra.loc[infra['tract_id'] == '005', 'crossings_density'] = np.nan
+    assert InfrastructureRecommendationAuditor._gap_project_types(infra)['005'] == 'crosswalk'
+
+    recs = auditor.simulate_need_based_recommendations(seed=7)
+    assert (recs['project_type'] == recs['tract_id'].map(auditor.gap_project_types)).all()
+
+
+def test_sweep_allocations_matches_single_runs(sample_census_gdf, sample_infrastructure_df):
+    """Test that each sweep cell matches a standalone allocation at that budget."""
+    budgets = [100_000, 300_000, 600_000]
+    sweep = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df).sweep_allocations(
+        budgets=budgets, bias_strengths=[0.0, 0.6], seed=7
+    )
+    assert len(sweep) == len(budgets) * 3
+    assert sweep['allocation'].value_counts().to_dict() == {'ai': 6, 'need_based': 3}
+
+    for budget in budgets:
+        auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=budget)
+        ai_recs = auditor.simulate_ai_recommendations(bias_strength=0.6, seed=7)
+        need_recs = auditor.simulate_need_based_recommendations(seed=7)
+        metrics = auditor.calculate_equity_metrics()
+
+        ai_cell = sweep[(sweep['allocation'] == 'ai') & (sweep['bias_strength'] == 0.6) & (sweep['budget'] == budget)].iloc[0]
+        need_cell = sweep[(sweep['allocation'] == 'need_based') & (sweep['budget'] == budget)].iloc[0]
+        assert ai_cell['projects'] == len(ai_recs)
+        assert ai_cell['budget_allocated'] == ai_recs['cost'].sum()
+        assert need_cell['projects'] == len(need_recs)
+        assert need_cell['budget_allocated'] == need_recs['cost'].sum()
+        for cell, key in ((ai_cell, 'ai_allocation'), (need_cell, 'need_based_allocation')):
+            np.testing.assert_allclose(cell['disparate_impact_ratio'], metrics[key]['disparate_impact_ratio'])
+            np.testing.assert_allclose(cell['gini_coefficient'], metrics[key]['gini_coefficient'])
+
+
+def test_optimal_need_based_engine(sample_census_gdf, sample_infrastructure_df):
+    """Test the optimal engine against greedy and its quintile floors."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=400_000)
+    greedy = auditor.simulate_need_based_recommendations(seed=7)
+    optimal = auditor.simulate_need_based_recommendations(seed=7, engine='optimal')
+
+    def impact(recs):
+        return (recs['danger_score'] * recs['safety_impact']).sum()
+
+    assert list(optimal.columns) == list(greedy.columns)
+    assert optimal['tract_id'].is_unique
+    assert optimal['cost'].sum() <= 400_000
+    assert impact(optimal) >= impact(greedy)
+
+    floored = auditor.simulate_need_based_recommendations(
+        seed=7, engine='optimal', quintile_floors={'Q5 (Richest)': 0.25}
+    )
+    assert floored.loc[floored['tract_id'] == '005', 'cost'].sum() >= 100_000
+
+    with pytest.raises(ValueError, match="Unknown allocation engine"):
+        auditor.simulate_need_based_recommendations(engine='simplex')
+
+
+def test_marginal_need_based_engine(sample_census_gdf, sample_infrastructure_df):
+    """Test that the marginal engine can fund several project types per tract."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=2_000_000)
+    recs = auditor.simulate_need_based_recommendations(seed=7, engine='marginal')
+
+    assert recs['cost'].sum() <= 2_000_000
+    assert not recs.duplicated(['tract_id', 'project_type']).any()
+    assert recs['tract_id'].value_counts().max() > 1
+
+
+def test_monte_carlo(sample_census_gdf, sample_infrastructure_df):
+    """Test that Monte Carlo intervals bracket their means and are reproducible."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=300_000)
+    result = auditor.monte_carlo(n_replicates=200, seed=7)
+
+    assert result['replicates'] == 200
+    for allocation in ('ai_allocation', 'need_based_allocation'):
+        gini = result[allocation]['gini_coefficient']
+        assert gini['replicates'] == 200
+        assert gini['ci_lower'] <= gini['mean'] <= gini['ci_upper']
+    assert result == auditor.monte_carlo(n_replicates=200, seed=7)
+    assert result != auditor.monte_carlo(n_replicates=200, seed=8)
+
+
 def test_infrastructure_project_types_from_config():
     """Test that project types are loaded from config."""
     assert 'bike_lane' in INFRASTRUCTURE_PROJECT_TYPES
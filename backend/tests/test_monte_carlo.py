@@ -0,0 +1,43 @@
+"""
+Tests for Monte Carlo helpers.
+"""
+
+import numpy as np
+import pytest
+from utils.monte_carlo import group_means, group_sums, rowwise_corr, summarize_replicates
+
+
+def test_summarize_replicates():
+    """Test the mean and central interval, ignoring non-finite replicates."""
+    samples = np.append(np.arange(101, dtype=float), [np.inf, np.nan])
+    summary = summarize_replicates(samples, level=0.9)
+
+    assert summary['replicates'] == 101
+    assert summary['mean'] == pytest.approx(50.0)
+    assert summary['ci_lower'] == pytest.approx(5.0)
+    assert summary['ci_upper'] == pytest.approx(95.0)
+
+    assert summarize_replicates([np.nan])['mean'] is None
+
+
+def test_group_sums_and_means():
+    """Test per-group reductions along the replicate axis."""
+    values = np.array([[1.0, 2.0, 3.0, 4.0], [10.0, 20.0, 30.0, 40.0]])
+    codes = np.array([0, 1, 0, -1])
+
+    np.testing.assert_array_equal(group_sums(values, codes, 3), [[4, 2, 0], [40, 20, 0]])
+    means = group_means(values, codes, 3)
+    np.testing.assert_array_equal(means[:, :2], [[2, 2], [20, 20]])
+    assert np.isnan(means[:, 2]).all()
+
+
+def test_rowwise_corr():
+    """Test that per-replicate correlations match np.corrcoef."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(5, 30))
+    y = x + rng.normal(size=(5, 30))
+
+    expected = [np.corrcoef(xr, yr)[0, 1] for xr, yr in zip(x, y)]
+    np.testing.assert_allclose(rowwise_corr(x, y), expected)
+    # A shared 1-D argument broadcasts across replicates
+    np.testing.assert_allclose(rowwise_corr(x, x[0]), [np.corrcoef(xr, x[0])[0, 1] for xr in x])
@@ -0,0 +1,30 @@
+"""
+Tests for writing in-memory audit outputs.
+"""
+
+import json
+
+import pandas as pd
+
+from utils.outputs import write_outputs
+
+
+def test_write_outputs_by_type(tmp_path, sample_census_gdf):
+    """Test GeoDataFrames, DataFrames and plain data each get their file format."""
+    outputs = {
+        'geo.json': sample_census_gdf[['tract_id', 'geometry']],
+        'records.json': pd.DataFrame({'tract_id': ['001'], 'value': [1.5]}),
+        'report.json': {'summary': {'total': 3}},
+    }
+
+    write_outputs(outputs, tmp_path / 'out')
+
+    geo = json.loads((tmp_path / 'out' / 'geo.json').read_text())
+    assert geo['type'] == 'FeatureCollection'
+    assert len(geo['features']) == 5
+
+    records = json.loads((tmp_path / 'out' / 'records.json').read_text())
+    assert records == [{'tract_id': '001', 'value': 1.5}]
+
+    report = json.loads((tmp_path / 'out' / 'report.json').read_text())
+    assert report == {'summary': {'total': 3}}
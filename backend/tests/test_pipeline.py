@@ -0,0 +1,60 @@
+"""
+Tests for incremental pipeline utilities.
+"""
+
+from utils.pipeline import file_digest, stage_fingerprint, load_state, save_state, is_stale
+
+
+def test_file_digest(tmp_path):
+    """Test digest depends on content, not path or mtime."""
+    a = tmp_path / 'a.json'
+    b = tmp_path / 'b.json'
+    a.write_text('{"x": 1}')
+    b.write_text('{"x": 1}')
+
+    assert file_digest(a) == file_digest(b)
+    assert file_digest(tmp_path / 'missing.json') is None
+
+
+def test_stage_fingerprint_tracks_content_and_config(tmp_path):
+    """Test fingerprint changes with input content and config values only."""
+    data = tmp_path / 'data.csv'
+    data.write_text('a,b\n1,2\n')
+
+    base = stage_fingerprint([data], {'seed': 42})
+    assert stage_fingerprint([data], {'seed': 42}) == base
+    assert stage_fingerprint([data], {'seed': 7}) != base
+
+    data.write_text('a,b\n1,3\n')
+    assert stage_fingerprint([data], {'seed': 42}) != base
+
+
+def test_stage_fingerprint_relative_to_root(tmp_path):
+    """Test the same files under another checkout directory keep their fingerprint."""
+    fingerprints = []
+    for checkout in ('a', 'b'):
+        data = tmp_path / checkout / 'data' / 'in.csv'
+        data.parent.mkdir(parents=True)
+        data.write_text('a,b\n1,2\n')
+        fingerprints.append(stage_fingerprint([data], {'seed': 42}, root=tmp_path / checkout))
+
+    assert fingerprints[0] == fingerprints[1]
+    assert stage_fingerprint([tmp_path / 'a' / 'data' / 'in.csv'], {'seed': 42}) != fingerprints[0]
+
+
+def test_is_stale(tmp_path):
+    """Test staleness from fingerprint changes and missing outputs."""
+    output = tmp_path / 'out.json'
+    output.write_text('{}')
+    state_file = tmp_path / 'state.json'
+
+    assert load_state(state_file) == {}
+    save_state(state_file, {'stage': 'abc'})
+    state = load_state(state_file)
+
+    assert not is_stale('stage', 'abc', [output], state)
+    assert is_stale('stage', 'def', [output], state)
+    assert is_stale('other', 'abc', [output], state)
+
+    output.unlink()
+    assert is_stale('stage', 'abc', [output], state)
@@ -0,0 +1,46 @@
+"""
+Tests for random number helpers.
+"""
+
+import numpy as np
+from models.infrastructure_auditor import InfrastructureRecommendationAuditor
+from utils.rng import make_rng, spawn_rngs, spawn_seeds
+
+
+def test_make_rng_passes_generators_through():
+    """Test that seeds build fresh Generators and Generators are reused."""
+    rng = np.random.default_rng(1)
+    assert make_rng(rng) is rng
+    assert make_rng(5).random() == make_rng(5).random()
+
+
+def test_spawn_rngs_independent_and_reproducible():
+    """Test that spawned streams differ from each other but not across runs."""
+    first = [rng.random(3) for rng in spawn_rngs(42, 3)]
+    second = [rng.random(3) for rng in spawn_rngs(42, 3)]
+    np.testing.assert_array_equal(first, second)
+    assert not np.allclose(first[0], first[1])
+
+
+def test_spawn_seeds_reusable():
+    """Test that child seeds match SeedSequence.spawn and can be reused as parents."""
+    children = spawn_seeds(42, 2)
+    assert [child.spawn_key for child in children] == [(0,), (1,)]
+    np.testing.assert_array_equal(children[1].generate_state(4),
+                                  np.random.SeedSequence(42).spawn(2)[1].generate_state(4))
+
+    # Spawning from a child doesn't advance it, unlike SeedSequence.spawn
+    first = spawn_rngs(children[0], 1)[0].random(3)
+    np.testing.assert_array_equal(first, spawn_rngs(children[0], 1)[0].random(3))
+
+
+def test_simulations_ignore_global_rng(sample_census_gdf, sample_infrastructure_df):
+    """Test that seeded simulations don't depend on global RNG state or call order."""
+    auditor = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=400_000)
+    np.random.seed(0)
+    expected = auditor.simulate_ai_recommendations(seed=3)
+
+    np.random.seed(1)
+    fresh = InfrastructureRecommendationAuditor(sample_census_gdf, sample_infrastructure_df, total_budget=400_000)
+    fresh.simulate_danger_scores(seed=3)
+    assert fresh.simulate_ai_recommendations(seed=3).equals(expected)
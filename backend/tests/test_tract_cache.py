@@ -0,0 +1,42 @@
+"""
+Tests for the persisted point-to-tract assignment cache.
+"""
+
+from shapely.affinity import translate
+
+from utils.tract_cache import cached_points_to_tracts
+
+
+def test_cached_points_to_tracts(tmp_path, sample_census_gdf):
+    """Test that only new or moved points are located again."""
+    ids, lons, lats = [10, 11, 12], [0.5, 1.5, 9.5], [0.5, 0.5, 0.5]
+
+    tract_ids, located = cached_points_to_tracts(ids, lons, lats, sample_census_gdf, tmp_path, 'crash')
+    assert tract_ids.tolist() == ['001', '002', None]
+    assert located == 3
+
+    # Cached points (including the one outside every tract) are reused
+    tract_ids, located = cached_points_to_tracts(ids + [13], lons + [4.5], lats + [0.5],
+                                                 sample_census_gdf, tmp_path, 'crash')
+    assert tract_ids.tolist() == ['001', '002', None, '005']
+    assert located == 1
+
+    # A revised location is located again
+    tract_ids, located = cached_points_to_tracts([10], [2.5], [0.5], sample_census_gdf, tmp_path, 'crash')
+    assert tract_ids.tolist() == ['003']
+    assert located == 1
+
+
+def test_cached_points_to_tracts_new_geometry(tmp_path, sample_census_gdf):
+    """Test that changed tract geometry starts a fresh cache."""
+    cached_points_to_tracts([1], [0.5], [0.5], sample_census_gdf, tmp_path, 'crash')
+    first_cache = list(tmp_path.glob('crash_tracts_*.parquet'))
+
+    shifted = sample_census_gdf.copy()
+    shifted['geometry'] = shifted.geometry.apply(lambda geom: translate(geom, xoff=0.4))
+    tract_ids, located = cached_points_to_tracts([1], [0.5], [0.5], shifted, tmp_path, 'crash')
+
+    assert tract_ids.tolist() == ['001']
+    assert located == 1
+    caches = list(tmp_path.glob('crash_tracts_*.parquet'))
+    assert len(caches) == 1 and caches != first_cache
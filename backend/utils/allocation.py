@@ -0,0 +1,235 @@
+"""Budget allocation helpers — greedy, exact (knapsack) and marginal-benefit project selection."""
+
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+
+
+def greedy_allocate(costs, budgets) -> np.ndarray:
+    """
+    Greedy budget allocation over projects already sorted by priority.
+
+    Walks the projects in order, funding each one that fits in the remaining
+    budget and skipping (but continuing past) any that doesn't, until the
+    budget runs out. Computed in cumulative-sum passes rather than a row
+    loop: each pass funds the longest affordable prefix of the remaining
+    candidates, and a project that didn't fit can never fit later, so the
+    number of passes is bounded by the number of distinct costs.
+
+    Args:
+        costs: 1-D array of positive project costs, in priority order, or a
+            2-D (allocations, projects) array with one ordering per row
+        budgets: Scalar budget, or 1-D array of budgets allocated in one
+            call (one per row of 2-D costs, or all over the same 1-D ordering)
+
+    Returns:
+        Boolean mask of funded projects — shape (n,) for a scalar budget and
+        1-D costs, (allocations, n) otherwise
+    """
+    costs = np.asarray(costs, dtype=float)
+    budgets = np.asarray(budgets, dtype=float)
+    if costs.ndim not in (1, 2):
+        raise ValueError("costs must be 1-D or 2-D")
+    if (costs <= 0).any():
+        raise ValueError("costs must be positive")
+
+    rows = costs.shape[0] if costs.ndim == 2 else budgets.size
+    remaining = np.broadcast_to(np.atleast_1d(budgets), (rows,)).astype(float)
+    funded = np.zeros((rows, costs.shape[-1]), dtype=bool)
+
+    while True:
+        candidates = ~funded & (costs <= remaining[:, None])
+        spent = np.cumsum(np.where(candidates, costs, 0.0), axis=1)
+        # Fund candidates whose running total still fits; cumulative spend
+        # only grows, so these form a prefix of each row's candidates
+        take = candidates & (spent <= remaining[:, None])
+        if not take.any():
+            break
+        funded |= take
+        remaining -= np.where(take, costs, 0.0).sum(axis=1)
+
+    return funded[0] if budgets.ndim == 0 and costs.ndim == 1 else funded
+
+
+def _stratum_frontier(costs, values, items, n_units):
+    """
+    Multiple-choice knapsack DP over one stratum's candidates.
+
+    Returns the best value for every exact spend in cost units (-inf where
+    unreachable), the items in DP order, and each item's chosen candidate
+    per spend level (-1 = none) for backtracking.
+    """
+    best = np.full(n_units + 1, -np.inf)
+    best[0] = 0.0
+
+    order = np.argsort(items, kind='stable')
+    item_ids, starts = np.unique(items[order], return_index=True)
+    bounds = np.append(starts, len(order))
+
+    spend = np.arange(n_units + 1)
+    choices = np.full((len(item_ids), n_units + 1), -1, dtype=np.int64)
+    for i in range(len(item_ids)):
+        candidates = order[bounds[i]:bounds[i + 1]]
+        # options[k, s]: best value at spend s if the item funds candidate k
+        remainder = spend[None, :] - costs[candidates][:, None]
+        options = np.where(remainder >= 0, best[np.maximum(remainder, 0)], -np.inf) + values[candidates][:, None]
+        pick = options.argmax(axis=0)
+        gain = options[pick, spend]
+        improved = gain > best
+        best = np.where(improved, gain, best)
+        choices[i] = np.where(improved, candidates[pick], -1)
+    return best, item_ids, choices
+
+
+def knapsack_allocate(costs, values, items, budget, unit=None, strata=None, floors=None) -> np.ndarray:
+    """
+    Exact value-maximizing allocation under a budget (multiple-choice knapsack).
+
+    Each item (e.g. a tract) funds at most one of its candidates (e.g. one
+    project type). Solved by dynamic programming over cost units, which is
+    exact and fast when costs share a coarse unit ($25k for the configured
+    project types): O(candidates x budget units).
+
+    With strata, each stratum is solved separately for every exact spend and
+    the strata are combined by a max-plus convolution that enforces a
+    minimum spend per stratum.
+
+    Args:
+        costs: 1-D array of positive candidate costs
+        values: Candidate values to maximize
+        items: Item id per candidate; at most one candidate per item is funded
+        budget: Total budget ($)
+        unit: Cost unit; defaults to the GCD of integer costs
+        strata: Stratum id per candidate (constant within an item)
+        floors: Dict of stratum id -> minimum spend ($)
+
+    Returns:
+        Boolean mask of funded candidates
+
+    Raises:
+        ValueError: If the floors cannot all be met within the budget
+    """
+    costs = np.asarray(costs)
+    values = np.asarray(values, dtype=float)
+    items = np.asarray(items)
+    if (costs <= 0).any():
+        raise ValueError("costs must be positive")
+    if unit is None:
+        unit = int(np.gcd.reduce(costs.astype(np.int64))) if len(costs) else 1
+    if not np.allclose(costs / unit, np.round(costs / unit)):
+        raise ValueError(f"costs must be multiples of the cost unit ({unit})")
+
+    cost_units = np.round(costs / unit).astype(np.int64)
+    n_units = int(budget // unit)
+    strata = np.zeros(len(costs), dtype=np.int64) if strata is None else np.asarray(strata)
+    floors = floors or {}
+
+    funded = np.zeros(len(costs), dtype=bool)
+    if len(costs) == 0 or n_units < 0:
+        if any(floor > 0 for floor in floors.values()):
+            raise ValueError("Budget floors cannot be met within the budget")
+        return funded
+
+    # Per-stratum exact-spend frontiers, combined left to right; splits[k][s]
+    # is the spend given to stratum k when the first k+1 strata spend s
+    frontiers = []
+    splits = []
+    total = None
+    for stratum in np.unique(strata):
+        members = np.flatnonzero(strata == stratum)
+        best, item_ids, choices = _stratum_frontier(cost_units[members], values[members], items[members], n_units)
+        best[:int(np.ceil(floors.get(stratum, 0) / unit))] = -np.inf
+        frontiers.append((members, item_ids, choices))
+
+        if total is None:
+            total = best
+            splits.append(np.arange(n_units + 1))
+            continue
+
+        # Max-plus convolution: combined[s] = max_t total[s - t] + best[t]
+        combined = np.full(n_units + 1, -np.inf)
+        split = np.zeros(n_units + 1, dtype=np.int64)
+        for t in np.flatnonzero(np.isfinite(best)):
+            shifted = total[:n_units + 1 - t] + best[t]
+            improved = shifted > combined[t:]
+            combined[t:][improved] = shifted[improved]
+            split[t:][improved] = t
+        total = combined
+        splits.append(split)
+
+    missing = [stratum for stratum, floor in floors.items() if floor > 0 and stratum not in set(strata.tolist())]
+    if missing or not np.isfinite(total).any():
+        raise ValueError("Budget floors cannot be met within the budget")
+
+    # Backtrack: best total spend, then each stratum's share, then each item's choice
+    spend = int(np.argmax(total))
+    for (members, item_ids, choices), split in zip(reversed(frontiers), reversed(splits)):
+        stratum_spend = int(split[spend])
+        spend -= stratum_spend
+        for i in range(len(item_ids) - 1, -1, -1):
+            candidate = choices[i, stratum_spend]
+            if candidate >= 0:
+                funded[members[candidate]] = True
+                stratum_spend -= cost_units[members[candidate]]
+    return funded
+
+
+def marginal_allocate(costs, impacts, weights, items, budget) -> np.ndarray:
+    """
+    Greedy marginal-benefit allocation allowing several candidates per item.
+
+    A candidate's benefit is its item's weight times the item's remaining
+    risk times the candidate's impact, so each funded candidate shrinks the
+    remaining risk (by 1 - impact) and every further candidate at the same
+    item is worth less. Candidates are popped from a max-heap by benefit
+    per dollar; a popped score that predates a later funding at its item is
+    re-scored and pushed back instead of being funded (lazy evaluation: a
+    stale score can only overstate the benefit), which keeps the pass at
+    O((funded + re-scored) log candidates). Candidates that no longer fit
+    the remaining budget are dropped.
+
+    Args:
+        costs: 1-D array of positive candidate costs
+        impacts: Fraction of an item's remaining risk each candidate removes
+        weights: Item weight (e.g. danger score) per candidate
+        items: Item id per candidate
+        budget: Total budget ($)
+
+    Returns:
+        Boolean mask of funded candidates
+    """
+    costs = np.asarray(costs, dtype=float)
+    impacts = np.asarray(impacts, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if (costs <= 0).any():
+        raise ValueError("costs must be positive")
+
+    _, item_codes = np.unique(np.asarray(items), return_inverse=True)
+    remaining_risk = np.ones(item_codes.max() + 1 if len(item_codes) else 0)
+    version = np.zeros(len(remaining_risk), dtype=np.int64)
+
+    scores = weights * impacts / costs
+    heap = list(zip((-scores).tolist(), range(len(costs)), [0] * len(costs)))
+    heapq.heapify(heap)
+
+    funded = np.zeros(len(costs), dtype=bool)
+    remaining = float(budget)
+    cheapest = costs.min(initial=np.inf)
+    while heap and remaining >= cheapest:
+        _, candidate, scored_at = heapq.heappop(heap)
+        if costs[candidate] > remaining:
+            continue
+
+        item = item_codes[candidate]
+        if scored_at != version[item]:
+            score = weights[candidate] * remaining_risk[item] * impacts[candidate] / costs[candidate]
+            heapq.heappush(heap, (-score, candidate, version[item]))
+            continue
+
+        funded[candidate] = True
+        remaining -= costs[candidate]
+        remaining_risk[item] *= 1.0 - impacts[candidate]
+        version[item] += 1
+    return funded
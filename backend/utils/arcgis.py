@@ -0,0 +1,102 @@
+"""ArcGIS Feature Service utilities — concurrent paginated queries over a pooled, retrying session."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import ARCGIS_FETCH_CONFIG
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def arcgis_session(max_workers: int = ARCGIS_FETCH_CONFIG['max_workers'],
+                   max_retries: int = ARCGIS_FETCH_CONFIG['max_retries'],
+                   backoff_factor: float = ARCGIS_FETCH_CONFIG['backoff_factor']) -> requests.Session:
+    """Build a session whose connection pool fits max_workers and retries transient failures with backoff."""
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=max_workers)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _query(session: requests.Session, service_url: str, params: dict, timeout: float) -> dict:
+    """Run one query against a feature layer, raising on ArcGIS error payloads."""
+    response = session.get(f"{service_url}/query", params=params, timeout=timeout)
+    response.raise_for_status()
+
+    data = response.json()
+    if 'error' in data:
+        raise RuntimeError(f"ArcGIS query error: {data['error']}")
+    return data
+
+
+def query_count(session: requests.Session, service_url: str, where: str,
+                timeout: float = ARCGIS_FETCH_CONFIG['timeout']) -> int:
+    """Return the number of records matching a where clause."""
+    data = _query(session, service_url, {'where': where, 'returnCountOnly': 'true', 'f': 'json'}, timeout)
+    return int(data['count'])
+
+
+def iter_feature_pages(service_url: str, where: str, out_fields: Sequence[str], *,
+                       order_by: str,
+                       page_size: int = ARCGIS_FETCH_CONFIG['page_size'],
+                       max_workers: int = ARCGIS_FETCH_CONFIG['max_workers'],
+                       timeout: float = ARCGIS_FETCH_CONFIG['timeout'],
+                       session: Optional[requests.Session] = None) -> Iterator[list]:
+    """
+    Yield pages of attribute dicts for every record matching where, in order_by order.
+
+    Asks the service for the record count first, then fetches pages by
+    resultOffset concurrently. At most 2 * max_workers pages are held in
+    memory at once, so callers can stream each page to disk as it arrives.
+
+    Raises:
+        RuntimeError: If the service returns an error payload, or fewer
+            records than it counted (e.g. page_size exceeds maxRecordCount).
+    """
+    session = session or arcgis_session(max_workers=max_workers)
+    total = query_count(session, service_url, where, timeout)
+
+    base_params = {
+        'where': where,
+        'outFields': ','.join(out_fields),
+        'returnGeometry': 'false',
+        'orderByFields': order_by,
+        'resultRecordCount': page_size,
+        'f': 'json',
+    }
+
+    def fetch(offset: int) -> list:
+        data = _query(session, service_url, {**base_params, 'resultOffset': offset}, timeout)
+        features = data.get('features', [])
+        expected = min(page_size, total - offset)
+        if len(features) < expected:
+            raise RuntimeError(
+                f"ArcGIS page at offset {offset} returned {len(features)} records, expected {expected}"
+            )
+        return [f['attributes'] for f in features]
+
+    offsets = iter(range(0, total, page_size))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(executor.submit(fetch, offset)
+                        for _, offset in zip(range(2 * max_workers), offsets))
+        while pending:
+            page = pending.popleft().result()
+            next_offset = next(offsets, None)
+            if next_offset is not None:
+                pending.append(executor.submit(fetch, next_offset))
+            yield page
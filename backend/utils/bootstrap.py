@@ -0,0 +1,138 @@
+"""Bootstrap helpers — stratified resampling of per-row audit errors into group-gap intervals and p-values."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import BOOTSTRAP_RESAMPLES, DEFAULT_RANDOM_SEED, MONTE_CARLO_CI_LEVEL
+from utils.monte_carlo import group_means
+from utils.rng import SeedLike, make_rng
+
+
+def stratified_bootstrap_indices(codes, n_resamples: int, seed: SeedLike = None) -> np.ndarray:
+    """
+    Row indices for n_resamples stratified bootstrap resamples.
+
+    Every group is resampled with replacement within itself, so group sizes
+    are fixed and column j of the result always indexes a row from row j's
+    group: the original codes still label the resampled rows.
+
+    Args:
+        codes: Integer group code per row
+        n_resamples: Number of resamples (B)
+        seed: Seed or Generator for the draws
+
+    Returns:
+        (B, n) integer array of row indices
+    """
+    codes = np.asarray(codes)
+    _, inverse, sizes = np.unique(codes, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.cumsum(sizes) - sizes
+
+    # One uniform draw per (resample, row), scaled to an offset within the
+    # row's group and mapped through the group-sorted row order
+    draws = make_rng(seed).random((n_resamples, len(codes)))
+    offsets = (draws * sizes[inverse]).astype(np.intp)
+    return order[starts[inverse] + offsets]
+
+
+def _interval(samples: np.ndarray, level: float) -> np.ndarray:
+    """Percentile interval bounds along the resample axis, shape (2, ...)."""
+    return np.nanquantile(samples, [(1 - level) / 2, (1 + level) / 2], axis=0)
+
+
+def bootstrap_group_gaps(df: pd.DataFrame, metric_column: str, group_column: str,
+                         reference: Optional[str] = None,
+                         n_resamples: int = BOOTSTRAP_RESAMPLES,
+                         level: float = MONTE_CARLO_CI_LEVEL,
+                         seed: SeedLike = DEFAULT_RANDOM_SEED) -> Optional[Dict]:
+    """
+    Bootstrap confidence intervals and p-values for gaps in a metric between groups.
+
+    Rows are resampled within each group (one index matrix for all B
+    resamples) and the group means of every resample are reduced in a
+    single matrix product. Each group is compared with the reference group
+    as a difference and a ratio of means. The two-sided p-value tests a zero
+    difference by the shift method: under the null the resampled gaps are
+    centered on zero, so p is the share of |gap* - gap| at least as large as
+    the observed |gap|.
+
+    Args:
+        df: Per-row audit results (e.g. one row per tract)
+        metric_column: Error or outcome column to compare
+        group_column: Group column (e.g. 'income_quintile'); categorical
+            columns keep their category order
+        reference: Group every other group is compared with; defaults to
+            the last group (Q5 for income quintiles)
+        n_resamples: Number of bootstrap resamples
+        level: Confidence level of the intervals
+        seed: Seed or Generator for the resampling
+
+    Returns:
+        dict with per-group means and gaps versus the reference, or None if
+        fewer than two groups have data
+    """
+    data = df[[metric_column, group_column]].dropna()
+    codes, labels = pd.factorize(data[group_column], sort=True)
+    if len(labels) < 2:
+        return None
+
+    labels = [str(label) for label in labels]
+    reference = labels[-1] if reference is None else str(reference)
+    if reference not in labels:
+        raise ValueError(f"Reference group {reference!r} has no data in {group_column!r}")
+    ref = labels.index(reference)
+
+    values = data[metric_column].to_numpy(dtype=float)
+    observed = group_means(values[None, :], codes, len(labels))[0]
+    indices = stratified_bootstrap_indices(codes, n_resamples, seed)
+    means = group_means(values[indices], codes, len(labels))
+
+    diffs = means - means[:, [ref]]
+    observed_diffs = observed - observed[ref]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = means / means[:, [ref]]
+        observed_ratios = observed / observed[ref]
+    ratios[~np.isfinite(ratios)] = np.nan
+    p_values = ((np.abs(diffs - observed_diffs) >= np.abs(observed_diffs)).sum(axis=0) + 1) / (n_resamples + 1)
+
+    mean_bounds = _interval(means, level)
+    diff_bounds = _interval(diffs, level)
+    with np.errstate(all='ignore'):
+        ratio_bounds = _interval(ratios, level)
+    counts = np.bincount(codes, minlength=len(labels))
+
+    def _float(value):
+        return float(value) if np.isfinite(value) else None
+
+    return {
+        'metric': metric_column,
+        'reference_group': reference,
+        'resamples': int(n_resamples),
+        'ci_level': level,
+        'groups': {
+            label: {
+                'count': int(counts[i]),
+                'mean': float(observed[i]),
+                'ci_lower': float(mean_bounds[0, i]),
+                'ci_upper': float(mean_bounds[1, i]),
+            }
+            for i, label in enumerate(labels)
+        },
+        'gaps': {
+            label: {
+                'difference': float(observed_diffs[i]),
+                'difference_ci_lower': float(diff_bounds[0, i]),
+                'difference_ci_upper': float(diff_bounds[1, i]),
+                'ratio': _float(observed_ratios[i]),
+                'ratio_ci_lower': _float(ratio_bounds[0, i]),
+                'ratio_ci_upper': _float(ratio_bounds[1, i]),
+                'p_value': float(p_values[i]),
+            }
+            for i, label in enumerate(labels) if i != ref
+        },
+    }
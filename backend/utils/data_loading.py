@@ -1,22 +1,146 @@
-"""Shared data-loading helpers used by pipeline scripts."""
+"""Shared data-loading helpers used by pipeline scripts.
+
+Raw inputs are stored as Parquet/GeoParquet twins next to their GeoJSON, CSV
+and JSON exports. Each twin records the content hash of the export it was
+written from; loaders read the twin while the export still matches that hash
+and fall back to parsing the text file otherwise (file mtimes are unreliable
+after a checkout or copy). Either way columns come back with the same types.
+"""
 
 import json
+from pathlib import Path
 
+import geopandas as gpd
 import pandas as pd
+import pyarrow.parquet as pq
 
 from config import RAW_DATA_DIR
+from utils.pipeline import file_digest
+
+CENSUS_TRACTS_FILE = RAW_DATA_DIR / 'durham_census_tracts.geojson'
+CRASH_RECORDS_FILE = RAW_DATA_DIR / 'ncdot_nonmotorist_durham.csv'
+INFRASTRUCTURE_FILE = RAW_DATA_DIR / 'osm_infrastructure.json'
+
+# NCDOT attribute columns with few distinct values
+CRASH_CATEGORICAL_COLUMNS = [
+    'CrashSevr', 'CrashType', 'CrashTypGr', 'CrashAlcoh',
+    'NM_Type', 'NM_Sex', 'NM_Race', 'NM_Inj', 'NM_AlcDrg',
+    'DrvrSex', 'DrvrRace', 'DrvrVehTyp', 'RdClass', 'LightCond', 'Weather',
+    'County', 'City',
+]
+CRASH_INT32_COLUMNS = ['CrashYear', 'CrashMonth', 'CrashHour']
+CRASH_FLOAT32_COLUMNS = ['Latitude', 'Longitude']
+
+# Parquet schema metadata key for the SHA-256 of the export a twin was written from
+SOURCE_DIGEST_KEY = b'source_sha256'
+
+
+def parquet_path_for(data_file: Path) -> Path:
+    """Return the Parquet twin path for a raw export file."""
+    return Path(data_file).with_suffix('.parquet')
+
 
+def _source_for(data_file: Path) -> Path:
+    """Pick the Parquet twin over a text export when it was written from the export's current content."""
+    data_file = Path(data_file)
+    if data_file.suffix == '.parquet':
+        return data_file
 
-def load_infrastructure_data() -> pd.DataFrame:
-    """Load OSM infrastructure scores from the raw data directory."""
-    infra_path = RAW_DATA_DIR / 'osm_infrastructure.json'
-    if not infra_path.exists():
+    twin = parquet_path_for(data_file)
+    if not twin.exists():
+        return data_file
+    if not data_file.exists():
+        return twin
+
+    recorded = (pq.read_schema(twin).metadata or {}).get(SOURCE_DIGEST_KEY)
+    if recorded is not None and recorded.decode() == file_digest(data_file):
+        return twin
+    return data_file
+
+
+def _require(path: Path, label: str, fetch_script: str):
+    """Raise the usual missing-data error if neither the export nor its twin exists."""
+    if not path.exists():
         raise FileNotFoundError(
-            f"Infrastructure data not found at {infra_path}. "
-            "Run fetch_osm_infrastructure.py first."
+            f"{label} not found at {path}. "
+            f"Run {fetch_script} first."
         )
 
-    with open(infra_path) as f:
+
+def type_census_tracts(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Apply storage types to census tracts (tract_id kept as string: one row per tract)."""
+    gdf['tract_id'] = gdf['tract_id'].astype(str)
+    return gdf
+
+
+def type_crash_records(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply storage types to NCDOT crash records: categorical attributes, int32 dates, float32 coordinates."""
+    for col in CRASH_CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in CRASH_INT32_COLUMNS:
+        # Columns with missing values stay float so NaN survives
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]) and df[col].notna().all():
+            df[col] = df[col].astype('int32')
+    for col in CRASH_FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    return df
+
+
+def load_census_tracts(path: Path = CENSUS_TRACTS_FILE) -> gpd.GeoDataFrame:
+    """Load census tracts, preferring the GeoParquet twin over GeoJSON."""
+    source = _source_for(path)
+    _require(source, 'Census data', 'fetch_durham_data.py')
+
+    if source.suffix == '.parquet':
+        gdf = gpd.read_parquet(source)
+    else:
+        gdf = gpd.read_file(source)
+    return type_census_tracts(gdf)
+
+
+def load_crash_records(path: Path = CRASH_RECORDS_FILE) -> pd.DataFrame:
+    """Load NCDOT non-motorist crash records, preferring the Parquet twin over CSV."""
+    source = _source_for(path)
+    _require(source, 'Crash data', 'fetch_ncdot_nonmotorist.py')
+
+    if source.suffix == '.parquet':
+        return pd.read_parquet(source)
+    return type_crash_records(pd.read_csv(source))
+
+
+def load_infrastructure_data(path: Path = INFRASTRUCTURE_FILE) -> pd.DataFrame:
+    """Load OSM infrastructure scores, preferring the Parquet twin over JSON."""
+    source = _source_for(path)
+    _require(source, 'Infrastructure data', 'fetch_osm_infrastructure.py')
+
+    if source.suffix == '.parquet':
+        return pd.read_parquet(source)
+
+    with open(source) as f:
         data = json.load(f)
 
-    return pd.DataFrame(data['tracts'])
+    df = pd.DataFrame(data['tracts'])
+    df['tract_id'] = df['tract_id'].astype(str)
+    return df
+
+
+def write_parquet_twin(df: pd.DataFrame, data_file: Path) -> Path:
+    """
+    Write df as the Parquet (or GeoParquet) twin of a raw export file.
+
+    The export's content hash is stored in the twin's schema metadata, so
+    loaders can tell whether the export changed since.
+    """
+    path = parquet_path_for(data_file)
+    tmp_path = path.with_suffix('.parquet.part')
+    df.to_parquet(tmp_path, index=False)
+
+    digest = file_digest(data_file)
+    if digest is not None:
+        table = pq.read_table(tmp_path)
+        metadata = {**(table.schema.metadata or {}), SOURCE_DIGEST_KEY: digest.encode()}
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+    tmp_path.replace(path)
+    return path
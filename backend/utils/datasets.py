@@ -0,0 +1,134 @@
+"""Process-wide dataset registry — parse each raw input once, hand out read-only views.
+
+Census tracts, crash records and infrastructure scores are loaded through
+utils.data_loading the first time they are requested and memoized on the
+mtime and size of the export and its Parquet twin. When those change but
+the content hash does not (e.g. a fresh checkout), the cached frame is kept.
+
+Every call returns a frame whose numeric columns are shared read-only
+arrays: adding or replacing columns on it is free and local to the caller,
+while an in-place write (``.loc[...] = ...``) raises instead of corrupting
+the shared copy. Object and extension columns (tract ids, geometry,
+categoricals) can't be made read-only, so each call gets its own copy of
+those arrays; their values are immutable, so this copies pointers and codes,
+not strings or geometries. Geometry copies share the registry's spatial
+index, so point-in-tract lookups build it once per load.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from utils.data_loading import (
+    CENSUS_TRACTS_FILE,
+    CRASH_RECORDS_FILE,
+    INFRASTRUCTURE_FILE,
+    load_census_tracts,
+    load_crash_records,
+    load_infrastructure_data,
+    parquet_path_for,
+)
+from utils.pipeline import file_digest
+
+# path -> {'stamp', 'digest', 'frame'}
+_cache: Dict[Path, dict] = {}
+
+
+def _stamp(path: Path) -> tuple:
+    """mtime/size of an export and its Parquet twin (None where missing)."""
+    stamp = []
+    for p in (path, parquet_path_for(path)):
+        stat = p.stat() if p.exists() else None
+        stamp.append((stat.st_mtime_ns, stat.st_size) if stat else None)
+    return tuple(stamp)
+
+
+def _digest(path: Path) -> tuple:
+    """Content hashes of an export and its Parquet twin."""
+    return file_digest(path), file_digest(parquet_path_for(path))
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    """Whether a column is backed by a plain numeric NumPy array (the ones that can be frozen)."""
+    return isinstance(series.dtype, np.dtype) and series.dtype != object
+
+
+def _rebuild(df: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    """Frame like df (index, geometry, CRS) on the given column arrays, without copying them."""
+    if isinstance(df, gpd.GeoDataFrame):
+        return gpd.GeoDataFrame(columns, index=df.index, geometry=df.geometry.name, crs=df.crs, copy=False)
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild df on read-only copies of its numeric columns."""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if _is_numeric(series):
+            values = np.array(series.to_numpy(), copy=True)
+            values.flags.writeable = False
+        else:
+            # Object columns (pandas' comparison kernels reject read-only
+            # object buffers) and extension arrays are copied per caller instead
+            values = series.array
+        columns[col] = values
+    return _rebuild(df, columns)
+
+
+def _handout(df: pd.DataFrame) -> pd.DataFrame:
+    """A caller's view of a frozen frame: numeric columns shared, all others copied."""
+    view = _rebuild(df, {
+        col: df[col].to_numpy() if _is_numeric(df[col]) else df[col].array.copy()
+        for col in df.columns
+    })
+    if isinstance(view, gpd.GeoDataFrame):
+        # The STRtree is built once on the registry's geometry and reused by
+        # every view; GeometryArray drops it on an in-place geometry write
+        view.geometry.values._sindex = df.sindex
+    return view
+
+
+def _cached(path: Path, loader: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+    """Return a caller's view of the memoized frame for path, (re)loading if it changed."""
+    path = Path(path)
+    stamp = _stamp(path)
+    entry = _cache.get(path)
+
+    if entry is not None and entry['stamp'] != stamp:
+        digest = _digest(path)
+        if digest == entry['digest']:
+            entry['stamp'] = stamp
+        else:
+            entry = None
+
+    if entry is None:
+        entry = {'stamp': stamp, 'digest': _digest(path), 'frame': _freeze(loader(path))}
+        _cache[path] = entry
+
+    return _handout(entry['frame'])
+
+
+def census_tracts(path: Path = CENSUS_TRACTS_FILE) -> gpd.GeoDataFrame:
+    """Shared census tracts (see load_census_tracts)."""
+    return _cached(path, load_census_tracts)
+
+
+def crash_records(path: Path = CRASH_RECORDS_FILE) -> pd.DataFrame:
+    """Shared NCDOT crash records (see load_crash_records)."""
+    return _cached(path, load_crash_records)
+
+
+def infrastructure_scores(path: Path = INFRASTRUCTURE_FILE) -> pd.DataFrame:
+    """Shared OSM infrastructure scores (see load_infrastructure_data)."""
+    return _cached(path, load_infrastructure_data)
+
+
+def clear():
+    """Drop all memoized datasets."""
+    _cache.clear()
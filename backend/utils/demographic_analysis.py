@@ -7,44 +7,82 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 
+from config import QUINTILE_LABELS
+from utils.bootstrap import bootstrap_group_gaps
+
+QUINTILE_PROBABILITIES = [0.2, 0.4, 0.6, 0.8]
+MINORITY_CUT_POINTS = [30, 60]
+MINORITY_CATEGORIES = ['Low (<30%)', 'Medium (30-60%)', 'High (>60%)']
+
+def quintile_cut_points(values):
+    """
+    Compute the 20/40/60/80th percentile cut points, ignoring NaN.
+
+    Compute these once per reference population and reuse them with
+    bin_values()/assign_income_quintiles() instead of re-deriving per row.
+    """
+    return np.nanquantile(np.asarray(values, dtype=float), QUINTILE_PROBABILITIES)
+
+def bin_values(values, cut_points, right=True):
+    """
+    Vectorized bin assignment over sorted cut points.
+
+    Args:
+        values: Array-like of numbers
+        cut_points: Sorted bin edges (exclusive of the outer bounds)
+        right: If True, bins are closed on the right (a, b]; otherwise [a, b)
+
+    Returns:
+        int array of 0-based bin codes, -1 where the value is NaN
+    """
+    values = np.asarray(values, dtype=float)
+    side = 'left' if right else 'right'
+    codes = np.searchsorted(cut_points, values, side=side)
+    codes[np.isnan(values)] = -1
+    return codes
+
+def assign_income_quintiles(values, cut_points=None):
+    """
+    Assign income quintiles (1=lowest, 5=highest) to an array of incomes.
+
+    Returns a float array with NaN where income is missing.
+    """
+    if cut_points is None:
+        cut_points = quintile_cut_points(values)
+    codes = bin_values(values, cut_points)
+    return np.where(codes < 0, np.nan, codes + 1)
+
+def income_quintile_labels(values, cut_points=None):
+    """
+    Label incomes with ordered QUINTILE_LABELS categories.
+
+    Drop-in replacement for pd.qcut(values, q=5, labels=QUINTILE_LABELS).
+    """
+    if cut_points is None:
+        cut_points = quintile_cut_points(values)
+    codes = bin_values(values, cut_points)
+    return pd.Categorical.from_codes(codes, categories=QUINTILE_LABELS, ordered=True)
+
 def calculate_income_quintiles(df, income_column='median_income'):
     """
     Assign income quintiles (1=lowest, 5=highest)
     """
-    quintiles = df[income_column].quantile([0.2, 0.4, 0.6, 0.8])
-
-    def get_quintile(income):
-        if pd.isna(income):
-            return None
-        if income <= quintiles[0.2]:
-            return 1
-        elif income <= quintiles[0.4]:
-            return 2
-        elif income <= quintiles[0.6]:
-            return 3
-        elif income <= quintiles[0.8]:
-            return 4
-        else:
-            return 5
-
-    df['income_quintile'] = df[income_column].apply(get_quintile)
+    quintiles = assign_income_quintiles(df[income_column])
+
+    if np.isnan(quintiles).any():
+        df['income_quintile'] = quintiles
+    else:
+        df['income_quintile'] = quintiles.astype(int)
     return df
 
 def calculate_minority_category(df, minority_column='pct_minority'):
     """
     Categorize areas by minority percentage
     """
-    def get_category(pct):
-        if pd.isna(pct):
-            return None
-        if pct < 30:
-            return 'Low (<30%)'
-        elif pct < 60:
-            return 'Medium (30-60%)'
-        else:
-            return 'High (>60%)'
-
-    df['minority_category'] = df[minority_column].apply(get_category)
+    codes = bin_values(df[minority_column], MINORITY_CUT_POINTS, right=False)
+    df['minority_category'] = pd.Categorical.from_codes(
+        codes, categories=MINORITY_CATEGORIES, ordered=True
+    )
     return df
 
 def calculate_error_metrics(true_values, predicted_values):
@@ -80,9 +118,10 @@ def equity_gap_analysis(df, metric_column, group_column):
     Calculate equity gaps between demographic groups
 
     Returns:
-        dict with gap analysis between highest and lowest performing groups
+        dict with gap analysis between highest and lowest performing groups,
+        with a t-test and a bootstrap interval and p-value for the gap
     """
-    grouped = df.groupby(group_column)[metric_column].agg(['mean', 'std', 'count'])
+    grouped = df.groupby(group_column, observed=True)[metric_column].agg(['mean', 'std', 'count'])
 
     if len(grouped) < 2:
         return None
@@ -99,6 +138,13 @@ def equity_gap_analysis(df, metric_column, group_column):
 
     t_stat, p_value = stats.ttest_ind(best_data, worst_data)
 
+    # Bootstrap interval for the same gap (no normality assumption)
+    # (None when fewer than two groups have data, and best == worst when
+    # every group mean ties: no gap to test either way)
+    bootstrap = bootstrap_group_gaps(df, metric_column, group_column, reference=worst_group)
+    no_gap = {'difference_ci_lower': 0.0, 'difference_ci_upper': 0.0, 'p_value': 1.0}
+    gap_bootstrap = bootstrap['gaps'].get(str(best_group), no_gap) if bootstrap else no_gap
+
     return {
         'best_group': str(best_group),
         'worst_group': str(worst_group),
@@ -108,6 +154,9 @@ def equity_gap_analysis(df, metric_column, group_column):
         'gap_pct': float(gap_pct),
         'statistically_significant': bool(p_value < 0.05),
         'p_value': float(p_value),
+        'gap_ci_lower': gap_bootstrap['difference_ci_lower'],
+        'gap_ci_upper': gap_bootstrap['difference_ci_upper'],
+        'bootstrap_p_value': gap_bootstrap['p_value'],
     }
 
 def disparate_impact_ratio(favorable_outcome_rate_protected, favorable_outcome_rate_reference):
@@ -174,7 +223,7 @@ def demographic_stratified_analysis(df, metric_column, income_column='median_inc
             }
 
     # By minority category
-    for category in ['Low (<30%)', 'Medium (30-60%)', 'High (>60%)']:
+    for category in MINORITY_CATEGORIES:
         subset = df[df['minority_category'] == category]
         if len(subset) > 0:
             results['by_minority_category'][category] = {
@@ -6,12 +6,73 @@ import json
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
+import shapely
+
+from config import GEOJSON_COORDINATE_PRECISION
 
 def geojson_to_dict(gdf):
     """Convert GeoDataFrame to GeoJSON dict"""
     return json.loads(gdf.to_json())
 
+def _json_default(value):
+    """json.dumps fallback for numpy scalars and timestamps left in object columns."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _json_column(series):
+    """Convert a column to a list of JSON-safe Python values, None for missing."""
+    if pd.api.types.is_float_dtype(series):
+        return _float_column(series)
+    if (pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series)) \
+            and not series.hasnans:
+        return series.tolist()
+    values = series.astype(object).to_numpy(dtype=object)
+    values[series.isna().to_numpy()] = None
+    return values.tolist()
+
+def write_geojson(gdf, fp, precision=GEOJSON_COORDINATE_PRECISION, chunk_size=1000):
+    """
+    Stream a GeoDataFrame to an open file as a compact GeoJSON FeatureCollection.
+
+    Serializes ``chunk_size`` features at a time (geometry rounding, GeoJSON
+    text and property conversion) and writes each chunk before starting the
+    next, so memory beyond the GeoDataFrame itself stays bounded by one
+    chunk instead of the whole document (gdf.to_json -> json.loads ->
+    json.dump). Coordinates are rounded to ``precision`` decimal places.
+
+    Args:
+        gdf: GeoDataFrame to write
+        fp: Writable text file handle
+        precision: Decimal places to keep in coordinates (None keeps all)
+        chunk_size: Features serialized per write
+    """
+    geometry_name = gdf.geometry.name
+    keys = [key for key in gdf.columns if key != geometry_name]
+
+    fp.write('{"type":"FeatureCollection","features":[')
+    for start in range(0, len(gdf), chunk_size):
+        chunk = gdf.iloc[start:start + chunk_size]
+        columns = [_json_column(chunk[key]) for key in keys]
+        rows = zip(*columns) if columns else [()] * len(chunk)
+
+        geometries = np.asarray(chunk.geometry.values, dtype=object)
+        if precision is not None:
+            geometries = shapely.transform(geometries, lambda coords: np.round(coords, precision))
+        geometry_json = shapely.to_geojson(geometries)
+
+        for i, (feature_id, row, geometry) in enumerate(zip(chunk.index, rows, geometry_json), start):
+            if i:
+                fp.write(',')
+            properties = json.dumps(dict(zip(keys, row)), separators=(',', ':'), default=_json_default)
+            fp.write(
+                f'{{"id":{json.dumps(str(feature_id))},"type":"Feature",'
+                f'"properties":{properties},"geometry":{geometry or "null"}}}'
+            )
+    fp.write(']}')
+
 def simplify_geometry(gdf, tolerance=0.001):
     """Simplify geometries for faster frontend rendering"""
     gdf['geometry'] = gdf['geometry'].simplify(tolerance)
@@ -22,39 +83,88 @@ def calculate_centroid(geometry):
     centroid = geometry.centroid
     return {'lat': centroid.y, 'lon': centroid.x}
 
+def locate_points(lons, lats, tracts_gdf):
+    """
+    Batch point-in-polygon lookup against the tracts' spatial index.
+
+    Uses the GeoDataFrame's cached STRtree (``tracts_gdf.sindex``), so the
+    index is built once per tract GeoDataFrame and reused across calls;
+    census tracts from utils.datasets share one index per load.
+    Points are assumed to be in the same CRS as the tracts.
+
+    Returns:
+        int array of tract row positions, -1 for points outside every tract
+    """
+    points = shapely.points(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    point_idx, tract_idx = tracts_gdf.sindex.query(points, predicate='within')
+
+    # Keep the first tract (in row order) for each point, like a linear scan would
+    order = np.lexsort((tract_idx, point_idx))
+    point_idx, tract_idx = point_idx[order], tract_idx[order]
+    first = np.unique(point_idx, return_index=True)[1]
+
+    positions = np.full(len(points), -1, dtype=np.intp)
+    positions[point_idx[first]] = tract_idx[first]
+    return positions
+
+def points_to_tracts(lons, lats, tracts_gdf, id_column='tract_id'):
+    """
+    Geocode arrays of lon/lat to tract identifiers.
+
+    Returns:
+        object array of tract ids, None for points outside every tract
+    """
+    positions = locate_points(lons, lats, tracts_gdf)
+    tract_ids = tracts_gdf[id_column].to_numpy(dtype=object)
+
+    result = np.full(len(positions), None, dtype=object)
+    inside = positions >= 0
+    result[inside] = tract_ids[positions[inside]]
+    return result
+
 def point_in_tract(point_lon, point_lat, tracts_gdf):
     """Find which census tract a point falls in"""
-    point = Point(point_lon, point_lat)
+    position = locate_points([point_lon], [point_lat], tracts_gdf)[0]
+    if position < 0:
+        return None
+    return tracts_gdf.iloc[position]
 
-    for _, tract in tracts_gdf.iterrows():
-        if tract.geometry.contains(point):
-            return tract
+def _float_column(series):
+    """Convert a numeric column to a list of Python floats, None for NaN."""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(values), None, values.astype(object)).tolist()
 
-    return None
+def _string_column(series):
+    """Convert a column to a list of Python strings, None for missing values."""
+    missing = series.isna().to_numpy()
+    values = series.astype(str).to_numpy(dtype=object)
+    values[missing] = None
+    return values.tolist()
 
 def create_choropleth_data(gdf, value_column, id_column='tract_id'):
     """
     Create data structure for choropleth maps
 
+    Columns are converted to JSON-safe lists once (numeric -> float,
+    everything else -> str, missing -> None) and zipped into features.
+
     Returns:
         List of {id, value, properties} for each feature
     """
-    data = []
-
-    for _, row in gdf.iterrows():
-        feature = {
-            'id': row[id_column],
-            'value': float(row[value_column]) if pd.notna(row[value_column]) else None,
-            'properties': {
-                key: (float(val) if isinstance(val, (int, float)) and pd.notna(val)
-                      else str(val) if pd.notna(val) else None)
-                for key, val in row.items()
-                if key not in ['geometry', id_column]
-            }
-        }
-        data.append(feature)
-
-    return data
+    keys = [key for key in gdf.columns if key not in ['geometry', id_column]]
+    columns = [
+        _float_column(gdf[key]) if pd.api.types.is_numeric_dtype(gdf[key])
+        else _string_column(gdf[key])
+        for key in keys
+    ]
+    rows = zip(*columns) if columns else [()] * len(gdf)
+
+    return [
+        {'id': feature_id, 'value': value, 'properties': dict(zip(keys, row))}
+        for feature_id, value, row in zip(
+            gdf[id_column].tolist(), _float_column(gdf[value_column]), rows
+        )
+    ]
 
 def calculate_area_demographics(gdf, weight_column='total_population'):
     """
@@ -0,0 +1,61 @@
+"""Monte Carlo helpers — reduce and summarize metrics computed along a leading replicate axis."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+from config import MONTE_CARLO_CI_LEVEL
+
+
+def summarize_replicates(samples, level: float = MONTE_CARLO_CI_LEVEL) -> Dict:
+    """
+    Mean and central confidence interval of one metric's replicates.
+
+    Non-finite replicates (e.g. a disparate impact ratio whose reference
+    group received nothing) are left out; 'replicates' counts the rest.
+    """
+    samples = np.asarray(samples, dtype=float).ravel()
+    finite = samples[np.isfinite(samples)]
+    if finite.size == 0:
+        return {'mean': None, 'ci_lower': None, 'ci_upper': None, 'replicates': 0}
+
+    lower, upper = np.quantile(finite, [(1 - level) / 2, (1 + level) / 2])
+    return {
+        'mean': float(finite.mean()),
+        'ci_lower': float(lower),
+        'ci_upper': float(upper),
+        'replicates': int(finite.size),
+    }
+
+
+def summarize_metrics(metrics: Dict[str, np.ndarray], level: float = MONTE_CARLO_CI_LEVEL) -> Dict[str, Dict]:
+    """summarize_replicates() for every metric in a {name: replicates} dict."""
+    return {name: summarize_replicates(samples, level) for name, samples in metrics.items()}
+
+
+def group_sums(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per-group sums of (replicates, n) values for group codes 0..n_groups-1.
+
+    Negative codes (e.g. NaN categories) belong to no group.
+    """
+    onehot = (np.asarray(codes)[:, None] == np.arange(n_groups)[None, :]).astype(float)
+    return np.asarray(values, dtype=float) @ onehot
+
+
+def group_means(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group means of (replicates, n) values; NaN for empty groups."""
+    counts = group_sums(np.ones(len(codes)), codes, n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return group_sums(values, codes, n_groups) / counts
+
+
+def rowwise_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation along the last axis, broadcasting over replicates."""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    x = x - x.mean(axis=-1, keepdims=True)
+    y = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x * y).sum(axis=-1) / np.sqrt((x ** 2).sum(axis=-1) * (y ** 2).sum(axis=-1))
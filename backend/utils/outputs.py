@@ -0,0 +1,34 @@
+"""Audit output helpers — persist in-memory audit outputs as SIMULATED_DATA_DIR files."""
+
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+
+from utils.geospatial import write_geojson
+
+
+def write_output(payload, path: Path):
+    """
+    Write one audit output in the format its consumers read back.
+
+    GeoDataFrames become compact GeoJSON, DataFrames become a records array
+    and everything else is dumped as indented JSON.
+    """
+    if isinstance(payload, gpd.GeoDataFrame):
+        with open(path, 'w') as f:
+            write_geojson(payload, f)
+    elif isinstance(payload, pd.DataFrame):
+        payload.to_json(path, orient='records', indent=2)
+    else:
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2)
+
+
+def write_outputs(outputs: dict, output_dir: Path):
+    """Write every output in a {file name: payload} dict to output_dir."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, payload in outputs.items():
+        write_output(payload, output_dir / name)
+        print(f"   ✓ Exported {name}")
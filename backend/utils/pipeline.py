@@ -0,0 +1,63 @@
+"""Incremental pipeline utilities — content-hash stage inputs, track which stages are stale."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, Optional
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Return the SHA-256 hex digest of a file's contents, or None if it doesn't exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_fingerprint(inputs: Iterable[Path], config: Optional[dict] = None,
+                      root: Optional[Path] = None) -> str:
+    """
+    Fingerprint a stage from the content of its input files and its config values.
+
+    Missing inputs hash as None, so a file appearing or disappearing changes
+    the fingerprint. Config values are hashed via their sorted JSON form.
+    Paths under root are hashed relative to it, so the same checkout in
+    another directory gets the same fingerprint.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in inputs):
+        name = path.relative_to(root).as_posix() if root and path.is_relative_to(root) else path.as_posix()
+        digest.update(f"{name}:{file_digest(path)}\n".encode())
+    digest.update(json.dumps(config or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def load_state(state_file: Path) -> dict:
+    """Read recorded stage fingerprints, or an empty state if none were saved."""
+    state_file = Path(state_file)
+    if not state_file.exists():
+        return {}
+    with open(state_file) as f:
+        return json.load(f)
+
+
+def save_state(state_file: Path, state: dict):
+    """Persist stage fingerprints."""
+    with open(state_file, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def is_stale(name: str, fingerprint: str, outputs: Iterable[Path], state: dict) -> bool:
+    """A stage is stale if its fingerprint changed or any declared output is missing."""
+    if state.get(name) != fingerprint:
+        return True
+    return not all(Path(p).exists() for p in outputs)
@@ -0,0 +1,54 @@
+"""Random number helpers — explicit, seedable Generators instead of the global NumPy RNG."""
+
+from __future__ import annotations
+
+from typing import List, Union
+
+import numpy as np
+
+# Anything make_rng() accepts: an int seed (or None for fresh entropy), a
+# SeedSequence, or an existing Generator to draw from directly
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Generator for a seed; an existing Generator is returned as-is.
+
+    Passing the same int seed always yields the same stream, regardless of
+    what else has drawn random numbers in the process.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: Union[None, int, np.random.SeedSequence], n: int) -> List[np.random.SeedSequence]:
+    """
+    n statistically independent child SeedSequences of one seed.
+
+    Child i is the sequence SeedSequence.spawn would return first, but
+    spawning doesn't advance the parent: the same seed always yields the
+    same children. A child can therefore be handed to a model that derives
+    its own streams from it on every call.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [
+        np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (i,), pool_size=seed.pool_size)
+        for i in range(n)
+    ]
+
+
+def spawn_rngs(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    """
+    n statistically independent child Generators of one seed.
+
+    Children of an int seed or SeedSequence come from spawn_seeds; an
+    existing Generator spawns from its own state. Each simulation step (or
+    parallel worker) gets its own stream and results don't depend on the
+    order the steps run in.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.spawn(n)
+    return [np.random.default_rng(child) for child in spawn_seeds(seed, n)]
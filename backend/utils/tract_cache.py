@@ -0,0 +1,96 @@
+"""Tract assignment cache — persist point-to-tract lookups keyed by record id and tract geometry."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from utils.geospatial import points_to_tracts
+
+
+def tract_geometry_digest(tracts_gdf: gpd.GeoDataFrame, id_column: str = 'tract_id') -> str:
+    """SHA-256 of the tracts' CRS, ids and geometries (WKB), in row order."""
+    digest = hashlib.sha256()
+    digest.update(str(tracts_gdf.crs).encode())
+    digest.update(json.dumps(tracts_gdf[id_column].astype(str).tolist()).encode())
+    for wkb in shapely.to_wkb(np.asarray(tracts_gdf.geometry.values, dtype=object)):
+        digest.update(wkb or b'')
+    return digest.hexdigest()
+
+
+def cache_path_for(cache_dir: Path, name: str, digest: str) -> Path:
+    """Cache file for one record set against one version of the tract geometry."""
+    return Path(cache_dir) / f'{name}_tracts_{digest[:16]}.parquet'
+
+
+def cached_points_to_tracts(record_ids, lons, lats, tracts_gdf: gpd.GeoDataFrame, cache_dir: Path,
+                            name: str, id_column: str = 'tract_id') -> Tuple[np.ndarray, int]:
+    """
+    points_to_tracts() with assignments persisted per record id.
+
+    Assignments are cached in a Parquet file named after a hash of the tract
+    geometry, so redrawn tract boundaries start a fresh cache (and the old
+    file is removed). A record is looked up again only if it is new or its
+    coordinates changed since it was cached (e.g. a revised crash report);
+    points outside every tract are cached too.
+
+    Args:
+        record_ids: Unique id per point (e.g. CrashID)
+        lons, lats: Point coordinates, in the tracts' CRS
+        tracts_gdf: Tract polygons; its spatial index is reused across calls
+        cache_dir: Directory holding the cache files
+        name: Record set name used in the cache file name (e.g. 'crash')
+        id_column: Tract identifier column
+
+    Returns:
+        Tuple of an object array of tract ids (None for points outside every
+        tract) and the number of points that had to be located
+    """
+    points = pd.DataFrame({
+        'record_id': np.asarray(record_ids),
+        'longitude': np.asarray(lons, dtype=float),
+        'latitude': np.asarray(lats, dtype=float),
+    })
+    path = cache_path_for(cache_dir, name, tract_geometry_digest(tracts_gdf, id_column))
+    cached = pd.read_parquet(path) if path.exists() else pd.DataFrame(
+        {'record_id': points['record_id'].iloc[:0], 'longitude': [], 'latitude': [], 'tract_id': []}
+    )
+
+    merged = points.merge(cached, on='record_id', how='left', suffixes=('', '_cached'))
+    hit = (
+        (merged['longitude'] == merged['longitude_cached'])
+        & (merged['latitude'] == merged['latitude_cached'])
+    ).to_numpy()
+
+    tract_ids = merged['tract_id'].to_numpy(dtype=object)
+    tract_ids[pd.isna(tract_ids)] = None
+    miss = ~hit
+    if miss.any():
+        tract_ids[miss] = points_to_tracts(
+            points['longitude'].to_numpy()[miss], points['latitude'].to_numpy()[miss], tracts_gdf, id_column
+        )
+
+        located = points[miss].assign(tract_id=tract_ids[miss])
+        updated = pd.concat([cached[~cached['record_id'].isin(located['record_id'])], located], ignore_index=True)
+        _write_cache(updated, path, name)
+
+    return tract_ids, int(miss.sum())
+
+
+def _write_cache(df: pd.DataFrame, path: Path, name: str):
+    """Atomically replace the cache file and drop caches for other tract geometries."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.parquet.part')
+    df.to_parquet(tmp_path, index=False)
+    tmp_path.replace(path)
+
+    for stale in path.parent.glob(f'{name}_tracts_*.parquet'):
+        if stale != path:
+            stale.unlink()
@@ -43,6 +43,8 @@ class APIClient {
     getDangerScores() { return this.get('danger-scores'); }
     /** @returns {Promise<BudgetAllocation>} */
     getBudgetAllocation() { return this.get('budget-allocation'); }
+    /** @returns {Promise<BudgetSweep>} */
+    getBudgetSweep() { return this.get('budget-sweep'); }
     /** @returns {Promise<Recommendations>} */
     getRecommendations() { return this.get('recommendations'); }
 
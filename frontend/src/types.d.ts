@@ -249,6 +249,18 @@ interface BudgetAllocation {
     };
 }
 
+interface BudgetSweepRow {
+    allocation: 'ai' | 'need_based';
+    bias_strength: number | null;
+    budget: number;
+    projects: number;
+    budget_allocated: number;
+    disparate_impact_ratio: number | null;
+    gini_coefficient: number;
+}
+
+type BudgetSweep = BudgetSweepRow[];
+
 interface RecommendationProperties {
     tract_id: string;
     project_type: string;
@@ -6,20 +6,21 @@ This script:
 2. Calculates potential vs actual demand
 3. Analyzes infrastructure-driven demand suppression
 4. Tests AI capability to detect suppressed demand
-5. Exports analysis results for frontend visualization
+5. Replicates the simulated noise for confidence intervals
+6. Exports analysis results for frontend visualization
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
 
-import geopandas as gpd
-from config import HIGH_SUPPRESSION_THRESHOLD, RAW_DATA_DIR, SIMULATED_DATA_DIR
+from config import DEFAULT_RANDOM_SEED, HIGH_SUPPRESSION_THRESHOLD, RAW_DATA_DIR, SIMULATED_DATA_DIR
 from models.demand_analyzer import SuppressedDemandAnalyzer
-from utils.data_loading import load_infrastructure_data
+from utils.datasets import census_tracts, infrastructure_scores
+from utils.outputs import write_outputs
+from utils.rng import spawn_rngs
 
 
 def load_census_data():
@@ -31,7 +32,7 @@ def load_census_data():
             "Run fetch_durham_data.py first."
         )
 
-    gdf = gpd.read_file(census_path)
+    gdf = census_tracts(census_path)
     print(f"Loaded {len(gdf)} census tracts")
 
     required = ['tract_id', 'median_income', 'total_population', 'geometry']
@@ -42,24 +43,22 @@ def load_census_data():
     return gdf
 
 
-def main():
-    print("=" * 80)
-    print("Test 4: Suppressed Demand Analysis")
-    print("=" * 80)
-
+def run_audit(seed=DEFAULT_RANDOM_SEED) -> dict:
+    """Run the suppressed demand analysis, returning outputs keyed by SIMULATED_DATA_DIR file name."""
     # Load census data
     print("\n1. Loading census data...")
     census_gdf = load_census_data()
 
     # Load infrastructure data
     print("\n1b. Loading OSM infrastructure data...")
-    infrastructure_df = load_infrastructure_data()
+    infrastructure_df = infrastructure_scores()
     print(f"Loaded infrastructure scores for {len(infrastructure_df)} tracts")
 
     # Run suppressed demand analysis
     print("\n2. Running suppressed demand analysis...")
+    analysis_rng, uncertainty_rng = spawn_rngs(seed, 2)
     analyzer = SuppressedDemandAnalyzer(census_gdf, infrastructure_df)
-    results = analyzer.run_analysis()
+    results = analyzer.run_analysis(seed=analysis_rng)
 
     # Print summary
     print("\n3. Summary Statistics:")
@@ -96,12 +95,15 @@ def main():
           f"{expert['rmse']:>10.1f} {expert['bias_q1']:>9.1f}% "
           f"{expert['detection_rate_high_suppression']:>14.1f}%")
 
-    # Create output directory
-    output_dir = SIMULATED_DATA_DIR
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Confidence intervals, from a child stream independent of the analysis
+    print("\n5b. Replicating demand and detection noise for confidence intervals...")
+    uncertainty = analyzer.monte_carlo(seed=uncertainty_rng)
+    rate = uncertainty['summary']['suppression_rate']
+    print(f"   Suppression rate: {rate['mean']:.1f}% "
+          f"({uncertainty['ci_level']:.0%} CI {rate['ci_lower']:.1f}% to {rate['ci_upper']:.1f}%)")
 
-    # Export demand report
-    print("\n6. Exporting demand analysis report...")
+    # Demand report
+    print("\n6. Building demand analysis report...")
     demand_report = {
         '_provenance': {
             'data_type': 'mixed',
@@ -112,6 +114,7 @@ def main():
         'summary': results['summary'],
         'high_suppression_threshold': HIGH_SUPPRESSION_THRESHOLD,
         'by_quintile': results['by_quintile'],
+        'uncertainty': uncertainty,
         'findings': [
             f"{results['summary']['suppression_rate']:.1f}% of potential active transportation demand is suppressed by poor infrastructure",
             f"Q1 (poorest) areas have {results['by_quintile']['Q1 (Poorest)']['suppression_pct']:.1f}% suppression vs {results['by_quintile']['Q5 (Richest)']['suppression_pct']:.1f}% in Q5",
@@ -121,37 +124,8 @@ def main():
         ]
     }
 
-    with open(output_dir / 'demand_analysis.json', 'w') as f:
-        json.dump(demand_report, f, indent=2)
-
-    print(f"   ✓ Exported demand_analysis.json")
-
-    # Export funnel data
-    print("\n7. Exporting demand suppression funnel...")
-    with open(output_dir / 'demand_funnel.json', 'w') as f:
-        json.dump(results['funnel_data'], f, indent=2)
-    print(f"   ✓ Exported demand_funnel.json")
-
-    # Export correlation matrix
-    print("\n8. Exporting correlation matrix...")
-    with open(output_dir / 'correlation_matrix.json', 'w') as f:
-        json.dump(results['correlation_matrix'], f, indent=2)
-    print(f"   ✓ Exported correlation_matrix.json")
-
-    # Export detection scorecard
-    print("\n9. Exporting AI detection scorecard...")
-    with open(output_dir / 'detection_scorecard.json', 'w') as f:
-        json.dump(results['detection_scorecard'], f, indent=2)
-    print(f"   ✓ Exported detection_scorecard.json")
-
-    # Export network flow (simplified)
-    print("\n10. Exporting network flow data...")
-    with open(output_dir / 'network_flow.json', 'w') as f:
-        json.dump(results['network_flow'], f, indent=2)
-    print(f"   ✓ Exported network_flow.json")
-
-    # Export geospatial demand data
-    print("\n11. Exporting geospatial demand data...")
+    # Geospatial demand data
+    print("\n7. Building geospatial demand data...")
     demand_data = results['demand_data']
 
     # Merge with geometry
@@ -166,13 +140,27 @@ def main():
     # Simplify geometry for web
     demand_geo['geometry'] = demand_geo['geometry'].simplify(0.001)
 
-    # Export as GeoJSON
-    demand_geo_dict = json.loads(demand_geo.to_json())
+    print(f"   {len(demand_geo)} tracts")
+
+    return {
+        'demand_analysis.json': demand_report,
+        'demand_funnel.json': results['funnel_data'],
+        'correlation_matrix.json': results['correlation_matrix'],
+        'detection_scorecard.json': results['detection_scorecard'],
+        'network_flow.json': results['network_flow'],
+        'demand_geo_data.json': demand_geo,
+    }
+
+
+def main():
+    print("=" * 80)
+    print("Test 4: Suppressed Demand Analysis")
+    print("=" * 80)
 
-    with open(output_dir / 'demand_geo_data.json', 'w') as f:
-        json.dump(demand_geo_dict, f)
+    outputs = run_audit()
 
-    print(f"   ✓ Exported demand_geo_data.json ({len(demand_geo)} tracts)")
+    print("\n8. Exporting results...")
+    write_outputs(outputs, SIMULATED_DATA_DIR)
 
     print("\n" + "=" * 80)
     print("Suppressed demand analysis complete!")
@@ -12,6 +12,7 @@ import requests
 import geopandas as gpd
 import pandas as pd
 from config import RAW_DATA_DIR, CENSUS_API_KEY, CENSUS_VINTAGE, TIGER_VINTAGE, TIGER_TRACTS_LAYER, DATA_FRESHNESS
+from utils.data_loading import type_census_tracts, write_parquet_twin
 from utils.freshness import is_fresh, write_meta
 
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -124,8 +125,10 @@ def fetch_durham_census_tracts():
         print(f"  Dropping {zero_pop.sum()} tracts with 0 population")
         gdf = gdf[~zero_pop].reset_index(drop=True)
 
-    # Save to file
+    # Save GeoJSON export plus the GeoParquet twin scripts load from
+    gdf = type_census_tracts(gdf)
     gdf.to_file(OUTPUT_FILE, driver='GeoJSON')
+    write_parquet_twin(gdf, OUTPUT_FILE)
     print(f"Saved census data to {OUTPUT_FILE}")
 
     write_meta(OUTPUT_FILE, source_url=base_url, record_count=len(gdf),
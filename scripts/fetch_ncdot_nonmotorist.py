@@ -4,19 +4,27 @@ Fetch geocoded non-motorist crash data for Durham County from NCDOT's
 public ArcGIS Feature Service.
 
 Covers pedestrian, bicycle, and other non-motorist crashes from 2007-present.
-Paginates through the API (max 2000 records per request) and saves as CSV.
+Counts matching records, fetches pages (max 2000 records per request)
+concurrently, and streams them to CSV, then writes the typed Parquet twin.
+
+Once a dataset exists, later runs fetch only records above the stored
+CrashID high-water mark (plus recent years, which NCDOT still revises) and
+merge them in. Use --full to re-download the entire history.
 """
 
 import sys
+from collections import Counter
+from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
 
 import pandas as pd
-import requests
 
-from config import NCDOT_NONMOTORIST_SERVICE, RAW_DATA_DIR, DATA_FRESHNESS
-from utils.freshness import is_fresh, write_meta
+from config import NCDOT_NONMOTORIST_SERVICE, NCDOT_REVISION_LOOKBACK_YEARS, RAW_DATA_DIR, DATA_FRESHNESS
+from utils.arcgis import iter_feature_pages
+from utils.data_loading import type_crash_records, write_parquet_twin
+from utils.freshness import is_fresh, read_meta, write_meta
 
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -34,54 +42,126 @@ OUT_FIELDS = [
     'County', 'City',
 ]
 
-MAX_RECORDS = 2000  # ArcGIS service limit per query
+DURHAM_WHERE = "County='DURHAM'"
 
 
-def fetch_durham_nonmotorist_crashes():
+def fetch_durham_nonmotorist_crashes(output_path: Path = OUTPUT_PATH, where: str = DURHAM_WHERE) -> dict:
     """
-    Query the NCDOT Non-Motorist Crash Feature Service for Durham County.
+    Query the NCDOT Non-Motorist Crash Feature Service and stream records to CSV.
+
+    Pages are fetched concurrently (see utils.arcgis) and appended to a
+    temporary file as they arrive, in CrashID order; the file replaces
+    output_path only once every page has landed. Nothing is written if no
+    records match.
 
-    Paginates with resultOffset since the service returns max 2000 per request.
+    Returns:
+        Summary dict with record_count, dropped, max_crash_id, year_range, nm_types, severity
     """
-    base_params = {
-        'where': "County='DURHAM'",
-        'outFields': ','.join(OUT_FIELDS),
-        'returnGeometry': 'false',
-        'orderByFields': 'CrashID',
-        'f': 'json',
+    tmp_path = output_path.with_suffix(output_path.suffix + '.part')
+    record_count, dropped = 0, 0
+    max_crash_id = None
+    year_min, year_max = None, None
+    nm_types, severity = Counter(), Counter()
+
+    pages = iter_feature_pages(NCDOT_NONMOTORIST_SERVICE, where, OUT_FIELDS, order_by='CrashID')
+    try:
+        with open(tmp_path, 'w', newline='') as f:
+            for page in pages:
+                df = pd.DataFrame(page, columns=OUT_FIELDS)
+                if len(df):
+                    max_crash_id = int(df['CrashID'].max())
+
+                # Convert CrashDate from epoch ms to date string
+                df['CrashDate'] = pd.to_datetime(df['CrashDate'], unit='ms').dt.strftime('%Y-%m-%d')
+
+                # Drop records missing coordinates
+                before = len(df)
+                df = df.dropna(subset=['Latitude', 'Longitude'])
+                dropped += before - len(df)
+                if df.empty:
+                    continue
+
+                df.to_csv(f, index=False, header=record_count == 0)
+                record_count += len(df)
+                print(f"  Fetched {record_count:,} records...")
+
+                years = df['CrashYear'].dropna()
+                if len(years):
+                    year_min = int(years.min()) if year_min is None else min(year_min, int(years.min()))
+                    year_max = int(years.max()) if year_max is None else max(year_max, int(years.max()))
+                nm_types.update(df['NM_Type'].value_counts().to_dict())
+                severity.update(df['CrashSevr'].value_counts().to_dict())
+    except BaseException:
+        # A failed page or parse leaves no partial export behind
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if record_count:
+        tmp_path.replace(output_path)
+    else:
+        tmp_path.unlink()
+
+    return {
+        'record_count': record_count,
+        'dropped': dropped,
+        'max_crash_id': max_crash_id,
+        'year_range': [year_min, year_max],
+        'nm_types': dict(nm_types),
+        'severity': dict(severity),
     }
 
-    all_features = []
-    offset = 0
 
-    while True:
-        params = {**base_params, 'resultOffset': offset}
-        print(f"  Fetching records {offset}\u2013{offset + MAX_RECORDS}...")
+def incremental_where(max_crash_id: int, since_year: int) -> str:
+    """Select crashes newer than the high-water mark, plus recent years NCDOT may still revise."""
+    return f"{DURHAM_WHERE} AND (CrashID > {max_crash_id} OR CrashYear >= {since_year})"
 
-        response = requests.get(
-            f"{NCDOT_NONMOTORIST_SERVICE}/query",
-            params=params,
-            timeout=60,
-        )
-        response.raise_for_status()
 
-        data = response.json()
+def merge_delta(delta_path: Path, output_path: Path = OUTPUT_PATH) -> pd.DataFrame:
+    """Merge re-fetched records into the stored dataset, replacing any with the same CrashID."""
+    existing = pd.read_csv(output_path)
+    delta = pd.read_csv(delta_path)
 
-        if 'error' in data:
-            raise RuntimeError(f"ArcGIS query error: {data['error']}")
+    merged = pd.concat([existing[~existing['CrashID'].isin(delta['CrashID'])], delta], ignore_index=True)
+    merged = merged.sort_values('CrashID', ignore_index=True)
+    merged.to_csv(output_path, index=False)
+    delta_path.unlink()
+    return merged
 
-        features = data.get('features', [])
-        all_features.extend(f['attributes'] for f in features)
 
-        if len(features) < MAX_RECORDS:
-            break
-        offset += MAX_RECORDS
+def refresh_incremental(high_water_mark: int, since_year: int, output_path: Path = OUTPUT_PATH) -> tuple:
+    """
+    Fetch records above the CrashID high-water mark (or from since_year on)
+    and merge them into the stored dataset.
 
-    return all_features
+    Returns:
+        (summary dict of the merged dataset, number of records fetched)
+    """
+    delta_path = output_path.with_name(output_path.stem + '_delta.csv')
+    delta = fetch_durham_nonmotorist_crashes(delta_path, incremental_where(high_water_mark, since_year))
+
+    df = merge_delta(delta_path, output_path) if delta['record_count'] else pd.read_csv(output_path)
+    summary = summarize(df)
+    summary['dropped'] = delta['dropped']
+    # Keep the mark even if the highest fetched records were dropped or nothing new arrived
+    summary['max_crash_id'] = max(high_water_mark, delta['max_crash_id'] or high_water_mark)
+    return summary, delta['record_count']
+
+
+def summarize(df: pd.DataFrame) -> dict:
+    """Summary dict matching fetch_durham_nonmotorist_crashes for a stored dataset."""
+    return {
+        'record_count': len(df),
+        'dropped': 0,
+        'max_crash_id': int(df['CrashID'].max()),
+        'year_range': [int(df['CrashYear'].min()), int(df['CrashYear'].max())],
+        'nm_types': df['NM_Type'].value_counts().to_dict(),
+        'severity': df['CrashSevr'].value_counts().to_dict(),
+    }
 
 
 def main():
     force = '--force' in sys.argv
+    full = '--full' in sys.argv
 
     print("Fetching NCDOT non-motorist crash data for Durham County...")
 
@@ -90,38 +170,41 @@ def main():
         print("Use --force to re-fetch.")
         return
 
-    records = fetch_durham_nonmotorist_crashes()
-
-    if not records:
-        raise RuntimeError("No records returned from NCDOT Feature Service")
-
-    df = pd.DataFrame(records)
+    meta = read_meta(OUTPUT_PATH) if OUTPUT_PATH.exists() else None
+    high_water_mark = None if full or not meta else meta.get('max_crash_id')
 
-    # Convert CrashDate from epoch ms to date string
-    if 'CrashDate' in df.columns:
-        df['CrashDate'] = pd.to_datetime(df['CrashDate'], unit='ms').dt.strftime('%Y-%m-%d')
+    if high_water_mark is None:
+        summary = fetch_durham_nonmotorist_crashes(OUTPUT_PATH)
+        if not summary['record_count']:
+            raise RuntimeError("No records returned from NCDOT Feature Service")
+        delta_count = summary['record_count']
+    else:
+        # Deletions upstream are only picked up by a --full refresh
+        since_year = datetime.now(timezone.utc).year - NCDOT_REVISION_LOOKBACK_YEARS
+        print(f"  Incremental refresh: CrashID > {high_water_mark} or CrashYear >= {since_year}")
+        summary, delta_count = refresh_incremental(high_water_mark, since_year, OUTPUT_PATH)
+        print(f"  Merged {delta_count:,} new or revised records")
 
-    # Drop records missing coordinates
-    before = len(df)
-    df = df.dropna(subset=['Latitude', 'Longitude'])
-    dropped = before - len(df)
-    if dropped:
-        print(f"  Dropped {dropped} records with missing coordinates")
+    if summary['dropped']:
+        print(f"  Dropped {summary['dropped']} records with missing coordinates")
 
-    df.to_csv(OUTPUT_PATH, index=False)
+    # Typed Parquet twin of the CSV export, which is what the audits load
+    write_parquet_twin(type_crash_records(pd.read_csv(OUTPUT_PATH)), OUTPUT_PATH)
 
-    year_min = int(df['CrashYear'].min())
-    year_max = int(df['CrashYear'].max())
+    year_min, year_max = summary['year_range']
 
     write_meta(OUTPUT_PATH,
                source_url=NCDOT_NONMOTORIST_SERVICE,
-               record_count=len(df),
-               extra={'year_range': [year_min, year_max]})
+               record_count=summary['record_count'],
+               extra={'year_range': [year_min, year_max],
+                      'max_crash_id': summary['max_crash_id'],
+                      'incremental': high_water_mark is not None,
+                      'delta_count': delta_count})
 
-    print(f"\nSaved {len(df):,} geocoded crash records to {OUTPUT_PATH}")
+    print(f"\nSaved {summary['record_count']:,} geocoded crash records to {OUTPUT_PATH}")
     print(f"  Years: {year_min}\u2013{year_max}")
-    print(f"  NM types: {df['NM_Type'].value_counts().to_dict()}")
-    print(f"  Severity: {df['CrashSevr'].value_counts().to_dict()}")
+    print(f"  NM types: {summary['nm_types']}")
+    print(f"  Severity: {summary['severity']}")
 
 
 if __name__ == '__main__':
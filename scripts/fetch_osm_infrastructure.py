@@ -26,6 +26,7 @@ from config import (
     RAW_DATA_DIR, DURHAM_BOUNDS, OVERPASS_API, OVERPASS_TIMEOUT,
     OSM_INFRASTRUCTURE_FEATURES, DATA_FRESHNESS,
 )
+from utils.data_loading import load_census_tracts, write_parquet_twin
 from utils.freshness import is_fresh, write_meta
 
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -90,7 +91,7 @@ def fetch_osm_infrastructure():
             "Run fetch_durham_data.py first."
         )
 
-    tracts_gdf = gpd.read_file(tracts_path)
+    tracts_gdf = load_census_tracts(tracts_path)
     # Ensure projected CRS for area calculation
     tracts_projected = tracts_gdf.to_crs(epsg=3857)
     tracts_gdf['area_km2'] = tracts_projected.geometry.area / 1e6
@@ -196,6 +197,7 @@ def fetch_osm_infrastructure():
 
     with open(OUTPUT_FILE, 'w') as f:
         json.dump(output, f, indent=2)
+    write_parquet_twin(result_df, OUTPUT_FILE)
     print(f"\n  Saved to {OUTPUT_FILE}")
 
     write_meta(OUTPUT_FILE, source_url=OVERPASS_API, record_count=len(infra_gdf),
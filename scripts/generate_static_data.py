@@ -9,6 +9,7 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 import json
+import shutil
 import pandas as pd
 
 # Add backend to path
@@ -20,9 +21,13 @@ from config import (
     CENSUS_VINTAGE, CRASH_ANALYSIS_YEARS,
 )
 from utils.freshness import read_meta
-from models.volume_estimator import VolumeEstimationAuditor, load_test1_data
-from utils.geospatial import geojson_to_dict, simplify_geometry
-from utils.demographic_analysis import calculate_income_quintiles, calculate_minority_category
+from models.volume_estimator import VolumeEstimationAuditor
+from utils.datasets import census_tracts
+from utils.geospatial import simplify_geometry, write_geojson
+from utils.outputs import write_output
+from utils.demographic_analysis import (
+    calculate_income_quintiles, calculate_minority_category, income_quintile_labels,
+)
 
 
 def copy_json(source_path, dest_path, indent=2):
@@ -34,7 +39,65 @@ def copy_json(source_path, dest_path, indent=2):
     return data
 
 
-def main():
+def load_records(simulated, name):
+    """Load a records-array audit output as a DataFrame."""
+    if simulated is None:
+        return pd.read_json(SIMULATED_DATA_DIR / name, precise_float=True)
+    # Match the schema read back from disk: to_json keeps 10 decimals and
+    # read_json parses the string tract ids and whole-dollar incomes as ints
+    df = simulated[name].copy()
+    floats = df.select_dtypes('float').columns
+    df[floats] = df[floats].map(lambda value: round(value, 10))
+    for column in ('tract_id', 'median_income'):
+        if column in df.columns:
+            df[column] = df[column].astype('int64')
+    return df
+
+
+def load_json(simulated, name):
+    """Load a JSON audit output."""
+    if simulated is None:
+        with open(SIMULATED_DATA_DIR / name) as f:
+            return json.load(f)
+    return simulated[name]
+
+
+def publish_json(simulated, name, dest_path):
+    """Write a JSON audit output to dest_path, returning the data."""
+    if simulated is None:
+        return copy_json(SIMULATED_DATA_DIR / name, dest_path)
+    with open(dest_path, 'w') as f:
+        json.dump(simulated[name], f, indent=2)
+    return simulated[name]
+
+
+def publish_records(simulated, name, dest_path):
+    """Write a records-array audit output to dest_path."""
+    if simulated is None:
+        shutil.copyfile(SIMULATED_DATA_DIR / name, dest_path)
+    else:
+        write_output(simulated[name], dest_path)
+
+
+def publish_geojson(simulated, name, dest_path):
+    """Write a GeoJSON audit output to dest_path."""
+    if simulated is None:
+        # Already compact GeoJSON; copy bytes instead of reparsing
+        shutil.copyfile(SIMULATED_DATA_DIR / name, dest_path)
+    else:
+        with open(dest_path, 'w') as f:
+            write_geojson(simulated[name], f)
+
+
+def main(simulated=None):
+    """
+    Generate frontend JSON from audit outputs.
+
+    Args:
+        simulated: Audit outputs keyed by SIMULATED_DATA_DIR file name, as
+            returned by each script's run_audit(). Read from SIMULATED_DATA_DIR
+            when None.
+    """
     print("Generating static data for gh-pages deployment...")
     print("=" * 60)
 
@@ -44,9 +107,9 @@ def main():
 
     # Load data
     print("Loading data...")
-    census_gdf, ground_truth, ai_predictions = load_test1_data(
-        RAW_DATA_DIR, SIMULATED_DATA_DIR
-    )
+    census_gdf = census_tracts(RAW_DATA_DIR / 'durham_census_tracts.geojson')
+    ground_truth = load_records(simulated, 'ground_truth_counters.json')
+    ai_predictions = load_records(simulated, 'ai_volume_predictions.json')
 
     auditor = VolumeEstimationAuditor(census_gdf, ground_truth, ai_predictions)
 
@@ -55,9 +118,8 @@ def main():
     # 1. Census tracts
     print("Generating census tracts GeoJSON...")
     census_simplified = simplify_geometry(census_gdf.copy(), tolerance=0.001)
-    census_geojson = geojson_to_dict(census_simplified)
     with open(output_dir / 'census-tracts.json', 'w') as f:
-        json.dump(census_geojson, f)
+        write_geojson(census_simplified, f)
 
     # 2. Counter locations
     print("Generating counter locations...")
@@ -68,13 +130,13 @@ def main():
     # 3. Full report
     print("Generating full report...")
     report = auditor.generate_full_report()
+    report['uncertainty'] = load_json(simulated, 'volume_uncertainty.json')
     with open(output_dir / 'volume-report.json', 'w') as f:
         json.dump(report, f, indent=2)
 
     # 4. Choropleth data
     print("Generating choropleth data...")
-    tract_predictions_file = SIMULATED_DATA_DIR / 'tract_volume_predictions.json'
-    tract_predictions = pd.read_json(tract_predictions_file)
+    tract_predictions = load_records(simulated, 'tract_volume_predictions.json')
     tract_predictions['tract_id'] = tract_predictions['tract_id'].astype(str)
     census_gdf['tract_id'] = census_gdf['tract_id'].astype(str)
 
@@ -96,9 +158,8 @@ def main():
     tract_errors_gdf = calculate_minority_category(tract_errors_gdf)
 
     tract_errors_gdf = simplify_geometry(tract_errors_gdf, tolerance=0.001)
-    choropleth_geojson = geojson_to_dict(tract_errors_gdf)
     with open(output_dir / 'choropleth-data.json', 'w') as f:
-        json.dump(choropleth_geojson, f)
+        write_geojson(tract_errors_gdf, f)
 
     # 5. Accuracy by income
     print("Generating accuracy by income...")
@@ -123,8 +184,8 @@ def main():
     print("Generating Test 3 data (Infrastructure Recommendations)...")
     print("=" * 60)
 
-    infrastructure_file = SIMULATED_DATA_DIR / 'infrastructure_recommendations.json'
-    infrastructure_data = copy_json(infrastructure_file, output_dir / 'infrastructure-report.json')
+    infrastructure_data = publish_json(simulated, 'infrastructure_recommendations.json',
+                                       output_dir / 'infrastructure-report.json')
 
     print("Generating danger scores map data...")
     danger_scores = infrastructure_data['danger_scores']
@@ -134,14 +195,10 @@ def main():
     )
     # Add income quintile for cross-filtering
     income_col = 'median_income_y' if 'median_income_y' in danger_gdf.columns else 'median_income'
-    danger_gdf['income_quintile'] = pd.qcut(
-        danger_gdf[income_col], q=5,
-        labels=['Q1 (Poorest)', 'Q2', 'Q3', 'Q4', 'Q5 (Richest)']
-    )
+    danger_gdf['income_quintile'] = income_quintile_labels(danger_gdf[income_col])
     danger_gdf = simplify_geometry(danger_gdf, tolerance=0.001)
-    danger_geojson = geojson_to_dict(danger_gdf)
     with open(output_dir / 'danger-scores.json', 'w') as f:
-        json.dump(danger_geojson, f)
+        write_geojson(danger_gdf, f)
 
     print("Generating budget allocation data...")
     allocation_comparison = {
@@ -152,6 +209,9 @@ def main():
     with open(output_dir / 'budget-allocation.json', 'w') as f:
         json.dump(allocation_comparison, f, indent=2)
 
+    print("Generating budget x bias-strength sweep...")
+    publish_records(simulated, 'infrastructure_budget_sweep.json', output_dir / 'budget-sweep.json')
+
     print("Generating recommendations map data...")
     ai_recs_df = pd.DataFrame(infrastructure_data['ai_recommendations'])
     need_recs_df = pd.DataFrame(infrastructure_data['need_based_recommendations'])
@@ -162,46 +222,32 @@ def main():
     ai_recs_gdf = simplify_geometry(ai_recs_gdf, tolerance=0.001)
     need_recs_gdf = simplify_geometry(need_recs_gdf, tolerance=0.001)
 
-    recommendations_data = {
-        'ai_recommendations': geojson_to_dict(ai_recs_gdf),
-        'need_based_recommendations': geojson_to_dict(need_recs_gdf)
-    }
     with open(output_dir / 'recommendations.json', 'w') as f:
-        json.dump(recommendations_data, f, indent=2)
+        f.write('{"ai_recommendations":')
+        write_geojson(ai_recs_gdf, f)
+        f.write(',"need_based_recommendations":')
+        write_geojson(need_recs_gdf, f)
+        f.write('}')
 
     # ===== TEST 2: Crash Prediction Bias =====
     print("\n" + "=" * 60)
     print("Generating Test 2 data (Crash Prediction Bias)...")
     print("=" * 60)
 
-    crash_report_file = SIMULATED_DATA_DIR / 'crash_predictions.json'
-    copy_json(crash_report_file, output_dir / 'crash-report.json')
-
-    crash_files = {
-        'confusion_matrices.json': 'confusion-matrices.json',
-        'crash_time_series.json': 'crash-time-series.json',
-        'crash_geo_data.json': 'crash-geo-data.json',
-    }
-    for src_name, dest_name in crash_files.items():
-        indent = 2 if dest_name != 'crash-geo-data.json' else None
-        copy_json(SIMULATED_DATA_DIR / src_name, output_dir / dest_name, indent=indent)
+    publish_json(simulated, 'crash_predictions.json', output_dir / 'crash-report.json')
+    publish_json(simulated, 'confusion_matrices.json', output_dir / 'confusion-matrices.json')
+    publish_json(simulated, 'crash_time_series.json', output_dir / 'crash-time-series.json')
+    publish_geojson(simulated, 'crash_geo_data.json', output_dir / 'crash-geo-data.json')
 
     # ===== TEST 4: Suppressed Demand Analysis =====
     print("\n" + "=" * 60)
     print("Generating Test 4 data (Suppressed Demand Analysis)...")
     print("=" * 60)
 
-    demand_report_file = SIMULATED_DATA_DIR / 'demand_analysis.json'
-    copy_json(demand_report_file, output_dir / 'demand-report.json')
-
-    demand_files = {
-        'demand_funnel.json': 'demand-funnel.json',
-        'detection_scorecard.json': 'detection-scorecard.json',
-        'demand_geo_data.json': 'demand-geo-data.json',
-    }
-    for src_name, dest_name in demand_files.items():
-        indent = 2 if dest_name != 'demand-geo-data.json' else None
-        copy_json(SIMULATED_DATA_DIR / src_name, output_dir / dest_name, indent=indent)
+    publish_json(simulated, 'demand_analysis.json', output_dir / 'demand-report.json')
+    publish_json(simulated, 'demand_funnel.json', output_dir / 'demand-funnel.json')
+    publish_json(simulated, 'detection_scorecard.json', output_dir / 'detection-scorecard.json')
+    publish_geojson(simulated, 'demand_geo_data.json', output_dir / 'demand-geo-data.json')
 
     # ===== DATA MANIFEST & METADATA =====
     print("\n" + "=" * 60)
@@ -246,7 +292,7 @@ def main():
                 'fetched_at': (osm_meta or {}).get('fetched_at'),
                 'rationale': 'Project selection uses real OSM infrastructure gaps; danger scores and allocation logic are simulated',
                 'files': ['infrastructure-report.json', 'danger-scores.json',
-                          'budget-allocation.json', 'recommendations.json'],
+                          'budget-allocation.json', 'budget-sweep.json', 'recommendations.json'],
             },
             'suppressed_demand': {
                 'type': 'mixed',
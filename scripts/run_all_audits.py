@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Run all four audits in one go and publish the frontend JSON.
+
+Raw inputs are parsed once in this process (utils.datasets); the volume,
+crash, infrastructure and demand audits then run concurrently in forked
+worker processes that inherit those read-only frames. Their outputs come
+back in memory and feed generate_static_data.py directly, without the
+intermediate JSON round-trip through SIMULATED_DATA_DIR.
+
+Usage:
+    python scripts/run_all_audits.py                   # audits + frontend JSON
+    python scripts/run_all_audits.py --keep-simulated  # also write SIMULATED_DATA_DIR files
+    python scripts/run_all_audits.py --jobs 2          # cap parallel audits
+"""
+
+import io
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from config import SIMULATED_DATA_DIR
+from utils.datasets import census_tracts, crash_records, infrastructure_scores
+from utils.outputs import write_outputs
+
+import analyze_suppressed_demand
+import generate_static_data
+import simulate_ai_predictions
+import simulate_crash_predictions
+import simulate_infrastructure_recommendations
+
+AUDITS = {
+    'volume': simulate_ai_predictions.run_audit,
+    'crash': simulate_crash_predictions.run_audit,
+    'infrastructure': simulate_infrastructure_recommendations.run_audit,
+    'demand': analyze_suppressed_demand.run_audit,
+}
+
+
+def run_audit(name: str) -> tuple:
+    """Run one audit, capturing its console output so logs don't interleave."""
+    log = io.StringIO()
+    start = time.monotonic()
+    with redirect_stdout(log):
+        outputs = AUDITS[name]()
+    return name, outputs, log.getvalue(), time.monotonic() - start
+
+
+def main():
+    keep_simulated = '--keep-simulated' in sys.argv
+    jobs = None
+    if '--jobs' in sys.argv:
+        jobs = int(sys.argv[sys.argv.index('--jobs') + 1])
+
+    print("Loading raw data...")
+    census_tracts()
+    crash_records()
+    infrastructure_scores()
+
+    # Forked workers share the parent's parsed frames; elsewhere each worker reloads them
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+
+    simulated = {}
+    with ProcessPoolExecutor(max_workers=jobs or len(AUDITS), mp_context=context) as executor:
+        for name, outputs, log, elapsed in executor.map(run_audit, AUDITS):
+            print(f"\n{'=' * 60}\n[{name}] audit ({elapsed:.1f}s)\n{'=' * 60}")
+            print(log, end='')
+            simulated.update(outputs)
+
+    if keep_simulated:
+        print(f"\nWriting audit outputs to {SIMULATED_DATA_DIR}")
+        write_outputs(simulated, SIMULATED_DATA_DIR)
+
+    print()
+    return generate_static_data.main(simulated=simulated)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
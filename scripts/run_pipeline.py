@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Incremental runner for the generate-data stage.
+
+Each stage declares its input files, the backend modules it imports, the
+config values it reads, and the files it writes. A stage reruns only when
+the content hash of those inputs changes (or an output is missing); independent stages run in parallel
+processes, and generate_static_data.py runs once its upstream stages finish.
+
+Usage:
+    python scripts/run_pipeline.py            # rerun stale stages
+    python scripts/run_pipeline.py --dry-run  # show what would run
+    python scripts/run_pipeline.py --force    # rerun everything
+    python scripts/run_pipeline.py --jobs 2   # cap parallel stages
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+BACKEND_DIR = REPO_DIR / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+import config
+from config import RAW_DATA_DIR, SIMULATED_DATA_DIR
+from utils.data_loading import parquet_path_for
+from utils.freshness import meta_path_for
+from utils.pipeline import is_stale, load_state, save_state, stage_fingerprint
+
+FRONTEND_DATA_DIR = REPO_DIR / 'frontend' / 'public' / 'data'
+STATE_FILE = SIMULATED_DATA_DIR / '.pipeline_state.json'
+
+CENSUS_FILE = RAW_DATA_DIR / 'durham_census_tracts.geojson'
+CRASH_FILE = RAW_DATA_DIR / 'ncdot_nonmotorist_durham.csv'
+OSM_FILE = RAW_DATA_DIR / 'osm_infrastructure.json'
+
+# Loaders prefer each export's Parquet twin, so both count as stage inputs
+CENSUS_INPUTS = [CENSUS_FILE, parquet_path_for(CENSUS_FILE)]
+CRASH_INPUTS = [CRASH_FILE, parquet_path_for(CRASH_FILE)]
+OSM_INPUTS = [OSM_FILE, parquet_path_for(OSM_FILE)]
+
+
+def backend_code(*modules: str) -> list:
+    """Source paths of backend modules named like 'utils.rng'."""
+    return [BACKEND_DIR / f"{module.replace('.', '/')}.py" for module in modules]
+
+
+# Backend modules every stage imports (directly or through other utils);
+# config values are declared per stage rather than hashing config.py
+COMMON_CODE = backend_code(
+    'utils.data_loading', 'utils.datasets', 'utils.pipeline', 'utils.rng', 'utils.geospatial',
+    'utils.demographic_analysis', 'utils.bootstrap', 'utils.monte_carlo',
+)
+SIMULATION_CODE = [*COMMON_CODE, *backend_code('utils.outputs')]
+
+VOLUME_OUTPUTS = ['ground_truth_counters.json', 'ai_volume_predictions.json',
+                  'tract_volume_predictions.json', 'volume_uncertainty.json']
+CRASH_OUTPUTS = ['crash_predictions.json', 'crash_time_series.json',
+                 'confusion_matrices.json', 'crash_geo_data.json', 'crash_backtest.json']
+INFRASTRUCTURE_OUTPUTS = ['infrastructure_recommendations.json', 'infrastructure_budget_sweep.json']
+DEMAND_OUTPUTS = ['demand_analysis.json', 'demand_funnel.json', 'correlation_matrix.json',
+                  'detection_scorecard.json', 'network_flow.json', 'demand_geo_data.json']
+
+FRONTEND_OUTPUTS = [
+    'census-tracts.json', 'counter-locations.json', 'volume-report.json',
+    'choropleth-data.json', 'accuracy-by-income.json', 'accuracy-by-race.json',
+    'scatter-data.json', 'crash-report.json', 'confusion-matrices.json',
+    'crash-time-series.json', 'crash-geo-data.json', 'infrastructure-report.json',
+    'danger-scores.json', 'budget-allocation.json', 'budget-sweep.json', 'recommendations.json',
+    'demand-report.json', 'demand-funnel.json', 'detection-scorecard.json',
+    'demand-geo-data.json', 'metadata.json', 'data-manifest.json',
+]
+
+STAGES = {
+    'volume': {
+        'script': 'simulate_ai_predictions.py',
+        'inputs': CENSUS_INPUTS,
+        'code': SIMULATION_CODE,
+        'config': ['BIAS_PARAMETERS', 'VOLUME_SIMULATION_CONFIG', 'DEFAULT_RANDOM_SEED',
+                   'QUINTILE_LABELS', 'MONTE_CARLO_REPLICATES', 'MONTE_CARLO_CI_LEVEL'],
+        'outputs': [SIMULATED_DATA_DIR / name for name in VOLUME_OUTPUTS],
+        'after': [],
+    },
+    'crash': {
+        'script': 'simulate_crash_predictions.py',
+        'inputs': [*CENSUS_INPUTS, *CRASH_INPUTS],
+        'code': [*SIMULATION_CODE, *backend_code('models.crash_predictor', 'models.crash_models',
+                                                 'utils.tract_cache')],
+        'config': ['CRASH_ANALYSIS_YEARS', 'CRASH_TRAINING_YEARS', 'CRASH_TEST_YEARS',
+                   'CRASH_BACKTEST_YEARS', 'CRASH_BACKTEST_CONFIG', 'DEFAULT_RANDOM_SEED',
+                   'CENSUS_VINTAGE', 'QUINTILE_LABELS', 'GEOJSON_COORDINATE_PRECISION',
+                   'BOOTSTRAP_RESAMPLES', 'MONTE_CARLO_CI_LEVEL'],
+        'outputs': [SIMULATED_DATA_DIR / name for name in CRASH_OUTPUTS],
+        'after': [],
+    },
+    'infrastructure': {
+        'script': 'simulate_infrastructure_recommendations.py',
+        'inputs': [*CENSUS_INPUTS, *OSM_INPUTS],
+        'code': [*SIMULATION_CODE, *backend_code('models.infrastructure_auditor', 'utils.allocation')],
+        'config': ['INFRASTRUCTURE_PROJECT_TYPES', 'INFRASTRUCTURE_DEFAULT_BUDGET',
+                   'INFRASTRUCTURE_SWEEP_BUDGETS', 'INFRASTRUCTURE_SWEEP_BIAS_STRENGTHS',
+                   'DANGER_SCORE_CONFIG', 'DEFAULT_RANDOM_SEED', 'QUINTILE_LABELS',
+                   'MONTE_CARLO_REPLICATES', 'MONTE_CARLO_CI_LEVEL'],
+        'outputs': [SIMULATED_DATA_DIR / name for name in INFRASTRUCTURE_OUTPUTS],
+        'after': [],
+    },
+    'demand': {
+        'script': 'analyze_suppressed_demand.py',
+        'inputs': [*CENSUS_INPUTS, *OSM_INPUTS],
+        'code': [*SIMULATION_CODE, *backend_code('models.demand_analyzer')],
+        'config': ['SUPPRESSED_DEMAND_CONFIG', 'HIGH_SUPPRESSION_THRESHOLD',
+                   'DEFAULT_RANDOM_SEED', 'QUINTILE_LABELS', 'GEOJSON_COORDINATE_PRECISION',
+                   'MONTE_CARLO_REPLICATES', 'MONTE_CARLO_CI_LEVEL'],
+        'outputs': [SIMULATED_DATA_DIR / name for name in DEMAND_OUTPUTS],
+        'after': [],
+    },
+    'static': {
+        'script': 'generate_static_data.py',
+        'inputs': (
+            CENSUS_INPUTS
+            + [meta_path_for(path) for path in (CENSUS_FILE, CRASH_FILE, OSM_FILE)]
+            + [SIMULATED_DATA_DIR / name for name in
+               VOLUME_OUTPUTS + CRASH_OUTPUTS + INFRASTRUCTURE_OUTPUTS + DEMAND_OUTPUTS]
+        ),
+        'code': [*COMMON_CODE, *backend_code('models.volume_estimator', 'utils.freshness')],
+        'config': ['PLAUSIBILITY_RANGES', 'CENSUS_VINTAGE', 'CRASH_ANALYSIS_YEARS',
+                   'QUINTILE_LABELS', 'GEOJSON_COORDINATE_PRECISION', 'DEFAULT_RANDOM_SEED',
+                   'BOOTSTRAP_RESAMPLES', 'MONTE_CARLO_CI_LEVEL'],
+        'outputs': [FRONTEND_DATA_DIR / name for name in FRONTEND_OUTPUTS],
+        'after': ['volume', 'crash', 'infrastructure', 'demand'],
+    },
+}
+
+
+def fingerprint(stage: dict) -> str:
+    """Hash a stage's script, declared backend code, input files and config values."""
+    inputs = [SCRIPTS_DIR / stage['script'], *stage['code'], *stage['inputs']]
+    config_values = {name: getattr(config, name) for name in stage['config']}
+    return stage_fingerprint(inputs, config_values, root=REPO_DIR)
+
+
+def run_stage(name: str) -> tuple:
+    """Run one stage's script in its own process, capturing its output."""
+    start = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / STAGES[name]['script'])],
+        capture_output=True, text=True,
+    )
+    return name, result, time.monotonic() - start
+
+
+def positive_int(value: str) -> int:
+    """argparse type for a count of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Rerun the generate-data stages whose inputs changed.')
+    parser.add_argument('--dry-run', action='store_true', help='show what would run')
+    parser.add_argument('--force', action='store_true', help='rerun every stage')
+    parser.add_argument('--jobs', type=positive_int, default=None, help='cap parallel stages')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    force, dry_run, jobs = args.force, args.dry_run, args.jobs
+
+    SIMULATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    FRONTEND_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    state = load_state(STATE_FILE)
+
+    done, rerun = set(), set()
+    while len(done) < len(STAGES):
+        ready = [name for name, stage in STAGES.items()
+                 if name not in done and all(dep in done for dep in stage['after'])]
+
+        fingerprints = {name: fingerprint(STAGES[name]) for name in ready}
+        stale = [name for name in ready
+                 if force or is_stale(name, fingerprints[name], STAGES[name]['outputs'], state)
+                 # Upstream outputs don't exist yet on a dry run; assume they change
+                 or (dry_run and any(dep in rerun for dep in STAGES[name]['after']))]
+        rerun.update(stale)
+
+        for name in ready:
+            status = 'run' if name in stale else 'up to date'
+            print(f"  {name:<16} {STAGES[name]['script']:<46} {status}")
+
+        if dry_run or not stale:
+            done.update(ready)
+            continue
+
+        with ThreadPoolExecutor(max_workers=jobs or len(stale)) as executor:
+            results = list(executor.map(run_stage, stale))
+
+        # Record every stage that succeeded before reporting a failure, so
+        # finished siblings of a failed stage aren't rerun next time
+        failures = []
+        for name, result, elapsed in results:
+            print(f"\n{'=' * 60}\n[{name}] {STAGES[name]['script']} ({elapsed:.1f}s)\n{'=' * 60}")
+            print(result.stdout, end='')
+            if result.returncode != 0:
+                print(result.stderr, end='', file=sys.stderr)
+                print(f"\n✗ Stage '{name}' failed (exit {result.returncode})", file=sys.stderr)
+                failures.append(result.returncode)
+            else:
+                state[name] = fingerprints[name]
+
+        save_state(STATE_FILE, state)
+        if failures:
+            return failures[0]
+        done.update(ready)
+
+    if dry_run and rerun:
+        print(f"\n{len(rerun)} stage(s) would run")
+    else:
+        print("\n✓ Pipeline up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
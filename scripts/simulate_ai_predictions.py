@@ -13,12 +13,19 @@ sys.path.append(str(Path(__file__).parent.parent / 'backend'))
 
 import numpy as np
 import pandas as pd
-import geopandas as gpd
-from config import RAW_DATA_DIR, SIMULATED_DATA_DIR, BIAS_PARAMETERS, VOLUME_SIMULATION_CONFIG
+from config import (
+    RAW_DATA_DIR, SIMULATED_DATA_DIR, BIAS_PARAMETERS, VOLUME_SIMULATION_CONFIG, DEFAULT_RANDOM_SEED,
+    MONTE_CARLO_REPLICATES, MONTE_CARLO_CI_LEVEL,
+)
+from utils.datasets import census_tracts
+from utils.demographic_analysis import assign_income_quintiles, quintile_cut_points
+from utils.monte_carlo import group_means, summarize_metrics, summarize_replicates
+from utils.outputs import write_outputs
+from utils.rng import spawn_rngs
 
 SIMULATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-def generate_ground_truth_counters(census_gdf):
+def generate_ground_truth_counters(census_gdf, rng):
     """Generate ground truth bike/ped counter data"""
 
     num_counters = VOLUME_SIMULATION_CONFIG['num_counters']
@@ -29,7 +36,7 @@ def generate_ground_truth_counters(census_gdf):
         tract = census_gdf.iloc[idx % len(census_gdf)]
         centroid = tract.geometry.centroid
         base_volume = tract['total_population'] / 100  # ~1% of pop bikes/walks daily
-        seasonal_factor = np.random.uniform(0.8, 1.2)
+        seasonal_factor = rng.uniform(0.8, 1.2)
         daily_volume = int(base_volume * seasonal_factor)
 
         counter = {
@@ -46,28 +53,23 @@ def generate_ground_truth_counters(census_gdf):
         counters.append(counter)
 
     df = pd.DataFrame(counters)
-
-    # Save ground truth
-    output_file = SIMULATED_DATA_DIR / 'ground_truth_counters.json'
-    df.to_json(output_file, orient='records', indent=2)
     print(f"Generated {len(counters)} counter locations")
-    print(f"Saved to {output_file}")
 
     return df
 
-def apply_ai_bias(ground_truth_df, census_gdf):
+def apply_ai_bias(ground_truth_df, census_gdf, rng):
     """Apply documented bias patterns to create AI predictions"""
 
     ai_predictions = []
 
-    for _, counter in ground_truth_df.iterrows():
+    income_quintiles = get_income_quintiles(ground_truth_df['median_income'], census_gdf)
+
+    for (_, counter), income_quintile in zip(ground_truth_df.iterrows(), income_quintiles):
         true_volume = counter['daily_volume']
-        income = counter['median_income']
         pct_minority = counter['pct_minority']
 
-        income_quintile = get_income_quintile(income, census_gdf)
         total_bias = calculate_demographic_bias(income_quintile, pct_minority)
-        noise = np.random.normal(1.0, BIAS_PARAMETERS['base_noise'])
+        noise = rng.normal(1.0, BIAS_PARAMETERS['base_noise'])
         predicted_volume = int(true_volume * total_bias * noise)
 
         prediction = {
@@ -109,13 +111,9 @@ def apply_ai_bias(ground_truth_df, census_gdf):
     print(f"\nLow-minority areas (<30%):")
     print(f"  Mean error: {low_minority['error_pct'].mean():.1f}%")
 
-    output_file = SIMULATED_DATA_DIR / 'ai_volume_predictions.json'
-    df.to_json(output_file, orient='records', indent=2)
-    print(f"\nSaved AI predictions to {output_file}")
-
     return df
 
-def generate_tract_level_predictions(census_gdf):
+def generate_tract_level_predictions(census_gdf, rng):
     """
     Generate AI volume predictions for ALL census tracts.
 
@@ -134,7 +132,9 @@ def generate_tract_level_predictions(census_gdf):
 
     predictions = []
 
-    for _, tract in tract_summary.iterrows():
+    income_quintiles = get_income_quintiles(tract_summary['median_income'], census_gdf)
+
+    for (_, tract), income_quintile in zip(tract_summary.iterrows(), income_quintiles):
         population = tract['total_population']
         base_rate = VOLUME_SIMULATION_CONFIG['base_active_transport_rate']
         area_km2 = tract.geometry.area * 111 * 111  # rough conversion to km²
@@ -150,9 +150,8 @@ def generate_tract_level_predictions(census_gdf):
 
         income = tract['median_income']
         pct_minority = tract['pct_minority']
-        income_quintile = get_income_quintile(income, census_gdf)
         total_bias = calculate_demographic_bias(income_quintile, pct_minority)
-        noise = np.random.normal(1.0, VOLUME_SIMULATION_CONFIG['aggregate_noise_std'])
+        noise = rng.normal(1.0, VOLUME_SIMULATION_CONFIG['aggregate_noise_std'])
 
         predicted_daily_volume = int(true_daily_volume * total_bias * noise)
 
@@ -193,26 +192,85 @@ def generate_tract_level_predictions(census_gdf):
     print(f"  High minority (>60%): {high_minority['error_pct'].mean():+.1f}% ({len(high_minority)} tracts)")
     print(f"  Low minority (<30%): {low_minority['error_pct'].mean():+.1f}% ({len(low_minority)} tracts)")
 
-    output_file = SIMULATED_DATA_DIR / 'tract_volume_predictions.json'
-    df.to_json(output_file, orient='records', indent=2)
-    print(f"\nSaved tract-level predictions to {output_file}")
-
     return df
 
-def get_income_quintile(income, census_gdf):
-    """Calculate income quintile (1=lowest, 5=highest)"""
-    quintiles = census_gdf['median_income'].quantile([0.2, 0.4, 0.6, 0.8])
-
-    if income <= quintiles[0.2]:
-        return 1
-    elif income <= quintiles[0.4]:
-        return 2
-    elif income <= quintiles[0.6]:
-        return 3
-    elif income <= quintiles[0.8]:
-        return 4
-    else:
-        return 5
+def replicate_error_pct(predictions_df, noise_std, rng, n_replicates):
+    """
+    Prediction error % for n_replicates redraws of the multiplicative noise.
+
+    Bias multipliers and true volumes are fixed; returns a
+    (replicates, rows) array, with 0 error where the true volume is 0.
+    """
+    true_volume = predictions_df['true_volume'].to_numpy(dtype=float)
+    bias = predictions_df['bias_applied'].to_numpy(dtype=float)
+    noise = rng.normal(1.0, noise_std, (n_replicates, len(predictions_df)))
+    # int() truncation, as in the single-draw predictions
+    predicted = np.trunc(true_volume * bias * noise)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(true_volume > 0, (predicted - true_volume) / true_volume * 100, 0.0)
+
+def simulate_prediction_uncertainty(ai_predictions, tract_predictions, rng, n_replicates=MONTE_CARLO_REPLICATES):
+    """
+    Confidence intervals for the volume bias findings over replicates of the prediction noise.
+
+    Redraws the counter-level (apply_ai_bias) and tract-level noise for all
+    replicates at once and summarizes mean error % overall, by income
+    quintile and by minority share.
+    """
+    counter_rng, tract_rng = spawn_rngs(rng, 2)
+    counter_error = replicate_error_pct(ai_predictions, BIAS_PARAMETERS['base_noise'], counter_rng, n_replicates)
+    tract_error = replicate_error_pct(
+        tract_predictions, VOLUME_SIMULATION_CONFIG['aggregate_noise_std'], tract_rng, n_replicates
+    )
+
+    counter_quintiles = group_means(counter_error, ai_predictions['income_quintile'].to_numpy() - 1, 5)
+    tract_quintiles = group_means(tract_error, tract_predictions['income_quintile'].to_numpy() - 1, 5)
+
+    pct_minority = ai_predictions['pct_minority'].to_numpy()
+    high_minority = pct_minority > VOLUME_SIMULATION_CONFIG['minority_high_threshold']
+    low_minority = pct_minority < VOLUME_SIMULATION_CONFIG['minority_low_threshold']
+    with np.errstate(invalid='ignore'):
+        high_minority_error = counter_error[:, high_minority].mean(axis=1)
+        low_minority_error = counter_error[:, low_minority].mean(axis=1)
+
+    uncertainty = {
+        'replicates': n_replicates,
+        'ci_level': MONTE_CARLO_CI_LEVEL,
+        'counters': summarize_metrics({
+            'mean_error_pct': counter_error.mean(axis=1),
+            'mean_absolute_error_pct': np.abs(counter_error).mean(axis=1),
+            'income_error_gap': counter_quintiles[:, 4] - counter_quintiles[:, 0],
+            'high_minority_error_pct': high_minority_error,
+            'low_minority_error_pct': low_minority_error,
+        }),
+        'counters_by_quintile': {
+            f'Q{q + 1}': summarize_replicates(counter_quintiles[:, q]) for q in range(5)
+        },
+        'tracts': summarize_metrics({
+            'mean_error_pct': tract_error.mean(axis=1),
+            'income_error_gap': tract_quintiles[:, 4] - tract_quintiles[:, 0],
+        }),
+        'tracts_by_quintile': {
+            f'Q{q + 1}': summarize_replicates(tract_quintiles[:, q]) for q in range(5)
+        },
+    }
+
+    gap = uncertainty['counters']['income_error_gap']
+    print(f"\nQ5 - Q1 counter error gap over {n_replicates} replicates: "
+          f"{gap['mean']:.1f} pts ({MONTE_CARLO_CI_LEVEL:.0%} CI {gap['ci_lower']:.1f} to {gap['ci_upper']:.1f})")
+
+    return uncertainty
+
+def get_income_quintiles(incomes, census_gdf):
+    """
+    Income quintiles (1=lowest, 5=highest) relative to all census tracts.
+
+    A missing income falls in quintile 5, as the scalar comparison chain
+    this replaced did (every <= test is False for NaN).
+    """
+    cut_points = quintile_cut_points(census_gdf['median_income'])
+    quintiles = assign_income_quintiles(incomes, cut_points)
+    return np.where(np.isnan(quintiles), 5, quintiles).astype(int)
 
 def calculate_demographic_bias(income_quintile, pct_minority):
     """Calculate combined income + racial bias multiplier."""
@@ -232,28 +290,50 @@ def calculate_demographic_bias(income_quintile, pct_minority):
 
     return income_bias * racial_bias
 
-if __name__ == '__main__':
-    print("AI Prediction Simulation - Volume Estimation Bias")
-    print("=" * 60)
-
+def run_audit(seed=DEFAULT_RANDOM_SEED) -> dict:
+    """Run the volume simulation, returning outputs keyed by SIMULATED_DATA_DIR file name."""
     census_file = RAW_DATA_DIR / 'durham_census_tracts.geojson'
     if not census_file.exists():
-        print("Error: Census data not found. Run fetch_durham_data.py first.")
-        sys.exit(1)
+        raise FileNotFoundError("Census data not found. Run fetch_durham_data.py first.")
 
-    census_gdf = gpd.read_file(census_file)
+    census_gdf = census_tracts(census_file)
     print(f"Loaded {len(census_gdf)} census tracts")
 
+    # One independent stream per simulation step
+    counter_rng, bias_rng, tract_rng, uncertainty_rng = spawn_rngs(seed, 4)
+
     print("\n1. Generating ground truth counter data (validation)...")
-    ground_truth = generate_ground_truth_counters(census_gdf)
+    ground_truth = generate_ground_truth_counters(census_gdf, counter_rng)
 
     print("\n2. Applying AI bias to counter predictions...")
-    ai_predictions = apply_ai_bias(ground_truth, census_gdf)
+    ai_predictions = apply_ai_bias(ground_truth, census_gdf, bias_rng)
 
     print("\n3. Generating tract-level predictions for all areas...")
-    tract_predictions = generate_tract_level_predictions(census_gdf)
+    tract_predictions = generate_tract_level_predictions(census_gdf, tract_rng)
+
+    print("\n4. Replicating prediction noise for confidence intervals...")
+    uncertainty = simulate_prediction_uncertainty(ai_predictions, tract_predictions, uncertainty_rng)
 
     print("\n✓ Simulation complete!")
     print(f"\nGenerated:")
     print(f"  - {len(ground_truth)} validation counters")
     print(f"  - {len(tract_predictions)} tract-level predictions")
+
+    return {
+        'ground_truth_counters.json': ground_truth,
+        'ai_volume_predictions.json': ai_predictions,
+        'tract_volume_predictions.json': tract_predictions,
+        'volume_uncertainty.json': uncertainty,
+    }
+
+def main():
+    print("AI Prediction Simulation - Volume Estimation Bias")
+    print("=" * 60)
+
+    outputs = run_audit()
+
+    print(f"\nSaving to {SIMULATED_DATA_DIR}")
+    write_outputs(outputs, SIMULATED_DATA_DIR)
+
+if __name__ == '__main__':
+    main()
@@ -7,23 +7,27 @@ This script:
 3. Geocodes crashes to census tracts
 4. Trains AI model on historical data (2019-2022)
 5. Predicts crash risk for 2023 and evaluates accuracy disparities
-6. Exports audit results for frontend visualization
+6. Backtests the model on every train/test split of the full crash history
+7. Exports audit results for frontend visualization
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
 
-import geopandas as gpd
+import pandas as pd
 from sklearn.metrics import confusion_matrix, precision_recall_fscore_support
 from config import (
     CRASH_ANALYSIS_YEARS, CRASH_TRAINING_YEARS, CRASH_TEST_YEARS,
-    CENSUS_VINTAGE, RAW_DATA_DIR, SIMULATED_DATA_DIR,
+    CRASH_BACKTEST_YEARS, CRASH_BACKTEST_CONFIG, CENSUS_VINTAGE, CACHE_DIR, RAW_DATA_DIR, SIMULATED_DATA_DIR,
+    MONTE_CARLO_CI_LEVEL,
 )
 from models.crash_predictor import CrashPredictionAuditor
+from utils.bootstrap import bootstrap_group_gaps
+from utils.datasets import census_tracts
+from utils.outputs import write_outputs
 
 
 def load_census_data():
@@ -35,7 +39,7 @@ def load_census_data():
             "Run fetch_durham_data.py first."
         )
 
-    gdf = gpd.read_file(census_path)
+    gdf = census_tracts(census_path)
     print(f"Loaded {len(gdf)} census tracts")
 
     required = ['tract_id', 'median_income', 'total_population', 'pct_minority', 'geometry']
@@ -46,11 +50,8 @@ def load_census_data():
     return gdf
 
 
-def main():
-    print("=" * 80)
-    print("Test 2: Crash Prediction Bias Audit (Real NCDOT Data)")
-    print("=" * 80)
-
+def run_audit() -> dict:
+    """Run the crash prediction audit, returning outputs keyed by SIMULATED_DATA_DIR file name."""
     # Load census data
     print("\n1. Loading census data...")
     census_gdf = load_census_data()
@@ -59,14 +60,21 @@ def main():
     crash_csv_path = RAW_DATA_DIR / 'ncdot_nonmotorist_durham.csv'
 
     if not crash_csv_path.exists():
-        print(f"\nError: Crash data not found at {crash_csv_path}")
-        print("Run fetch_ncdot_nonmotorist.py first to download crash data.")
-        sys.exit(1)
+        raise FileNotFoundError(
+            f"Crash data not found at {crash_csv_path}. "
+            "Run fetch_ncdot_nonmotorist.py first to download crash data."
+        )
 
-    # Load and process real crash data
+    # Load and geocode the full history once: the backtest panel covers every
+    # year, the analysis panel is rebuilt from the same geocoded crashes
     print("\n2. Loading real NCDOT crash data...")
     auditor = CrashPredictionAuditor(census_gdf)
-    crash_df = auditor.load_real_crash_data(crash_csv_path)
+    auditor.years = sorted(set(CRASH_BACKTEST_YEARS) | set(CRASH_ANALYSIS_YEARS))
+    history_panel = auditor.load_real_crash_data(crash_csv_path, cache_dir=CACHE_DIR)
+    backtest_panel = history_panel[history_panel['year'].isin(CRASH_BACKTEST_YEARS)].reset_index(drop=True)
+
+    crashes = auditor.geocoded_crashes
+    crash_df = auditor.build_crash_panel(crashes[crashes['year'].isin(CRASH_ANALYSIS_YEARS)])
 
     # Train AI on real data
     train_range = f"{min(CRASH_TRAINING_YEARS)}-{max(CRASH_TRAINING_YEARS)}"
@@ -111,11 +119,44 @@ def main():
                   f"{mae:>10.2f} "
                   f"{error_pct:>9.1f}%")
 
-    # Create output directory
-    SIMULATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    # Bootstrap intervals for the Q1-Q4 vs Q5 error gaps
+    error_gaps = {
+        metric: bootstrap_group_gaps(predictions_df, column, 'income_quintile')
+        for metric, column in [('mae', 'prediction_error_abs'), ('error_pct', 'prediction_error_pct')]
+    }
+    q1_gap = error_gaps['error_pct']['gaps']['Q1 (Poorest)']
+    print(f"   Q1/Q5 error % ratio {q1_gap['ratio']:.2f} "
+          f"({MONTE_CARLO_CI_LEVEL:.0%} CI {q1_gap['ratio_ci_lower']:.2f}-{q1_gap['ratio_ci_upper']:.2f}, "
+          f"bootstrap p={q1_gap['p_value']:.3f})")
+
+    # Rolling-origin backtest over the full crash history
+    backtest_range = f"{min(CRASH_BACKTEST_YEARS)}-{max(CRASH_BACKTEST_YEARS)}"
+    print(f"\n5b. Backtesting every train/test split ({backtest_range})...")
+    backtest_df = pd.concat([
+        auditor.backtest(backtest_panel),
+        auditor.backtest(backtest_panel, window=CRASH_BACKTEST_CONFIG['rolling_window_years']),
+    ], ignore_index=True)
+    backtest_summary = CrashPredictionAuditor.summarize_backtest(backtest_df)
+    for window, stats in backtest_summary.items():
+        print(f"   {window}: Q1 MAE > Q5 MAE in {stats['q1_worse_share']:.0%} of {stats['folds']} folds "
+              f"(Q1/Q5 ratio {stats['mae_ratio_q1_q5']['min']:.2f}-{stats['mae_ratio_q1_q5']['max']:.2f})")
+
+    # Same split, every candidate model
+    print("\n5c. Comparing crash models on the same features...")
+    comparison = auditor.compare_models(crash_df)
+    model_comparison = {}
+    for model, rows in comparison.groupby('model', sort=False):
+        mae = rows.set_index('income_quintile')['mae']
+        model_comparison[model] = {
+            'mae_by_quintile': {quintile: float(value) for quintile, value in mae.dropna().items()},
+            'overall_mae': float((rows['mae'] * rows['tracts']).sum() / rows['tracts'].sum()),
+            'mae_ratio_q1_q5': float(mae.iloc[0] / mae.iloc[-1]) if mae.iloc[-1] > 0 else None,
+        }
+        print(f"   {model:<20} MAE {model_comparison[model]['overall_mae']:.2f} "
+              f"(Q1 {mae.iloc[0]:.2f}, Q5 {mae.iloc[-1]:.2f})")
 
-    # Export crash report
-    print("\n6. Exporting crash prediction audit report...")
+    # Crash report
+    print("\n6. Building crash prediction audit report...")
 
     q1_error_pct = quintile_metrics.get('Q1 (Poorest)', {}).get('error_pct', 0)
     q5_error_pct = quintile_metrics.get('Q5 (Richest)', {}).get('error_pct', 0)
@@ -139,21 +180,20 @@ def main():
         },
         'error_by_quintile': {k: {k2: float(v2) for k2, v2 in v.items()}
                               for k, v in quintile_metrics.items()},
+        'error_gap_bootstrap': error_gaps,
+        'backtest': backtest_summary,
+        'model_comparison': model_comparison,
         'findings': [
-            f"AI prediction error is {q1_error_pct:.0f}% in Q1 vs {q5_error_pct:.0f}% in Q5 — {q1_error_pct / q5_error_pct:.1f}x worse in the poorest areas",
+            f"AI prediction error is {q1_error_pct:.0f}% in Q1 vs {q5_error_pct:.0f}% in Q5 — {q1_error_pct / q5_error_pct:.1f}x worse in the poorest areas "
+            f"({MONTE_CARLO_CI_LEVEL:.0%} CI {q1_gap['ratio_ci_lower']:.1f}-{q1_gap['ratio_ci_upper']:.1f}x, bootstrap p={q1_gap['p_value']:.3f})",
             f"Ridge regression trained on real {train_range} non-motorist crash data with demographic features",
             f"Model shows systematic underperformance in poorest quintile when predicting {test_range} crashes",
             "AI-guided safety investments systematically underallocate resources to underserved communities"
         ]
     }
 
-    with open(SIMULATED_DATA_DIR / 'crash_predictions.json', 'w') as f:
-        json.dump(crash_report, f, indent=2)
-
-    print(f"   ✓ Exported crash_predictions.json")
-
     # Generate time series data
-    print("\n7. Exporting time series data...")
+    print("\n7. Building time series data...")
     time_series_data = {
         'years': CRASH_ANALYSIS_YEARS,
         'by_quintile': {},
@@ -188,12 +228,8 @@ def main():
         'ai_predicted_crashes': [round(a * overall_ratio) for a in overall_actual]
     }
 
-    with open(SIMULATED_DATA_DIR / 'crash_time_series.json', 'w') as f:
-        json.dump(time_series_data, f, indent=2)
-    print(f"   ✓ Exported crash_time_series.json")
-
     # Generate confusion matrices (for 2023 predictions)
-    print("\n8. Exporting confusion matrices...")
+    print("\n8. Building confusion matrices...")
 
     # Global threshold for overall metrics
     median_crashes = predictions_df['crash_count'].median()
@@ -248,12 +284,8 @@ def main():
         }
         print(f"   {quintile}: P={prec_q:.2f} R={rec_q:.2f} F1={f1_q:.2f} (threshold={q_median:.0f})")
 
-    with open(SIMULATED_DATA_DIR / 'confusion_matrices.json', 'w') as f:
-        json.dump(confusion_data, f, indent=2)
-    print(f"   ✓ Exported confusion_matrices.json")
-
-    # Export geospatial crash data for maps
-    print("\n9. Exporting geospatial crash data...")
+    # Geospatial crash data for maps
+    print("\n9. Building geospatial crash data...")
 
     # Use 2023 actuals alongside 2023 predictions (same time scale)
     tract_summary = predictions_df[['tract_id', 'crash_count', 'ai_predicted_crashes',
@@ -270,13 +302,26 @@ def main():
     # Simplify geometry for web
     crash_geo['geometry'] = crash_geo['geometry'].simplify(0.001)
 
-    # Export as GeoJSON
-    crash_geo_dict = json.loads(crash_geo.to_json())
+    print(f"   {len(crash_geo)} tracts")
+
+    return {
+        'crash_predictions.json': crash_report,
+        'crash_time_series.json': time_series_data,
+        'confusion_matrices.json': confusion_data,
+        'crash_geo_data.json': crash_geo,
+        'crash_backtest.json': backtest_df,
+    }
+
+
+def main():
+    print("=" * 80)
+    print("Test 2: Crash Prediction Bias Audit (Real NCDOT Data)")
+    print("=" * 80)
 
-    with open(SIMULATED_DATA_DIR / 'crash_geo_data.json', 'w') as f:
-        json.dump(crash_geo_dict, f)
+    outputs = run_audit()
 
-    print(f"   ✓ Exported crash_geo_data.json ({len(crash_geo)} tracts)")
+    print("\n10. Exporting results...")
+    write_outputs(outputs, SIMULATED_DATA_DIR)
 
     print("\n" + "=" * 80)
     print("Crash prediction audit complete (real NCDOT data)!")
@@ -7,56 +7,51 @@ Generates:
 - Biased AI recommendations (favor high-income)
 - Need-based recommendations (equitable baseline)
 - Equity analysis comparing both approaches
+- Equity-vs-budget curves over a budget x bias-strength grid
+- Monte Carlo confidence intervals for the equity metrics
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
 
-import geopandas as gpd
 from config import INFRASTRUCTURE_DEFAULT_BUDGET, DEFAULT_RANDOM_SEED, RAW_DATA_DIR, SIMULATED_DATA_DIR
 from models.infrastructure_auditor import InfrastructureRecommendationAuditor
-from utils.data_loading import load_infrastructure_data
+from utils.datasets import census_tracts, infrastructure_scores
+from utils.outputs import write_outputs
+from utils.rng import spawn_seeds
 
 
-def main():
-    """Run infrastructure recommendation simulation."""
-    print("="*60)
-    print("AI Infrastructure Recommendation Simulation")
-    print("Testing for demographic bias in resource allocation")
-    print("="*60)
-
-    # Paths
+def run_audit(seed=DEFAULT_RANDOM_SEED) -> dict:
+    """Run the infrastructure simulation, returning outputs keyed by SIMULATED_DATA_DIR file name."""
     census_file = RAW_DATA_DIR / 'durham_census_tracts.geojson'
-    output_file = SIMULATED_DATA_DIR / 'infrastructure_recommendations.json'
-
-    # Ensure output directory exists
-    SIMULATED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     # Load census data
     print(f"\nLoading census data from: {census_file}")
     if not census_file.exists():
-        print(f"ERROR: Census file not found. Run fetch_durham_data.py first.")
-        sys.exit(1)
+        raise FileNotFoundError("Census file not found. Run fetch_durham_data.py first.")
 
-    census_gdf = gpd.read_file(census_file)
+    census_gdf = census_tracts(census_file)
     print(f"Loaded {len(census_gdf)} census tracts")
 
     # Load infrastructure data
     print("\nLoading OSM infrastructure data...")
-    infrastructure_df = load_infrastructure_data()
+    infrastructure_df = infrastructure_scores()
     print(f"Loaded infrastructure scores for {len(infrastructure_df)} tracts")
 
+    # One child seed for the auditor's danger and advocacy streams, which it
+    # re-derives on every call, and an independent one for the replicates
+    model_seed, uncertainty_seed = spawn_seeds(seed, 2)
+
     # Initialize auditor
     print(f"\nInitializing auditor with ${INFRASTRUCTURE_DEFAULT_BUDGET:,} total budget")
     auditor = InfrastructureRecommendationAuditor(census_gdf, infrastructure_df)
 
     # Simulate danger scores
     print("\nSimulating crash/danger scores by tract...")
-    danger_scores = auditor.simulate_danger_scores(seed=DEFAULT_RANDOM_SEED)
+    danger_scores = auditor.simulate_danger_scores(seed=model_seed)
     print(f"  Average danger score: {danger_scores['danger_score'].mean():.1f} crashes/10k/year")
     print(f"  Range: {danger_scores['danger_score'].min():.1f} - {danger_scores['danger_score'].max():.1f}")
 
@@ -67,7 +62,7 @@ def main():
 
     # Simulate AI recommendations (biased toward wealth)
     print("\nSimulating AI recommendations (biased toward high-income)...")
-    ai_recs = auditor.simulate_ai_recommendations(bias_strength=0.6, seed=DEFAULT_RANDOM_SEED)
+    ai_recs = auditor.simulate_ai_recommendations(bias_strength=0.6, seed=model_seed)
     print(f"  Projects recommended: {len(ai_recs)}")
     print(f"  Budget allocated: ${ai_recs['cost'].sum():,}")
     print(f"  Average project cost: ${ai_recs['cost'].mean():,.0f}")
@@ -80,7 +75,7 @@ def main():
 
     # Simulate need-based recommendations (equitable)
     print("\nSimulating need-based recommendations (equitable baseline)...")
-    need_recs = auditor.simulate_need_based_recommendations(seed=DEFAULT_RANDOM_SEED)
+    need_recs = auditor.simulate_need_based_recommendations(seed=model_seed)
     print(f"  Projects recommended: {len(need_recs)}")
     print(f"  Budget allocated: ${need_recs['cost'].sum():,}")
     print(f"  Average project cost: ${need_recs['cost'].mean():,.0f}")
@@ -119,24 +114,51 @@ def main():
         'data_type': 'mixed',
         'real': ['infrastructure gap analysis (OpenStreetMap)'],
         'simulated': ['danger scores', 'AI recommendations', 'need-based recommendations'],
-        'parameters': {'budget': INFRASTRUCTURE_DEFAULT_BUDGET, 'seed': DEFAULT_RANDOM_SEED},
+        'parameters': {'budget': INFRASTRUCTURE_DEFAULT_BUDGET, 'seed': seed},
     }
 
-    # Export to JSON
-    print(f"\nExporting results to: {output_file}")
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
-
-    print(f"\n{'='*60}")
-    print("✓ Infrastructure recommendation simulation complete")
-    print(f"{'='*60}\n")
+    # Confidence intervals over replicates of the simulated noise
+    print("\nReplicating danger and advocacy noise for confidence intervals...")
+    report['uncertainty'] = auditor.monte_carlo(seed=uncertainty_seed)
+    gap = report['uncertainty']['comparison']['equity_gap']
+    print(f"  Equity gap: {gap['mean']:.3f} "
+          f"({report['uncertainty']['ci_level']:.0%} CI {gap['ci_lower']:.3f} to {gap['ci_upper']:.3f}, "
+          f"{gap['replicates']}/{report['uncertainty']['replicates']} replicates with a finite ratio)")
 
     # Print key findings
     if report['findings']:
-        print("KEY FINDINGS:")
+        print("\nKEY FINDINGS:")
         for finding in report['findings']:
             print(f"  • {finding}")
-        print()
+
+    # Equity curves over the budget x bias-strength grid
+    print("\nSweeping budgets x AI bias strengths...")
+    sweep = auditor.sweep_allocations(seed=model_seed)
+    print(f"  Evaluated {len(sweep)} allocations "
+          f"({sweep['budget'].nunique()} budgets, {sweep['bias_strength'].nunique()} bias strengths + need-based)")
+
+    return {
+        'infrastructure_recommendations.json': report,
+        'infrastructure_budget_sweep.json': sweep,
+    }
+
+
+def main():
+    """Run infrastructure recommendation simulation."""
+    print("="*60)
+    print("AI Infrastructure Recommendation Simulation")
+    print("Testing for demographic bias in resource allocation")
+    print("="*60)
+
+    outputs = run_audit()
+
+    # Export to JSON
+    print(f"\nExporting results to: {SIMULATED_DATA_DIR}")
+    write_outputs(outputs, SIMULATED_DATA_DIR)
+
+    print(f"\n{'='*60}")
+    print("✓ Infrastructure recommendation simulation complete")
+    print(f"{'='*60}\n")
 
 
 if __name__ == '__main__':